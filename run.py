@@ -17,7 +17,9 @@ from telegram.ext import Application
 from telegram_bot.config import BotConfig
 from src.scheduler_async import AsyncScheduler
 from src.models.database import Database
+from src.models.async_database import AsyncDatabase
 from src.utils.config import Config
+from src.utils.http_client import HttpClient
 
 
 # 配置日志
@@ -53,6 +55,11 @@ async def post_shutdown(application: Application):
         scheduler.stop()
         print("\n✓ 调度器已停止")
 
+    # 等待异步门面中的数据库操作完成，再关闭所有线程复用的数据库连接和 HTTP 连接池
+    AsyncDatabase.close_all()
+    Database.close_all()
+    HttpClient.close()
+
 
 def init_system():
     """初始化系统"""
@@ -76,7 +83,7 @@ def init_system():
         sys.exit(1)
 
     # 初始化数据库
-    db = Database()
+    db = Database.get_instance()
     db.init_db()
     print("✓ 数据库初始化完成")
 
@@ -154,8 +161,8 @@ def main():
     application.add_handler(CallbackQueryHandler(series_menu_handler, pattern="^series_menu$"))
     application.add_handler(CallbackQueryHandler(series_current_handler, pattern="^series_current$"))
     application.add_handler(CallbackQueryHandler(series_old_handler, pattern="^series_old$"))
+    application.add_handler(CallbackQueryHandler(series_page_handler, pattern="^(series_current|season_.+)_page_\\d+_[ab]\\d+$"))
     application.add_handler(CallbackQueryHandler(season_filter_handler, pattern="^season_"))
-    application.add_handler(CallbackQueryHandler(series_page_handler, pattern=".*_page_\\d+$"))
     application.add_handler(CallbackQueryHandler(detail_handler, pattern="^detail_\\d+$"))
     application.add_handler(CallbackQueryHandler(refresh_handler, pattern="^refresh_\\d+$"))
     application.add_handler(CallbackQueryHandler(delete_confirm_handler, pattern="^delete_confirm_\\d+$"))
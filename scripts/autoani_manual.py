@@ -20,7 +20,7 @@ from src.services.openlist_scanner import OpenListScanner
 def init_database():
     """初始化数据库"""
     print("初始化数据库...")
-    db = Database()
+    db = Database.get_instance()
     db.init_db()
     print("✓ 数据库初始化完成\n")
     return db
@@ -38,10 +38,12 @@ def cmd_rebuild_subscriptions(args):
             cursor = conn.cursor()
             cursor.execute("DELETE FROM series")
             cursor.execute("DELETE FROM episodes")
-        print("✓ 已清空 series 和 episodes 表\n")
+            db.delete_feed_cache()
+        db.invalidate_series()
+        print("✓ 已清空 series、episodes 表和 RSS 缓存\n")
 
     tracker = SubscriptionTracker()
-    tracker.process_subscriptions()
+    tracker.process_subscriptions(force=True)
 
     # 显示结果
     series_list = db.get_all_series()
@@ -57,6 +59,7 @@ def cmd_add_subscription(args):
 
     print(f"添加订阅: {args.url}\n")
 
+    init_database()
     tracker = SubscriptionTracker()
     success = tracker.add_subscription_by_rss_url(args.url)
 
@@ -70,10 +73,10 @@ def cmd_scrape_episodes(args):
     """刮削剧集"""
     print("=== 刮削剧集 ===\n")
 
+    db = init_database()
     scraper = EpisodeScraper()
     scraper.scrape_all_series()
 
-    db = Database()
     total = len(db.get_episodes_by_status('pending'))
     print(f"\n✓ 刮削完成，共 {total} 个待下载剧集")
 
@@ -82,8 +85,9 @@ def cmd_scan_openlist(args):
     """扫描 OpenList"""
     print("=== 扫描 OpenList ===\n")
 
+    init_database()
     scanner = OpenListScanner()
-    scanner.scan_and_update()
+    scanner.scan_and_update(full=args.full)
 
     print("\n✓ OpenList 扫描完成")
 
@@ -104,11 +108,11 @@ def cmd_check_downloads(args):
     """检查下载状态"""
     print("=== 检查下载状态 ===\n")
 
-    db = Database()
+    db = Database.get_instance()
 
     # 显示当前状态
     print("当前状态:")
-    statuses = ['pending', 'downloading', 'openlist_exists', 'completed', 'mismatched']
+    statuses = ['pending', 'downloading', 'openlist_exists', 'completed', 'mismatched', 'failed']
     for status in statuses:
         episodes = db.get_episodes_by_status(status)
         print(f"  {status}: {len(episodes)} 集")
@@ -121,15 +125,20 @@ def cmd_check_downloads(args):
 
 
 def cmd_show_mismatched(args):
-    """显示字幕不匹配的剧集"""
+    """显示字幕不匹配的剧集，可选清理已下载剧集的不匹配记录"""
     print("=== Mismatched 剧集列表 ===\n")
 
-    db = Database()
+    db = Database.get_instance()
+
+    if args.prune:
+        count = db.prune_superseded_mismatched()
+        print(f"✓ 已清理 {count} 个已下载剧集的不匹配记录\n")
+
     mismatched = db.get_episodes_by_status('mismatched')
 
     print(f"共 {len(mismatched)} 个不匹配的剧集:\n")
 
-    series_map = db.get_series_map()
+    series_map = db.get_series_many([e['tmdb_id'] for e in mismatched])
 
     for episode in mismatched:
         series = series_map.get(episode['tmdb_id'])
@@ -142,11 +151,37 @@ def cmd_show_mismatched(args):
             print()
 
 
+def cmd_show_failed(args):
+    """显示下载失败的剧集，可选重置为 pending 重新推送"""
+    print("=== Failed 剧集列表 ===\n")
+
+    db = Database.get_instance()
+    failed = db.get_episodes_by_status('failed')
+
+    print(f"共 {len(failed)} 个下载失败的剧集:\n")
+
+    series_map = db.get_series_many([e['tmdb_id'] for e in failed])
+
+    for episode in failed:
+        series = series_map.get(episode['tmdb_id'])
+        series_name = series['series_name'] if series else 'Unknown'
+        print(f"番剧: {series_name}")
+        print(f"  集数: EP{episode['episode_number']:02d}")
+        print(f"  标题: {episode['title']}")
+        print(f"  失败: {episode.get('attempts') or 0} 次")
+        print(f"  错误: {episode.get('last_error') or 'Unknown'}")
+        print()
+
+    if args.retry and failed:
+        count = db.reset_failed_episodes()
+        print(f"✓ 已重置 {count} 个剧集为 pending")
+
+
 def cmd_list_subscriptions(args):
     """列出所有订阅"""
     print("=== 订阅列表 ===\n")
 
-    db = Database()
+    db = Database.get_instance()
     series_list = db.get_all_series()
 
     print(f"共 {len(series_list)} 个订阅:\n")
@@ -164,29 +199,72 @@ def cmd_status(args):
     """显示系统状态"""
     print("=== AutoAni 状态 ===\n")
 
-    db = Database()
+    stats = Database.get_instance().get_dashboard_stats(max_age=0)
 
-    # 订阅统计
-    series_list = db.get_all_series()
-    print(f"订阅数: {len(series_list)}")
-
-    # 剧集统计
-    total_episodes = 0
-    for series in series_list:
-        episodes = db.get_episodes_by_series(series['tmdb_id'])
-        total_episodes += len(episodes)
-    print(f"总剧集数: {total_episodes}")
+    print(f"订阅数: {stats['series']}")
+    print(f"总剧集数: {stats['episodes']}")
 
     # 状态分布
     print("\n剧集状态分布:")
-    statuses = ['pending', 'downloading', 'openlist_exists', 'completed', 'mismatched']
-    for status in statuses:
-        episodes = db.get_episodes_by_status(status)
-        print(f"  {status}: {len(episodes)} 集")
+    for status, count in stats['statuses'].items():
+        print(f"  {status}: {count} 集")
+
+    print(f"\nOpenList 文件数: {stats['openlist_files']}")
+
+
+def cmd_job_stats(args):
+    """显示定时任务耗时统计，对比最近 --hours 小时与最近 --days 天"""
+    from datetime import datetime, timedelta
+
+    print("=== 任务运行统计 ===\n")
 
-    # OpenList 统计
-    openlist_files = db.get_openlist_files()
-    print(f"\nOpenList 文件数: {len(openlist_files)}")
+    db = Database.get_instance()
+    now = datetime.now()
+    recent = db.get_job_run_stats((now - timedelta(hours=args.hours)).isoformat())
+    baseline = db.get_job_run_stats((now - timedelta(days=args.days)).isoformat())
+
+    if not baseline:
+        print("暂无运行记录")
+        return
+
+    def change(current, previous):
+        if not current or not previous:
+            return ''
+        return f" ({(current - previous) / previous * 100:+.0f}%)"
+
+    for job_name in sorted(baseline):
+        if args.job and job_name != args.job:
+            continue
+        base = baseline[job_name]
+        cur = recent.get(job_name)
+
+        print(f"{job_name}")
+        print(f"  最近 {args.days} 天: 运行 {base['runs']} 次，失败 {base['failed']}，跳过 {base['skipped']}，"
+              f"平均 {(base['avg_ms'] or 0) / 1000:.1f}s，最长 {(base['max_ms'] or 0) / 1000:.1f}s，"
+              f"条目 {base['items']}，HTTP {base['http_calls']}，错误 {base['errors']}")
+        if cur:
+            print(f"  最近 {args.hours} 小时: 运行 {cur['runs']} 次，失败 {cur['failed']}，跳过 {cur['skipped']}，"
+                  f"平均 {(cur['avg_ms'] or 0) / 1000:.1f}s{change(cur['avg_ms'], base['avg_ms'])}，"
+                  f"条目 {cur['items']}，HTTP {cur['http_calls']}，错误 {cur['errors']}")
+        else:
+            print(f"  最近 {args.hours} 小时: 无运行记录")
+
+        # 各阶段平均耗时（按 --days 天的耗时排序）
+        for stage, avg_ms in base['stages'].items():
+            cur_ms = cur['stages'].get(stage) if cur else None
+            line = f"    {stage:<18}{avg_ms / 1000:>8.2f}s"
+            if cur_ms is not None:
+                line += f"  最近 {cur_ms / 1000:.2f}s{change(cur_ms, avg_ms)}"
+            print(line)
+        print()
+
+    if args.recent:
+        print(f"最近 {args.recent} 次运行:")
+        for run in db.get_job_runs(args.job, limit=args.recent):
+            print(f"  {run['started_at'][:19]}  {run['job_name']:<16}{run['status']:<10}"
+                  f"{(run['duration_ms'] or 0) / 1000:>8.1f}s  条目 {run['items']}  错误 {run['errors']}")
+            if run['error']:
+                print(f"    {run['error'].splitlines()[0]}")
 
 
 def main():
@@ -203,15 +281,19 @@ def main():
   push-downloads        推送缺失剧集到离线下载
   check-downloads       检查下载状态
   show-mismatched       显示字幕不匹配的剧集
+  show-failed           显示下载失败的剧集
   list-subscriptions    列出所有订阅
   status                显示系统状态
+  job-stats             显示定时任务耗时统计
 
 示例:
   python autoani_manual.py rebuild-subscriptions --clear
   python autoani_manual.py add-subscription --url "https://mikanani.me/RSS/Bangumi?bangumiId=3736&subgroupid=370"
   python autoani_manual.py scrape-episodes
   python autoani_manual.py push-downloads --limit 5
+  python autoani_manual.py show-failed --retry
   python autoani_manual.py status
+  python autoani_manual.py job-stats --recent 10
         """
     )
 
@@ -233,6 +315,7 @@ def main():
 
     # scan-openlist
     parser_scan = subparsers.add_parser('scan-openlist', help='扫描 OpenList')
+    parser_scan.add_argument('--full', action='store_true', help='全量扫描（忽略目录快照）')
     parser_scan.set_defaults(func=cmd_scan_openlist)
 
     # push-downloads
@@ -246,8 +329,14 @@ def main():
 
     # show-mismatched
     parser_mismatched = subparsers.add_parser('show-mismatched', help='显示不匹配剧集')
+    parser_mismatched.add_argument('--prune', action='store_true', help='先删除同一集已下载的不匹配记录')
     parser_mismatched.set_defaults(func=cmd_show_mismatched)
 
+    # show-failed
+    parser_failed = subparsers.add_parser('show-failed', help='显示下载失败剧集')
+    parser_failed.add_argument('--retry', action='store_true', help='重置为 pending 重新推送')
+    parser_failed.set_defaults(func=cmd_show_failed)
+
     # list-subscriptions
     parser_list = subparsers.add_parser('list-subscriptions', help='列出订阅')
     parser_list.add_argument('-v', '--verbose', action='store_true', help='详细信息')
@@ -257,6 +346,14 @@ def main():
     parser_status = subparsers.add_parser('status', help='显示系统状态')
     parser_status.set_defaults(func=cmd_status)
 
+    # job-stats
+    parser_job_stats = subparsers.add_parser('job-stats', help='显示任务耗时统计')
+    parser_job_stats.add_argument('--job', help='只显示指定任务（如 rss_scrape）')
+    parser_job_stats.add_argument('--hours', type=int, default=24, help='最近统计窗口（小时）')
+    parser_job_stats.add_argument('--days', type=int, default=7, help='对比基线窗口（天）')
+    parser_job_stats.add_argument('--recent', type=int, default=0, help='列出最近 N 次运行')
+    parser_job_stats.set_defaults(func=cmd_job_stats)
+
     # 解析参数
     args = parser.parse_args()
 
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+数据库连接基准测试
+对比旧的「每次调用新建连接」与线程复用长连接（WAL）的单次调用开销
+用法: python scripts/bench_database.py [--episodes 500] [--rounds 3]
+"""
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.database import Database
+
+
+class LegacyDatabase(Database):
+    """旧实现：每次调用都 connect / commit / close"""
+
+    @contextmanager
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+def seed(db: Database, count: int):
+    """写入测试数据"""
+    db.init_db()
+    db.insert_series(1, 'bench', 'bench', 'bench')
+    with db.get_connection() as conn:
+        conn.executemany("""
+        INSERT OR IGNORE INTO episodes
+        (tmdb_id, episode_number, title, torrent_link, subtitle_lang, status)
+        VALUES (1, ?, ?, ?, 'chs', 'pending')
+        """, [(i, f"EP{i}", f"magnet:?xt={i}") for i in range(1, count + 1)])
+
+
+def bench(db: Database, count: int, rounds: int) -> dict:
+    """测量 update_episode_status / get_episode_by_id 的单次耗时（微秒）"""
+    with db.get_connection() as conn:
+        ids = [row['id'] for row in conn.execute("SELECT id FROM episodes")][:count]
+
+    results = {}
+    for name, func in [
+        ('update_episode_status', lambda i: db.update_episode_status(i, 'downloading')),
+        ('get_episode_by_id', lambda i: db.get_episode_by_id(i)),
+    ]:
+        best = None
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for episode_id in ids:
+                func(episode_id)
+            elapsed = (time.perf_counter() - start) / len(ids) * 1e6
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = best
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='数据库连接基准测试')
+    parser.add_argument('--episodes', type=int, default=500, help='测试剧集数量')
+    parser.add_argument('--rounds', type=int, default=3, help='重复轮数（取最优）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = LegacyDatabase(str(Path(tmp) / 'legacy.db'))
+        seed(legacy, args.episodes)
+        legacy_results = bench(legacy, args.episodes, args.rounds)
+
+        pooled = Database(str(Path(tmp) / 'pooled.db'))
+        seed(pooled, args.episodes)
+        pooled_results = bench(pooled, args.episodes, args.rounds)
+
+        Database.close_all()
+
+    print(f"=== 数据库单次调用耗时 ({args.episodes} 集, {datetime.now():%Y-%m-%d %H:%M:%S}) ===\n")
+    print(f"{'操作':<24}{'旧实现(µs)':>14}{'长连接(µs)':>14}{'加速':>10}")
+    for name in legacy_results:
+        before = legacy_results[name]
+        after = pooled_results[name]
+        print(f"{name:<24}{before:>14.1f}{after:>14.1f}{before / after:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
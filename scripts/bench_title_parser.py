@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+标题解析基准测试
+对比旧的逐字段正则解析（TitleParser / SubtitleHelper 各自扫描）与 title_engine 单次解析的耗时，
+语料带期望值（.tsv）时按字段统计准确率；引擎任一字段低于 ACCURACY_BASELINE 中记录的准确率时返回非零退出码
+
+默认语料：
+    title_corpus.tsv  按命名格式生成的 3000 条标题，标注全部字段
+    mikan_titles.tsv  蜜柑上的真实标题和文件名，人工标注番剧名和集数（合集标注为空集数）
+
+用法: python scripts/bench_title_parser.py [--corpus scripts/data/mikan_titles.tsv ...] [--rounds 5]
+                                         [--errors 10] [--fail-under 95]
+"""
+import re
+import csv
+import sys
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parsers.title_engine import parse_title
+
+DATA_DIR = Path(__file__).parent / 'data'
+DEFAULT_CORPORA = [DATA_DIR / 'title_corpus.tsv', DATA_DIR / 'mikan_titles.tsv']
+
+# 引擎各字段的最低准确率 {语料文件名: {字段: 百分比}}，低于该值视为回归；引擎改进后同步提高
+ACCURACY_BASELINE = {
+    'title_corpus.tsv': {'series_name': 71.4, 'episode': 100.0, 'subtitle_lang': 98.0,
+                         'group': 100.0, 'resolution': 100.0, 'codec': 100.0},
+    'mikan_titles.tsv': {'series_name': 70.2, 'episode': 99.1},
+}
+
+# 各解析器支持的字段：(显示名, 字段, 取值函数)
+LEGACY_FIELDS = [
+    ('旧 TitleParser', 'series_name', lambda t: LegacyTitleParser.extract_series_name(t)),
+    ('旧 TitleParser', 'episode', lambda t: LegacyTitleParser.extract_episode_number(t)),
+    ('旧 SubtitleHelper', 'episode', lambda t: LegacySubtitleHelper.extract_episode_number(t)),
+    ('旧 SubtitleHelper', 'subtitle_lang', lambda t: LegacySubtitleHelper.detect_subtitle_lang(t)),
+    ('旧 SubtitleHelper', 'group', lambda t: LegacySubtitleHelper.extract_fansub_group(t)),
+]
+ENGINE_FIELDS = ['series_name', 'episode', 'subtitle_lang', 'group', 'resolution', 'codec']
+
+
+class LegacyTitleParser:
+    """旧实现：每次调用现场编译正则"""
+
+    @staticmethod
+    def extract_series_name(title: str) -> Optional[str]:
+        if not title:
+            return None
+        cleaned = re.sub(r'^\[.*?\]\s*', '', title)
+        if '/' in cleaned:
+            series_name = cleaned.split('/')[0].strip()
+        else:
+            series_name = cleaned.split('-')[0].strip()
+        series_name = ' '.join(series_name.split())
+        return series_name if series_name else None
+
+    @staticmethod
+    def extract_episode_number(title: str) -> Optional[int]:
+        patterns = [
+            r'-\s*(\d+)\s*(?:\[|$)',
+            r'\[(\d+)\]',
+            r'第\s*(\d+)\s*[集话話]',
+            r'EP?\s*(\d+)',
+        ]
+        for pattern in patterns:
+            match = re.search(pattern, title)
+            if match:
+                return int(match.group(1))
+        return None
+
+
+class LegacySubtitleHelper:
+    """旧实现：关键词循环中重复小写，集数模式顺序与 TitleParser 不同"""
+
+    SUBTITLE_PATTERNS = [
+        ('chs_cht', ['简繁', '简繁内封', '简繁内嵌']),
+        ('chs', ['简体', '简中', '简日', '简体内嵌', '简体内封', 'chs']),
+        ('cht', ['繁体', '繁中', '繁日', '繁体内嵌', '繁体内封', 'cht']),
+    ]
+
+    @staticmethod
+    def detect_subtitle_lang(title: str) -> Optional[str]:
+        if not title:
+            return None
+        title_lower = title.lower()
+        for lang, keywords in LegacySubtitleHelper.SUBTITLE_PATTERNS:
+            for keyword in keywords:
+                if keyword == 'chs' and 'cht' in title_lower:
+                    continue
+                if keyword.lower() in title_lower:
+                    return lang
+        return None
+
+    @staticmethod
+    def extract_episode_number(title: str) -> Optional[int]:
+        if not title:
+            return None
+        patterns = [
+            r'\[(\d+)\]',
+            r'\s-\s*(\d+)\s',
+            r'第\s*(\d+)\s*[集话話]',
+            r'EP?\.?\s*(\d+)',
+            r'#(\d+)',
+        ]
+        for pattern in patterns:
+            match = re.search(pattern, title)
+            if match:
+                return int(match.group(1))
+        return None
+
+    @staticmethod
+    def extract_fansub_group(title: str) -> Optional[str]:
+        match = re.match(r'^\[(.*?)\]', title)
+        return match.group(1) if match else None
+
+
+def legacy_parse(title: str) -> tuple:
+    """刮削器 + 跟踪器对同一标题的全部调用"""
+    return (
+        LegacyTitleParser.extract_series_name(title),
+        LegacyTitleParser.extract_episode_number(title),
+        LegacySubtitleHelper.extract_episode_number(title),
+        LegacySubtitleHelper.detect_subtitle_lang(title),
+        LegacySubtitleHelper.extract_fansub_group(title),
+    )
+
+
+def engine_parse(title: str) -> tuple:
+    """单次解析得到全部字段"""
+    parsed = parse_title(title)
+    return parsed.series_name, parsed.episode, parsed.subtitle_lang, parsed.group
+
+
+def bench(func, titles: list, rounds: int) -> float:
+    """返回每个标题的最优耗时（微秒）"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for title in titles:
+            func(title)
+        elapsed = (time.perf_counter() - start) / len(titles) * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load_corpus(path: Path) -> tuple:
+    """
+    读取语料
+
+    Returns:
+        (标题列表, 期望值列表, 标注的字段)；纯文本语料没有期望值
+    """
+    if path.suffix != '.tsv':
+        titles = [line.strip() for line in path.read_text(encoding='utf-8').splitlines() if line.strip()]
+        return titles, None, []
+
+    expected = []
+    with open(path, encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f, delimiter='\t')
+        fields = [field for field in ENGINE_FIELDS if field in reader.fieldnames]
+        for row in reader:
+            row = {key: (value if value != '' else None) for key, value in row.items()}
+            if row.get('episode') is not None:
+                row['episode'] = int(row['episode'])
+            expected.append(row)
+
+    return [row['title'] for row in expected], expected, fields
+
+
+def accuracy(name: str, expected: list, fields: list, errors: int) -> dict:
+    """
+    按字段统计准确率（只统计语料标注了的字段）
+
+    Returns:
+        {(解析器, 字段): 准确率百分比}
+    """
+    results = {}
+    failures = {}
+
+    for parser_name, field, func in LEGACY_FIELDS:
+        if field not in fields:
+            continue
+        correct = sum(1 for row in expected if func(row['title']) == row[field])
+        results[(parser_name, field)] = correct / len(expected) * 100
+
+    for field in fields:
+        correct = 0
+        for row in expected:
+            actual = getattr(parse_title(row['title']), field)
+            if actual == row[field]:
+                correct += 1
+            else:
+                failures.setdefault(field, []).append((row['title'], row[field], actual))
+        results[('引擎', field)] = correct / len(expected) * 100
+
+    parsers = ['旧 TitleParser', '旧 SubtitleHelper', '引擎']
+    print(f"\n=== 字段准确率: {name} ({len(expected)} 条) ===\n")
+    print(f"{'字段':<16}" + ''.join(f"{parser_name:>18}" for parser_name in parsers))
+    for field in fields:
+        cells = []
+        for parser_name in parsers:
+            value = results.get((parser_name, field))
+            cells.append(f"{value:>17.1f}%" if value is not None else f"{'-':>18}")
+        print(f"{field:<16}" + ''.join(cells))
+
+    if errors:
+        for field in fields:
+            samples = failures.get(field, [])
+            if not samples:
+                continue
+            print(f"\n引擎 {field} 错误 {len(samples)} 条，前 {min(errors, len(samples))} 条:")
+            for title, want, got in samples[:errors]:
+                print(f"  期望 {want!r} 实际 {got!r}  {title}")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='标题解析基准测试')
+    parser.add_argument('--corpus', action='append',
+                        help='语料（.tsv 带期望值，其他格式每行一个标题），可重复指定；默认 title_corpus.tsv 和 mikan_titles.tsv')
+    parser.add_argument('--rounds', type=int, default=5, help='重复轮数（取最优）')
+    parser.add_argument('--errors', type=int, default=0, help='每个字段显示的引擎错误条数')
+    parser.add_argument('--fail-under', type=float,
+                        help='引擎任一字段准确率低于该百分比时返回非零退出码（默认按 ACCURACY_BASELINE）')
+    args = parser.parse_args()
+
+    corpora = [(Path(path), *load_corpus(Path(path))) for path in (args.corpus or DEFAULT_CORPORA)]
+    titles = [title for _, corpus_titles, _, _ in corpora for title in corpus_titles]
+
+    results = [
+        ('旧实现（逐字段）', bench(legacy_parse, titles, args.rounds)),
+        ('引擎（无缓存）', bench(parse_title.__wrapped__, titles, args.rounds)),
+    ]
+
+    # 先填充缓存，再测量命中耗时
+    for title in titles:
+        parse_title(title)
+    results.append(('引擎（LRU 命中）', bench(engine_parse, titles, args.rounds)))
+
+    print(f"=== 标题解析耗时 ({len(titles)} 个标题, {datetime.now():%Y-%m-%d %H:%M:%S}) ===\n")
+    baseline = results[0][1]
+    print(f"{'实现':<16}{'µs/标题':>10}{'标题/秒':>12}{'加速':>8}")
+    for name, micros in results:
+        print(f"{name:<16}{micros:>10.2f}{1e6 / micros:>12.0f}{baseline / micros:>7.1f}x")
+
+    below = []
+    for path, _, expected, fields in corpora:
+        if expected is None:
+            continue
+
+        scores = accuracy(path.name, expected, fields, args.errors)
+        baseline = ACCURACY_BASELINE.get(path.name, {})
+        for (name, field), value in scores.items():
+            if name != '引擎':
+                continue
+            minimum = args.fail_under if args.fail_under is not None else baseline.get(field)
+            if minimum is not None and value < minimum:
+                below.append(f"{path.name} {field} {value:.1f}% < {minimum}%")
+
+    if below:
+        print("\n✗ 准确率低于基线:")
+        for line in below:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
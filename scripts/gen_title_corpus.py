@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+生成标题解析语料
+按蜜柑上常见字幕组/压制组的命名格式组合番剧名和集数，期望值来自构造参数（不依赖任何解析器）
+用法: python scripts/gen_title_corpus.py [--count 3000] [--output scripts/data/title_corpus.tsv]
+"""
+import csv
+import random
+import argparse
+from pathlib import Path
+
+DEFAULT_OUTPUT = Path(__file__).parent / 'data' / 'title_corpus.tsv'
+
+FIELDS = ['title', 'series_name', 'episode', 'subtitle_lang', 'group', 'resolution', 'codec']
+
+# (简体名, 繁体名, 罗马音/英文名)
+SERIES = [
+    ('葬送的芙莉莲', '葬送的芙莉蓮', 'Sousou no Frieren'),
+    ('迷宫饭', '迷宮飯', 'Dungeon Meshi'),
+    ('药屋少女的呢喃', '藥師少女的獨語', 'Kusuriya no Hitorigoto'),
+    ('我独自升级', '我獨自升級', 'Ore dake Level Up na Ken'),
+    ('怪兽8号', '怪獸8號', 'Kaijuu 8-gou'),
+    ('间谍过家家', '間諜家家酒', 'Spy x Family'),
+    ('我推的孩子', '【我推的孩子】', 'Oshi no Ko'),
+    ('孤独摇滚！', '孤獨搖滾！', 'Bocchi the Rock!'),
+    ('咒术回战', '咒術迴戰', 'Jujutsu Kaisen'),
+    ('胆大党', '膽大黨', 'Dandadan'),
+    ('青之箱', '青之箱', 'Ao no Hako'),
+    ('败犬女主太多了！', '敗北女角太多了！', 'Make Heroine ga Oosugiru!'),
+    ('坂本日常', '坂本日常', 'Sakamoto Days'),
+    ('全修。', '全修。', 'Zenshuu.'),
+    ('永远的黄昏', '永遠的黃昏', 'Towa no Yuugure'),
+    ('摇曳露营△ 第三季', '搖曳露營△ 第三季', 'Yuru Camp Season 3'),
+    ('无职转生Ⅱ', '無職轉生Ⅱ', 'Mushoku Tensei II'),
+    ('夜樱家的大作战', '夜櫻家的大作戰', 'Yozakura-san Chi no Daisakusen'),
+    ('香格里拉·开拓异境', '香格里拉・開拓異境', 'Shangri-La Frontier'),
+    ('蓝色监狱 第二季', '藍色監獄 第二季', 'Blue Lock S2'),
+    ('小市民系列', '小市民系列', 'Shoushimin Series'),
+    ('缘结甘神家', '結緣甘神神社', 'Amagami-san Chi no Enmusubi'),
+    ('少女乐团 呐喊吧', '少女樂團 吶喊吧', 'Girls Band Cry'),
+    ('我的幸福婚约 第二季', '我的幸福婚約 第二季', 'Watashi no Shiawase na Kekkon S2'),
+    ('关于我转生变成史莱姆这档事 第三季', '關於我轉生變成史萊姆這檔事 第三季', 'Tensei Shitara Slime Datta Ken 3rd Season'),
+    ('为美好的世界献上祝福！3', '為美好的世界獻上祝福！3', 'Kono Subarashii Sekai ni Shukufuku wo! 3'),
+    ('魔都精兵的奴隶', '魔都精兵的奴隸', 'Mato Seihei no Slave'),
+    ('擅长逃跑的殿下', '擅長逃跑的殿下', 'Nige Jouzu no Wakagimi'),
+    ('海贼王', '航海王', 'One Piece'),
+    ('鬼灭之刃 柱训练篇', '鬼滅之刃 柱訓練篇', 'Kimetsu no Yaiba Hashira Geiko-hen'),
+    ('地。-关于地球的运动-', '地。-關於地球的運動-', 'Chi. Chikyuu no Undou ni Tsuite'),
+    ('86 -不存在的战区-', '86 -不存在的戰區-', '86 Eighty Six'),
+    ('2.5次元的诱惑', '2.5 次元的誘惑', '2.5-jigen no Ririsa'),
+    ('亚托莉 -我挚爱的时光-', '亞托莉 -我摯愛的時光-', 'ATRI -My Dear Moments-'),
+    ('物语系列 外传季＆怪物季', '物語系列 外傳季＆怪物季', 'Monogatari Series Off & Monster Season'),
+    ('欢迎来到实力至上主义的教室 第三季', '歡迎來到實力至上主義的教室 第三季', 'Youkoso Jitsuryoku Shijou Shugi no Kyoushitsu e 3rd Season'),
+    ('测不准的阿波连同学', '測不準的阿波連同學', 'Soredemo Ayumu wa Yosetekuru'),
+    ('妖怪学校的新任老师', '妖怪學校的新任老師', 'Youkai Gakkou no Sensei Hajimemashita!'),
+    ('精灵幻想记 2', '精靈幻想記 2', 'Seirei Gensouki 2'),
+    ('死神 千年血战篇-诀别谭-', '死神 千年血戰篇-訣別譚-', 'Bleach Sennen Kessen-hen Ketsubetsu-tan'),
+]
+
+# 字幕标签 -> 期望语言
+LANG_TAGS = {
+    'chs_cht': ['简繁内封字幕', '简繁日内封', '简繁内封', '简繁外挂字幕', '简繁日内封字幕'],
+    'chs': ['简日双语', '简体内嵌', '简日内嵌', '简体', '简中'],
+    'cht': ['繁日双语', '繁体内嵌', '繁日内嵌', '繁体', '繁中'],
+}
+
+
+def _pick_lang(rng: random.Random) -> tuple:
+    lang = rng.choice(list(LANG_TAGS))
+    return lang, rng.choice(LANG_TAGS[lang])
+
+
+def _row(title, series_name, episode, subtitle_lang=None, group=None, resolution=None, codec=None) -> dict:
+    return {
+        'title': title,
+        'series_name': series_name,
+        'episode': episode,
+        'subtitle_lang': subtitle_lang,
+        'group': group,
+        'resolution': resolution,
+        'codec': codec,
+    }
+
+
+# 每个格式接收 (rng, 简体名, 繁体名, 罗马音名, 集数)，返回一行期望结果
+
+def fmt_lolihouse(rng, cn, tw, romaji, ep):
+    group = rng.choice(['LoliHouse', '喵萌奶茶屋&LoliHouse', '动漫国字幕组&LoliHouse', '豌豆字幕组&LoliHouse'])
+    lang, tag = 'chs_cht', rng.choice(['简繁内封字幕', '简繁日内封字幕', '简繁外挂字幕'])
+    version = rng.choice(['', '', '', 'v2'])
+    end = rng.choice(['', '', '', '[END]'])
+    return _row(f"[{group}] {cn} / {romaji} - {ep:02d}{version} [WebRip 1080p HEVC-10bit AAC][{tag}]{end}",
+                cn, ep, lang, group, '1080p', 'hevc')
+
+
+def fmt_ani(rng, cn, tw, romaji, ep):
+    return _row(f"[ANi] {tw} - {ep:02d} [1080P][Baha][WEB-DL][AAC AVC][CHT][MP4]",
+                tw, ep, 'cht', 'ANi', '1080p', 'avc')
+
+
+def fmt_bracket_episode(rng, cn, tw, romaji, ep):
+    group = rng.choice(['喵萌奶茶屋', '桜都字幕组', '离谱Sub', 'SweetSub', '拨雪寻春'])
+    lang, tag = _pick_lang(rng)
+    res = rng.choice(['1080p', '1080P', '720p'])
+    return _row(f"[{group}] {cn} / {romaji} [{ep:02d}][{res}][{tag}]",
+                cn, ep, lang, group, res.lower(), None)
+
+
+def fmt_kitauji(rng, cn, tw, romaji, ep):
+    codec, codec_tag = rng.choice([('hevc', 'HEVC_AAC'), ('avc', 'AVC_AAC')])
+    lang, tag = _pick_lang(rng)
+    return _row(f"[北宇治字幕组] {cn} / {romaji} [{ep:02d}][WebRip][1080p][{codec_tag}][{tag}]",
+                cn, ep, lang, '北宇治字幕组', '1080p', codec)
+
+
+def fmt_bracket_name(rng, cn, tw, romaji, ep):
+    # 番剧名也在方括号内，字幕组名后不带空格
+    group = rng.choice(['千夏字幕组', '漫猫字幕社', '织梦字幕组', '星空字幕组'])
+    lang, tag = _pick_lang(rng)
+    episode_tag = rng.choice([f"第{ep:02d}话", f"{ep:02d}", f"第{ep}集"])
+    return _row(f"[{group}][{cn}_{romaji}][{episode_tag}][1080p_AVC][{tag}]",
+                cn, ep, lang, group, '1080p', 'avc')
+
+
+def fmt_sakurato(rng, cn, tw, romaji, ep):
+    codec, codec_tag = rng.choice([('hevc', 'HEVC-10bit'), ('avc', 'AVC-8bit')])
+    lang, tag = rng.choice([('chs', 'CHS'), ('cht', 'CHT'), ('chs_cht', 'CHS&CHT')])
+    return _row(f"[Sakurato] {romaji} [{ep:02d}][{codec_tag} 1080p AAC][{tag}]",
+                romaji, ep, lang, 'Sakurato', '1080p', codec)
+
+
+def fmt_raws(rng, cn, tw, romaji, ep):
+    group = rng.choice(['NC-Raws', 'GJ.Y', '黒ネズミたち'])
+    source = rng.choice(['CR', 'B-Global', 'Baha'])
+    res, res_tag = rng.choice([('1080p', '1920x1080'), ('2160p', '3840x2160'), ('720p', '1280x720')])
+    codec, codec_tag = rng.choice([('hevc', 'HEVC'), ('avc', 'AVC')])
+    return _row(f"[{group}] {cn} / {romaji} - {ep:02d} ({source} {res_tag} {codec_tag} AAC MKV)",
+                cn, ep, None, group, res, codec)
+
+
+def fmt_lilith(rng, cn, tw, romaji, ep):
+    return _row(f"[Lilith-Raws] {tw} - {ep:02d} [Baha][WEB-DL][1080p][AVC AAC][CHT][MP4]",
+                tw, ep, 'cht', 'Lilith-Raws', '1080p', 'avc')
+
+
+def fmt_vcb(rng, cn, tw, romaji, ep):
+    return _row(f"[VCB-Studio] {romaji} [{ep:02d}][Ma10p_1080p][x265_flac]",
+                romaji, ep, None, 'VCB-Studio', '1080p', 'hevc')
+
+
+def fmt_batch(rng, cn, tw, romaji, ep):
+    # 合集没有单集集数
+    last = max(ep, 12)
+    return _row(f"[DBD-Raws][{cn}/{romaji}][01-{last}TV全集][1080P][BDRip][HEVC-10bit][FLAC][MKV]",
+                cn, None, None, 'DBD-Raws', '1080p', 'hevc')
+
+
+def fmt_file_plain(rng, cn, tw, romaji, ep):
+    version = rng.choice(['', 'v2'])
+    ext = rng.choice(['mkv', 'mp4'])
+    return _row(f"{romaji} - {ep:02d}{version}.{ext}", romaji, ep)
+
+
+def fmt_file_sxxexx(rng, cn, tw, romaji, ep):
+    return _row(f"{romaji} S01E{ep:02d} 1080p WEB-DL AAC H.264.mkv", romaji, ep,
+                resolution='1080p', codec='avc')
+
+
+def fmt_file_chinese(rng, cn, tw, romaji, ep):
+    return _row(f"{cn} 第{ep:02d}话.mp4", cn, ep)
+
+
+def fmt_file_release(rng, cn, tw, romaji, ep):
+    group = rng.choice(['LoliHouse', 'ANi', '喵萌奶茶屋'])
+    return _row(f"[{group}] {cn} - {ep:02d} [1080p].mkv", cn, ep, group=group, resolution='1080p')
+
+
+FORMATS = [
+    (fmt_lolihouse, 6),
+    (fmt_ani, 5),
+    (fmt_bracket_episode, 5),
+    (fmt_kitauji, 3),
+    (fmt_bracket_name, 3),
+    (fmt_sakurato, 2),
+    (fmt_raws, 3),
+    (fmt_lilith, 2),
+    (fmt_vcb, 1),
+    (fmt_batch, 1),
+    (fmt_file_plain, 3),
+    (fmt_file_sxxexx, 1),
+    (fmt_file_chinese, 1),
+    (fmt_file_release, 2),
+]
+
+
+def generate(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    funcs = [func for func, _ in FORMATS]
+    weights = [weight for _, weight in FORMATS]
+
+    rows = []
+    seen = set()
+    while len(rows) < count:
+        func = rng.choices(funcs, weights)[0]
+        cn, tw, romaji = rng.choice(SERIES)
+        ep = rng.randint(1, 28)
+        row = func(rng, cn, tw, romaji, ep)
+        if row['title'] in seen:
+            continue
+        seen.add(row['title'])
+        rows.append(row)
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成标题解析语料')
+    parser.add_argument('--count', type=int, default=3000, help='标题数量')
+    parser.add_argument('--seed', type=int, default=20240101, help='随机种子')
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT), help='输出 TSV 文件')
+    args = parser.parse_args()
+
+    rows = generate(args.count, args.seed)
+
+    with open(args.output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, delimiter='\t', lineterminator='\n')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: '' if value is None else value for key, value in row.items()})
+
+    print(f"✓ 已生成 {len(rows)} 条语料: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+数据库异步门面
+Bot 处理器和调度器在同一个事件循环中运行，直接调用同步的 Database 方法会在慢查询
+或等待写锁时阻塞所有交互；通过门面调用时查询在专用线程中执行，事件循环不被阻塞
+
+门面只保证经由它的写按提交顺序串行执行，并不是数据库唯一的写入者：调度任务体在
+asyncio.to_thread 的工作线程中直接使用 Database（领取/迁移剧集、写入扫描结果、写入剧集），
+与门面的写仍会竞争 SQLite 写锁，由连接的 busy timeout（SQLITE_BUSY_TIMEOUT）等待
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from src.models.database import Database
+from src.utils.config import Config
+
+
+class AsyncDatabase:
+    """
+    Database 的异步门面
+
+    用法与 Database 相同，方法调用前加 await：
+        adb = AsyncDatabase.get_instance()
+        series = await adb.get_series(tmdb_id)
+
+    读方法（get_ / count_ / is_ 开头）在读线程池中并发执行，每个线程有自己的连接（WAL 模式下读不互相阻塞）；
+    其余方法都视为写，在单个写线程中按提交顺序串行执行（只对通过门面的写排序，见模块说明）
+    """
+
+    # 读方法前缀
+    READ_PREFIXES = ('get_', 'count_', 'is_')
+    # 不通过门面暴露的方法
+    EXCLUDED = ('get_connection', 'get_instance', 'close_all')
+
+    # 共享实例 {db_path: AsyncDatabase}
+    _instances: Dict[str, 'AsyncDatabase'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db: Database = None, read_workers: int = None):
+        self.db = db or Database.get_instance()
+        self._readers = ThreadPoolExecutor(max_workers=read_workers or Config.DB_READ_WORKERS,
+                                           thread_name_prefix='db-read')
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-write')
+
+    @classmethod
+    def get_instance(cls, db_path: str = "data/autoani.db") -> 'AsyncDatabase':
+        """获取共享的门面实例（与 Database.get_instance 使用同一个数据库实例）"""
+        db = Database.get_instance(db_path)
+        with cls._instances_lock:
+            instance = cls._instances.get(db._key)
+            if instance is None:
+                instance = cls(db)
+                cls._instances[db._key] = instance
+            return instance
+
+    @classmethod
+    def close_all(cls):
+        """等待已提交的操作完成并关闭线程池（程序退出时在 Database.close_all 之前调用）"""
+        with cls._instances_lock:
+            instances = list(cls._instances.values())
+            cls._instances.clear()
+        for instance in instances:
+            instance._writer.shutdown(wait=True)
+            instance._readers.shutdown(wait=True)
+
+    def __getattr__(self, name: str) -> Callable:
+        if name.startswith('_') or name in self.EXCLUDED:
+            raise AttributeError(name)
+
+        method = getattr(self.db, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        if name.startswith(self.READ_PREFIXES):
+            executor = self._readers
+        else:
+            executor = self._writer
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            return await self._run(executor, method, *args, **kwargs)
+
+        return call
+
+    async def read(self, func: Callable, *args, **kwargs) -> Any:
+        """在读线程池中执行一组只读操作（如只查询数据库的服务方法）"""
+        return await self._run(self._readers, func, *args, **kwargs)
+
+    async def write(self, func: Callable, *args, **kwargs) -> Any:
+        """在写线程中执行一组写操作，与其他写操作串行"""
+        return await self._run(self._writer, func, *args, **kwargs)
+
+    @staticmethod
+    async def _run(executor: ThreadPoolExecutor, func: Callable, *args, **kwargs) -> Any:
+        # 与 asyncio.to_thread 一样复制上下文，任务运行指标（Metrics）在线程中仍然有效
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(executor, functools.partial(context.run, func, *args, **kwargs))
@@ -1,31 +1,159 @@
 """
 数据库模型和初始化
 """
+import copy
+import json
+import random
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
+from collections import OrderedDict
 from contextlib import contextmanager
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.config import Config
 
 
 class Database:
-    def __init__(self, db_path: str = "data/autoani.db"):
+    # 每个线程对每个数据库文件复用一个长连接
+    _local = threading.local()
+    # 所有已打开的连接，用于 close_all
+    _connections: List[sqlite3.Connection] = []
+    _connections_lock = threading.Lock()
+    # close_all 后递增，使各线程缓存的旧连接失效
+    _generation = 0
+    # 共享实例 {db_path: Database}
+    _instances: Dict[str, 'Database'] = {}
+    _instances_lock = threading.Lock()
+    # 单个番剧查询缓存 {(db_path, tmdb_id): (过期时间, series)}，LRU
+    _series_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+    _series_cache_lock = threading.Lock()
+    # 每次失效递增；查询期间发生过失效的结果不写入缓存，避免旧数据覆盖失效
+    _series_cache_version = 0
+
+    # 剧集状态机：状态 -> 允许迁移到的状态
+    #   pending --推送成功--> downloading --出现在 OpenList--> openlist_exists
+    #   downloading / pending --推送被拒绝或超时未出现--> pending（退避后重试）或 failed（达到最大次数）
+    #   failed --手动重置或出现新的种子--> pending
+    #   pending / mismatched 由抓取结果按字幕偏好互相调整；已在 OpenList 中的 pending 直接完成
+    EPISODE_TRANSITIONS = {
+        'pending': ('downloading', 'openlist_exists', 'mismatched', 'failed'),
+        'mismatched': ('pending',),
+        'downloading': ('openlist_exists', 'pending', 'failed'),
+        'failed': ('pending',),
+        'openlist_exists': (),
+    }
+    # 有后续动作的状态，按 next_run_at 调度；其余状态 next_run_at 为空
+    QUEUED_STATUSES = ('pending', 'downloading')
+
+    def __init__(self, db_path: str = "data/autoani.db", synchronous: str = None,
+                 cache_size: int = None, mmap_size: int = None):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._key = str(self.db_path.resolve())
+
+        self.synchronous = synchronous or Config.SQLITE_SYNCHRONOUS
+        self.cache_size = cache_size if cache_size is not None else Config.SQLITE_CACHE_SIZE
+        self.mmap_size = mmap_size if mmap_size is not None else Config.SQLITE_MMAP_SIZE
+
+        # 状态页统计快照 (生成时间, 统计)
+        self._dashboard_stats: Optional[tuple] = None
+        self._dashboard_stats_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, db_path: str = "data/autoani.db") -> 'Database':
+        """
+        获取共享的数据库实例（Bot 处理器和调度器共用）
+
+        首次创建时执行 init_db 迁移表结构，旧版本创建的数据库不会在迁移前被新的查询访问
+        """
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            instance = cls._instances.get(key)
+            if instance is None:
+                instance = cls(db_path)
+                instance.init_db()
+                cls._instances[key] = instance
+            return instance
+
+    @classmethod
+    def close_all(cls):
+        """关闭所有线程的连接（程序退出时调用）"""
+        with cls._connections_lock:
+            for conn in cls._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            cls._connections.clear()
+            cls._generation += 1
+
+    def _connect(self) -> sqlite3.Connection:
+        """创建新连接并设置 PRAGMA"""
+        # 连接只在创建它的线程中使用，关闭由 close_all 统一处理
+        conn = sqlite3.connect(self.db_path, timeout=Config.SQLITE_BUSY_TIMEOUT,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA cache_size={int(self.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _thread_state(self) -> Dict:
+        """获取当前线程的连接状态 {conn, depth, generation, after_transaction}"""
+        states = getattr(self._local, 'states', None)
+        if states is None:
+            states = self._local.states = {}
+
+        state = states.get(self._key)
+        if state is None or state['generation'] != Database._generation:
+            conn = self._connect()
+            with self._connections_lock:
+                self._connections.append(conn)
+                generation = Database._generation
+            state = {'conn': conn, 'depth': 0, 'generation': generation, 'after_transaction': []}
+            states[self._key] = state
+
+        return state
 
     @contextmanager
     def get_connection(self):
-        """获取数据库连接的上下文管理器"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """
+        获取数据库连接的上下文管理器
+
+        复用当前线程的长连接；嵌套使用时只在最外层提交或回滚，
+        因此多个操作可以包在同一个事务里
+        """
+        state = self._thread_state()
+        conn = state['conn']
+        outermost = state['depth'] == 0
+        state['depth'] += 1
         try:
             yield conn
-            conn.commit()
+            if outermost:
+                conn.commit()
         except Exception:
-            conn.rollback()
+            if outermost:
+                conn.rollback()
             raise
         finally:
-            conn.close()
+            state['depth'] -= 1
+            if outermost:
+                callbacks, state['after_transaction'] = state['after_transaction'], []
+                for callback in callbacks:
+                    callback()
+
+    def _after_transaction(self, callback: Callable[[], None]):
+        """当前线程的最外层事务结束（提交或回滚）后执行回调；不在事务中时立即执行"""
+        state = self._thread_state()
+        if state['depth'] > 0:
+            state['after_transaction'].append(callback)
+        else:
+            callback()
 
     def init_db(self):
         """初始化数据库表结构"""
@@ -64,6 +192,11 @@ class Database:
             CREATE INDEX IF NOT EXISTS idx_blocked_keyword ON series(blocked_keyword)
             """)
 
+            # 订阅列表按季度分页：status + season_tag 过滤，title 排序
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_series_season ON series(status, season_tag, title)
+            """)
+
             # 创建 episodes 表
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS episodes (
@@ -77,6 +210,12 @@ class Database:
                 pub_date TEXT,
                 subtitle_lang TEXT,
                 status TEXT DEFAULT 'pending',
+                next_run_at TIMESTAMP,
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT,
+                last_attempt_at TIMESTAMP,
+                lease_owner TEXT,
+                lease_expires_at TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 UNIQUE(tmdb_id, episode_number, subtitle_lang),
@@ -89,8 +228,18 @@ class Database:
             CREATE INDEX IF NOT EXISTS idx_episodes_tmdb_id ON episodes(tmdb_id)
             """)
 
+            # 按状态分页、按集查找同状态的行；覆盖原来的 idx_episodes_status(status)
             cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_episodes_status ON episodes(status)
+            CREATE INDEX IF NOT EXISTS idx_episodes_status_episode ON episodes(status, tmdb_id, episode_number)
+            """)
+            cursor.execute("DROP INDEX IF EXISTS idx_episodes_status")
+
+            # 旧数据库补充下载队列字段
+            self._migrate_episode_queue(cursor)
+
+            # 下载队列索引：按状态取到期剧集
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_episodes_queue ON episodes(status, next_run_at)
             """)
 
             # 创建 openlist 表
@@ -119,6 +268,97 @@ class Database:
             CREATE INDEX IF NOT EXISTS idx_openlist_episode ON openlist(tmdb_id, episode_number)
             """)
 
+            # 创建 tmdb_cache 表（TMDB 查询缓存，payload 为 NULL 表示未找到）
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tmdb_cache (
+                cache_key TEXT PRIMARY KEY,
+                payload TEXT,
+                expires_at TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+
+            # 创建 torrent_cache 表（种子 URL -> info hash / magnet）
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS torrent_cache (
+                torrent_url TEXT PRIMARY KEY,
+                info_hash TEXT NOT NULL,
+                magnet TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+
+            # 创建 feed_cache 表（RSS 条件请求缓存）
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                checked_at TIMESTAMP,
+                updated_at TIMESTAMP
+            )
+            """)
+
+            # 创建 openlist_dirs 表（增量扫描的目录快照）
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS openlist_dirs (
+                path TEXT PRIMARY KEY,
+                modified_at TEXT,
+                fingerprint TEXT,
+                has_subdirs INTEGER DEFAULT 0,
+                scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+
+            # 创建 job_runs 表（定时任务运行记录，stages 为 {阶段: 毫秒} 的 JSON）
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                started_at TIMESTAMP NOT NULL,
+                finished_at TIMESTAMP,
+                duration_ms REAL,
+                items INTEGER DEFAULT 0,
+                http_calls INTEGER DEFAULT 0,
+                errors INTEGER DEFAULT 0,
+                stages TEXT,
+                counters TEXT,
+                error TEXT
+            )
+            """)
+
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_job_runs_job ON job_runs(job_name, started_at)
+            """)
+
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_job_runs_started ON job_runs(started_at)
+            """)
+
+    def _migrate_episode_queue(self, cursor):
+        """为旧的 episodes 表添加下载队列字段，并为队列中的剧集设置首次运行时间"""
+        cursor.execute("PRAGMA table_info(episodes)")
+        columns = {row['name'] for row in cursor.fetchall()}
+
+        for name, definition in [
+            ('next_run_at', 'TIMESTAMP'),
+            ('attempts', 'INTEGER DEFAULT 0'),
+            ('last_error', 'TEXT'),
+            ('last_attempt_at', 'TIMESTAMP'),
+            ('lease_owner', 'TEXT'),
+            ('lease_expires_at', 'TIMESTAMP'),
+        ]:
+            if name not in columns:
+                cursor.execute(f"ALTER TABLE episodes ADD COLUMN {name} {definition}")
+
+        placeholders = ', '.join('?' for _ in self.QUEUED_STATUSES)
+        cursor.execute(f"""
+        UPDATE episodes SET next_run_at = ?
+        WHERE next_run_at IS NULL AND status IN ({placeholders})
+        """, (datetime.now().isoformat(), *self.QUEUED_STATUSES))
+
     def insert_series(self, tmdb_id: int, title: str, series_name: str,
                      blocked_keyword: str, **kwargs):
         """插入或更新番剧信息"""
@@ -144,6 +384,7 @@ class Database:
                 kwargs.get('source', 'mikan'),
                 datetime.now().isoformat()
             ))
+        self.invalidate_series(tmdb_id)
 
     def is_blocked(self, series_name: str) -> bool:
         """检查番剧是否已被屏蔽"""
@@ -172,25 +413,283 @@ class Database:
         series_list = self.get_all_series(status)
         return {s['tmdb_id']: s for s in series_list}
 
+    def get_series(self, tmdb_id: int) -> Optional[Dict]:
+        """按主键获取番剧（任意状态），不存在返回 None"""
+        return self.get_series_many([tmdb_id]).get(tmdb_id)
+
+    def get_series_many(self, tmdb_ids: List[int]) -> Dict[int, Dict]:
+        """
+        按主键批量获取番剧（任意状态）
+
+        先查进程内缓存，未命中的一次查询后写入缓存；
+        本进程修改番剧时通过 invalidate_series 失效，其他进程的修改在 SERIES_CACHE_TTL_SECONDS 后可见
+
+        Returns:
+            Dict: {tmdb_id: series_dict}，不存在的番剧不包含在内
+        """
+        result = {}
+        missing = []
+        now = time.monotonic()
+
+        with self._series_cache_lock:
+            version = Database._series_cache_version
+            for tmdb_id in dict.fromkeys(tmdb_ids):
+                entry = self._series_cache.get((self._key, tmdb_id))
+                if entry and entry[0] > now:
+                    self._series_cache.move_to_end((self._key, tmdb_id))
+                    result[tmdb_id] = dict(entry[1])
+                else:
+                    missing.append(tmdb_id)
+
+        if not missing:
+            return result
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT * FROM series WHERE tmdb_id IN (SELECT value FROM json_each(?))
+            """, (json.dumps(missing),))
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        expires_at = now + Config.SERIES_CACHE_TTL_SECONDS
+        with self._series_cache_lock:
+            for row in rows:
+                result[row['tmdb_id']] = row
+                if Database._series_cache_version != version:
+                    continue
+                self._series_cache[(self._key, row['tmdb_id'])] = (expires_at, dict(row))
+                self._series_cache.move_to_end((self._key, row['tmdb_id']))
+            while len(self._series_cache) > Config.SERIES_CACHE_SIZE:
+                self._series_cache.popitem(last=False)
+
+        return result
+
+    def invalidate_series(self, tmdb_id: int = None):
+        """
+        番剧被修改或删除后使缓存失效，tmdb_id 为 None 时清空该数据库的全部缓存
+
+        在事务中调用时推迟到最外层事务结束后执行，避免其他线程在提交前把旧数据重新写入缓存
+        """
+        self._after_transaction(lambda: self._drop_series_cache(tmdb_id))
+
+    def _drop_series_cache(self, tmdb_id: Optional[int]):
+        with self._series_cache_lock:
+            Database._series_cache_version += 1
+            if tmdb_id is not None:
+                self._series_cache.pop((self._key, tmdb_id), None)
+                return
+            for key in [key for key in self._series_cache if key[0] == self._key]:
+                del self._series_cache[key]
+
+    def get_season_tags(self, status: str = 'active', exclude: str = None) -> List[str]:
+        """获取有订阅的季度标签（降序，最新的在前）"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT DISTINCT season_tag FROM series
+            WHERE status = ? AND season_tag IS NOT NULL AND season_tag IS NOT ?
+            ORDER BY season_tag DESC
+            """, (status, exclude))
+            return [row['season_tag'] for row in cursor.fetchall()]
+
+    def count_series(self, season_tag: str, status: str = 'active') -> int:
+        """统计某个季度的番剧数量"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT COUNT(*) AS count FROM series WHERE status = ? AND season_tag = ?
+            """, (status, season_tag))
+            return cursor.fetchone()['count']
+
+    def get_series_page(self, season_tag: str, limit: int, after: int = None, before: int = None,
+                        status: str = 'active') -> List[Dict]:
+        """
+        按季度分页获取番剧及各状态剧集数（一次查询）
+
+        按 (title, tmdb_id) 排序的键集分页：after / before 为上一页最后一部 / 下一页第一部的 tmdb_id，
+        翻页耗时与订阅总数无关；游标番剧已不存在时返回空列表
+
+        Args:
+            season_tag: 季度标签
+            limit: 每页数量
+            after: 取该番剧之后的一页
+            before: 取该番剧之前的一页
+
+        Returns:
+            List[Dict]: 番剧信息，附加 episode_count（剧集总数）和 episode_stats（{状态: 剧集数}）
+        """
+        where = "status = ? AND season_tag = ?"
+        params: list = [status, season_tag]
+        order = "title, tmdb_id"
+
+        cursor_id = after if after is not None else before
+        if cursor_id is not None:
+            op = '>' if after is not None else '<'
+            where += f" AND (title, tmdb_id) {op} (SELECT title, tmdb_id FROM series WHERE tmdb_id = ?)"
+            params.append(cursor_id)
+            if before is not None:
+                order = "title DESC, tmdb_id DESC"
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+            WITH page AS (
+                SELECT * FROM series WHERE {where}
+                ORDER BY {order} LIMIT ?
+            )
+            SELECT page.*, e.status AS episode_status, COUNT(e.id) AS count
+            FROM page LEFT JOIN episodes e ON e.tmdb_id = page.tmdb_id
+            GROUP BY page.tmdb_id, e.status
+            ORDER BY page.title, page.tmdb_id
+            """, params + [limit])
+
+            page: Dict[int, Dict] = {}
+            for row in cursor.fetchall():
+                row = dict(row)
+                episode_status = row.pop('episode_status')
+                count = row.pop('count')
+                series = page.setdefault(row['tmdb_id'], dict(row, episode_count=0, episode_stats={}))
+                if episode_status is not None:
+                    series['episode_stats'][episode_status] = count
+                    series['episode_count'] += count
+
+        return list(page.values())
+
+    # 抓取结果可以覆盖的状态；其余状态（下载中、已存在等）由后续流程维护，不被覆盖
+    EPISODE_OVERWRITABLE_STATUSES = ('pending', 'mismatched')
+
     def insert_episode(self, tmdb_id: int, episode_number: int, title: str,
                       torrent_link: str, **kwargs):
         """插入或更新剧集信息"""
+        self.upsert_episodes(tmdb_id, [dict(kwargs, episode_number=episode_number,
+                                            title=title, torrent_link=torrent_link)])
+
+    def upsert_episodes(self, tmdb_id: int, episodes: List[Dict]) -> int:
+        """
+        批量插入或更新某个番剧的剧集（单个事务）
+
+        按 (tmdb_id, episode_number, subtitle_lang) 去重，同一批次中后出现的条目优先；
+        已存在且内容未变化的行不写入；已存在行的 id、created_at 保持不变，
+        状态只在 pending / mismatched 之间按新结果更新，变为 pending 时进入下载队列；
+        种子链接变化时重置失败次数，failed 的剧集出现新种子时重新进入下载队列
+
+        Args:
+            tmdb_id: 番剧 ID
+            episodes: 剧集列表 [{episode_number, title, torrent_link, episode_link,
+                      file_size, pub_date, subtitle_lang, status}]
+
+        Returns:
+            int: 实际插入或更新的行数
+        """
+        now = datetime.now()
+
+        rows = {}
+        for episode in episodes:
+            key = (episode['episode_number'], episode.get('subtitle_lang'))
+            status = episode.get('status', 'pending')
+            rows[key] = (
+                tmdb_id, episode['episode_number'], episode['title'], episode['torrent_link'],
+                episode.get('episode_link'),
+                episode.get('file_size'),
+                episode.get('pub_date'),
+                episode.get('subtitle_lang'),
+                status,
+                now.isoformat(),
+                self._next_run_at(status, now)
+            )
+
+        if not rows:
+            return 0
+
+        # {src} 为新值所在的表（excluded 或 new）
+        overwritable = ', '.join(f"'{status}'" for status in self.EPISODE_OVERWRITABLE_STATUSES)
+        torrent_changed = "episodes.torrent_link IS NOT {src}.torrent_link"
+        new_status = f"""CASE
+            WHEN episodes.status IN ({overwritable}) THEN {{src}}.status
+            WHEN episodes.status = 'failed' AND {torrent_changed} THEN {{src}}.status
+            ELSE episodes.status
+        END"""
+        changed = f"""(
+            episodes.title IS NOT {{src}}.title
+            OR {torrent_changed}
+            OR episodes.episode_link IS NOT {{src}}.episode_link
+            OR episodes.file_size IS NOT {{src}}.file_size
+            OR episodes.pub_date IS NOT {{src}}.pub_date
+            OR episodes.status IS NOT {new_status}
+        )"""
+        # 新进入 pending 的剧集立即到期，仍为 pending 的保留原有的下一次处理时间
+        next_run_at = f"""CASE {new_status}
+            WHEN 'pending' THEN COALESCE(episodes.next_run_at, {{src}}.updated_at)
+            WHEN 'mismatched' THEN NULL
+            ELSE episodes.next_run_at
+        END"""
+        # 失败次数针对某个种子，换种子后重新计数
+        retry_reset = f"""
+            attempts = CASE WHEN {torrent_changed} THEN 0 ELSE episodes.attempts END,
+            last_error = CASE WHEN {torrent_changed} THEN NULL ELSE episodes.last_error END"""
+
+        keyed = [row for key, row in rows.items() if key[1] is not None]
+        # UNIQUE 约束中 NULL 互不冲突，无字幕语言的行单独按「更新，不存在则插入」处理
+        unkeyed = [row for key, row in rows.items() if key[1] is None]
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-            INSERT OR REPLACE INTO episodes
-            (tmdb_id, episode_number, title, torrent_link, episode_link,
-             file_size, pub_date, subtitle_lang, status, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                tmdb_id, episode_number, title, torrent_link,
-                kwargs.get('episode_link'),
-                kwargs.get('file_size'),
-                kwargs.get('pub_date'),
-                kwargs.get('subtitle_lang'),
-                kwargs.get('status', 'pending'),
-                datetime.now().isoformat()
-            ))
+            # WITH 开头的 UPDATE 不返回 rowcount，用 total_changes 统计写入行数
+            changes_before = conn.total_changes
+
+            if keyed:
+                cursor.executemany(f"""
+                INSERT INTO episodes
+                (tmdb_id, episode_number, title, torrent_link, episode_link,
+                 file_size, pub_date, subtitle_lang, status, updated_at, next_run_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(tmdb_id, episode_number, subtitle_lang) DO UPDATE SET
+                    title = excluded.title,
+                    torrent_link = excluded.torrent_link,
+                    episode_link = excluded.episode_link,
+                    file_size = excluded.file_size,
+                    pub_date = excluded.pub_date,
+                    status = {new_status.format(src='excluded')},
+                    next_run_at = {next_run_at.format(src='excluded')},
+                    {retry_reset.format(src='excluded')},
+                    updated_at = excluded.updated_at
+                WHERE {changed.format(src='excluded')}
+                """, keyed)
+
+            if unkeyed:
+                cursor.executemany(f"""
+                WITH new(tmdb_id, episode_number, title, torrent_link, episode_link,
+                         file_size, pub_date, status, updated_at)
+                AS (VALUES (?, ?, ?, ?, ?, CAST(? AS INTEGER), ?, ?, ?))
+                UPDATE episodes SET
+                    title = new.title,
+                    torrent_link = new.torrent_link,
+                    episode_link = new.episode_link,
+                    file_size = new.file_size,
+                    pub_date = new.pub_date,
+                    status = {new_status.format(src='new')},
+                    next_run_at = {next_run_at.format(src='new')},
+                    {retry_reset.format(src='new')},
+                    updated_at = new.updated_at
+                FROM new
+                WHERE episodes.tmdb_id = new.tmdb_id
+                  AND episodes.episode_number = new.episode_number
+                  AND episodes.subtitle_lang IS NULL
+                  AND {changed.format(src='new')}
+                """, [row[:7] + row[8:10] for row in unkeyed])
+
+                cursor.executemany("""
+                INSERT INTO episodes
+                (tmdb_id, episode_number, title, torrent_link, episode_link,
+                 file_size, pub_date, subtitle_lang, status, updated_at, next_run_at)
+                SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM episodes
+                    WHERE tmdb_id = ? AND episode_number = ? AND subtitle_lang IS NULL
+                )
+                """, [row + (row[0], row[1]) for row in unkeyed])
+
+            return conn.total_changes - changes_before
 
     def get_episodes_by_series(self, tmdb_id: int) -> List[Dict]:
         """获取某个番剧的所有剧集"""
@@ -214,6 +713,57 @@ class Database:
             results = cursor.fetchall()
             return [dict(row) for row in results]
 
+    def get_episodes_page(self, status: str, limit: int, offset: int = 0) -> Tuple[List[Dict], int]:
+        """
+        分页获取某个状态的剧集（附带 series_name），按番剧和集数排序
+
+        Returns:
+            (本页剧集, 该状态的剧集总数)
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) AS count FROM episodes WHERE status = ?", (status,))
+            total = cursor.fetchone()['count']
+
+            cursor.execute("""
+            SELECT e.*, COALESCE(s.series_name, 'Unknown') AS series_name
+            FROM episodes e
+            LEFT JOIN series s ON s.tmdb_id = e.tmdb_id
+            WHERE e.status = ?
+            ORDER BY e.tmdb_id, e.episode_number, e.id
+            LIMIT ? OFFSET ?
+            """, (status, limit, offset))
+            return [dict(row) for row in cursor.fetchall()], total
+
+    def get_episode_numbers(self, tmdb_id: int, status: str) -> set:
+        """获取某个番剧处于指定状态的集数"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT DISTINCT episode_number FROM episodes WHERE status = ? AND tmdb_id = ?
+            """, (status, tmdb_id))
+            return {row['episode_number'] for row in cursor.fetchall()}
+
+    def prune_superseded_mismatched(self) -> int:
+        """
+        删除已被取代的 mismatched 剧集：同一番剧同一集已有 openlist_exists 的行
+
+        Returns:
+            int: 删除的行数
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            DELETE FROM episodes
+            WHERE status = 'mismatched' AND EXISTS (
+                SELECT 1 FROM episodes done
+                WHERE done.status = 'openlist_exists'
+                  AND done.tmdb_id = episodes.tmdb_id
+                  AND done.episode_number = episodes.episode_number
+            )
+            """)
+            return cursor.rowcount
+
     def get_episode_by_id(self, episode_id: int) -> Optional[Dict]:
         """根据ID获取剧集"""
         with self.get_connection() as conn:
@@ -224,14 +774,334 @@ class Database:
             result = cursor.fetchone()
             return dict(result) if result else None
 
+    @staticmethod
+    def _next_run_at(status: str, now: datetime) -> Optional[str]:
+        """
+        进入某状态后下一次处理的时间
+
+        pending 立即可推送；downloading 推送后等待一段时间再检查是否完成；
+        其余状态没有后续动作
+        """
+        if status == 'pending':
+            return now.isoformat()
+        if status == 'downloading':
+            return (now + timedelta(minutes=Config.DOWNLOAD_CHECK_DELAY_MINUTES)).isoformat()
+        return None
+
     def update_episode_status(self, episode_id: int, status: str):
         """更新剧集状态"""
+        now = datetime.now()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-            UPDATE episodes SET status = ?, updated_at = ?
+            UPDATE episodes SET status = ?, next_run_at = ?, updated_at = ?,
+                lease_owner = NULL, lease_expires_at = NULL
             WHERE id = ?
-            """, (status, datetime.now().isoformat(), episode_id))
+            """, (status, self._next_run_at(status, now), now.isoformat(), episode_id))
+
+    def move_episodes_status(self, episode_ids: List[int], from_status: str,
+                             to_status: str) -> int:
+        """
+        将指定剧集从 from_status 批量迁移到 to_status（单个事务）
+        当前状态已不是 from_status 的剧集不会被修改；迁移后释放租约并按新状态设置下一次处理时间，
+        迁移到 downloading 时记录推送时间（超时判断的起点）
+
+        Returns:
+            更新的行数
+        """
+        if not episode_ids:
+            return 0
+
+        if to_status not in self.EPISODE_TRANSITIONS.get(from_status, ()):
+            raise ValueError(f"不允许的状态迁移: {from_status} -> {to_status}")
+
+        now = datetime.now()
+        next_run_at = self._next_run_at(to_status, now)
+        attempted_at = now.isoformat() if to_status == 'downloading' else None
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+            UPDATE episodes SET status = ?, next_run_at = ?, updated_at = ?,
+                last_attempt_at = COALESCE(?, last_attempt_at),
+                lease_owner = NULL, lease_expires_at = NULL
+            WHERE id = ? AND status = ?
+            """, [(to_status, next_run_at, now.isoformat(), attempted_at, episode_id, from_status)
+                  for episode_id in episode_ids])
+            return cursor.rowcount
+
+    @staticmethod
+    def _retry_delay_minutes(attempts: int) -> float:
+        """
+        第 attempts 次失败后的重试间隔（分钟）
+
+        指数退避：base * 2^(attempts-1)，不超过上限；
+        在后一半区间内随机抖动，避免同一批失败的剧集同时重试
+        """
+        delay = min(Config.DOWNLOAD_BACKOFF_MAX_MINUTES,
+                    Config.DOWNLOAD_BACKOFF_BASE_MINUTES * 2 ** max(attempts - 1, 0))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def record_episode_failures(self, failures: List[tuple],
+                                from_status: str) -> Tuple[List[Dict], List[Dict]]:
+        """
+        记录下载失败（单个事务）
+
+        失败次数加一并保存错误信息；未达到 DOWNLOAD_MAX_ATTEMPTS 的剧集回到 pending，
+        按指数退避推迟下一次推送，达到的剧集标记为 failed 不再推送。
+        当前状态已不是 from_status 的剧集不会被修改
+
+        Args:
+            failures: [(episode_id, 错误信息), ...]
+            from_status: 失败时的状态（pending / downloading）
+
+        Returns:
+            (等待重试的剧集, 标记为 failed 的剧集)，每项包含 id, tmdb_id, episode_number,
+            series_name, attempts, last_error, next_run_at
+        """
+        if not failures:
+            return [], []
+
+        errors = dict(failures)
+        now = datetime.now()
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT e.id, e.tmdb_id, e.episode_number, e.attempts, s.series_name
+            FROM episodes e
+            LEFT JOIN series s ON s.tmdb_id = e.tmdb_id
+            WHERE e.status = ? AND e.id IN (SELECT value FROM json_each(?))
+            """, (from_status, json.dumps(list(errors))))
+            episodes = [dict(row) for row in cursor.fetchall()]
+
+            retrying, failed = [], []
+            for episode in episodes:
+                attempts = (episode['attempts'] or 0) + 1
+                episode['attempts'] = attempts
+                episode['last_error'] = errors[episode['id']]
+                if attempts >= Config.DOWNLOAD_MAX_ATTEMPTS:
+                    episode['status'] = 'failed'
+                    episode['next_run_at'] = None
+                    failed.append(episode)
+                else:
+                    episode['status'] = 'pending'
+                    episode['next_run_at'] = (
+                        now + timedelta(minutes=self._retry_delay_minutes(attempts))
+                    ).isoformat()
+                    retrying.append(episode)
+
+            cursor.executemany("""
+            UPDATE episodes SET status = ?, attempts = ?, last_error = ?, next_run_at = ?,
+                updated_at = ?, lease_owner = NULL, lease_expires_at = NULL
+            WHERE id = ? AND status = ?
+            """, [(e['status'], e['attempts'], e['last_error'], e['next_run_at'],
+                   now.isoformat(), e['id'], from_status) for e in episodes])
+
+        sort_key = lambda e: (e['tmdb_id'], e['episode_number'])
+        return sorted(retrying, key=sort_key), sorted(failed, key=sort_key)
+
+    def reset_failed_episodes(self, episode_ids: List[int] = None) -> int:
+        """
+        将 failed 剧集重置为 pending（清空失败次数，立即进入下载队列）
+
+        Args:
+            episode_ids: 只重置这些剧集（可选，默认全部）
+
+        Returns:
+            更新的行数
+        """
+        extra_filter = ""
+        params = ()
+        if episode_ids is not None:
+            extra_filter = " AND id IN (SELECT value FROM json_each(?))"
+            params = (json.dumps(list(episode_ids)),)
+
+        now = datetime.now().isoformat()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+            UPDATE episodes SET status = 'pending', attempts = 0, last_error = NULL,
+                next_run_at = ?, updated_at = ?
+            WHERE status = 'failed' {extra_filter}
+            """, (now, now, *params))
+            return cursor.rowcount
+
+    def get_stale_episodes(self, status: str, attempted_before: str,
+                           episode_ids: List[int] = None) -> List[Dict]:
+        """
+        获取最后一次推送早于 attempted_before 的剧集（没有推送记录的按 updated_at 计算）
+
+        Args:
+            status: 剧集状态
+            attempted_before: ISO 格式时间
+            episode_ids: 只在这些剧集中查找（可选）
+
+        Returns:
+            剧集列表（附带 series_name）
+        """
+        extra_filter = ""
+        params = (status, attempted_before)
+        if episode_ids is not None:
+            extra_filter = " AND e.id IN (SELECT value FROM json_each(?))"
+            params += (json.dumps(list(episode_ids)),)
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+            SELECT e.*, s.series_name
+            FROM episodes e
+            LEFT JOIN series s ON s.tmdb_id = e.tmdb_id
+            WHERE e.status = ?
+            AND julianday(COALESCE(e.last_attempt_at, e.updated_at)) <= julianday(?)
+            {extra_filter}
+            ORDER BY e.tmdb_id, e.episode_number
+            """, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    def claim_due_episodes(self, status: str, owner: str, limit: int = None,
+                           active_only: bool = False) -> List[Dict]:
+        """
+        领取到期的剧集（单个事务）
+
+        通过 (status, next_run_at) 索引只读取到期的行，并加租约，
+        租约有效期内其他 worker 不会重复领取；状态迁移时租约自动释放
+
+        Args:
+            status: 剧集状态（pending / downloading）
+            owner: worker 标识
+            limit: 最多领取数量
+            active_only: 是否只领取活跃番剧的剧集
+
+        Returns:
+            剧集列表（附带 series_name），按 next_run_at 排序
+        """
+        now = datetime.now()
+        lease_expires_at = (now + timedelta(minutes=Config.DOWNLOAD_LEASE_MINUTES)).isoformat()
+        now = now.isoformat()
+
+        active_join = "JOIN series s ON s.tmdb_id = e.tmdb_id AND s.status = 'active'" if active_only else ""
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+            UPDATE episodes SET lease_owner = ?, lease_expires_at = ?
+            WHERE id IN (
+                SELECT e.id FROM episodes e
+                {active_join}
+                WHERE e.status = ? AND e.next_run_at <= ?
+                AND (e.lease_owner IS NULL OR e.lease_expires_at <= ?)
+                ORDER BY e.next_run_at
+                LIMIT ?
+            )
+            RETURNING *,
+                (SELECT series_name FROM series s WHERE s.tmdb_id = episodes.tmdb_id) AS series_name
+            """, (owner, lease_expires_at, status, now, now, limit if limit else -1))
+            claimed = [dict(row) for row in cursor.fetchall()]
+
+        return sorted(claimed, key=lambda e: (e['next_run_at'], e['id']))
+
+    def release_episodes(self, episode_ids: List[int], owner: str, delay_minutes: float = None) -> int:
+        """
+        释放仍由 owner 持有租约的剧集（已迁移状态的剧集不受影响）
+
+        Args:
+            episode_ids: 剧集 ID 列表
+            owner: worker 标识
+            delay_minutes: 推迟下一次处理的分钟数（可选）
+
+        Returns:
+            释放的行数
+        """
+        if not episode_ids:
+            return 0
+
+        next_run_at = None
+        if delay_minutes:
+            next_run_at = (datetime.now() + timedelta(minutes=delay_minutes)).isoformat()
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+            UPDATE episodes SET lease_owner = NULL, lease_expires_at = NULL,
+                next_run_at = COALESCE(?, next_run_at)
+            WHERE id = ? AND lease_owner = ?
+            """, [(next_run_at, episode_id, owner) for episode_id in episode_ids])
+            return cursor.rowcount
+
+    def count_due_episodes(self, status: str) -> int:
+        """统计某状态中已到期的剧集数量（走队列索引）"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT COUNT(*) as count FROM episodes
+            WHERE status = ? AND next_run_at <= ?
+            """, (status, datetime.now().isoformat()))
+            return cursor.fetchone()['count']
+
+    def reconcile_with_openlist(self, status: str, fallback_status: str = None,
+                                updated_before: str = None,
+                                episode_ids: List[int] = None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        在数据库内对账 episodes 与 openlist（单个事务，集合操作）
+
+        status 状态中已存在于 openlist 表的剧集标记为 openlist_exists；
+        如指定 fallback_status，其余剧集迁移为 fallback_status
+
+        Args:
+            status: 待对账的剧集状态
+            fallback_status: 不在 openlist 中的剧集的新状态（可选）
+            updated_before: 只处理 updated_at 早于该时间的剧集（ISO 格式，可选）
+            episode_ids: 只处理这些剧集（可选，如队列领取的剧集）
+
+        Returns:
+            (已存在的剧集, 回退的剧集)，每项包含 id, tmdb_id, episode_number, series_name
+        """
+        now = datetime.now()
+        fallback_next_run_at = self._next_run_at(fallback_status, now) if fallback_status else None
+        now = now.isoformat()
+
+        extra_filter = ""
+        filter_params = (status,)
+        if updated_before:
+            extra_filter += " AND julianday(updated_at) <= julianday(?)"
+            filter_params += (updated_before,)
+        if episode_ids is not None:
+            extra_filter += " AND id IN (SELECT value FROM json_each(?))"
+            filter_params += (json.dumps(list(episode_ids)),)
+
+        returning = """
+            RETURNING id, tmdb_id, episode_number,
+                (SELECT series_name FROM series s WHERE s.tmdb_id = episodes.tmdb_id) AS series_name
+        """
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+            UPDATE episodes SET status = 'openlist_exists', next_run_at = NULL, updated_at = ?,
+                lease_owner = NULL, lease_expires_at = NULL
+            WHERE status = ? {extra_filter}
+            AND EXISTS (
+                SELECT 1 FROM openlist o
+                WHERE o.tmdb_id = episodes.tmdb_id
+                AND o.episode_number = episodes.episode_number
+            )
+            {returning}
+            """, (now, *filter_params))
+            found = [dict(row) for row in cursor.fetchall()]
+
+            fallback = []
+            if fallback_status:
+                # 已存在的剧集状态已变更，剩下的即为不在 openlist 中的
+                cursor.execute(f"""
+                UPDATE episodes SET status = ?, next_run_at = ?, updated_at = ?,
+                    lease_owner = NULL, lease_expires_at = NULL
+                WHERE status = ? {extra_filter}
+                {returning}
+                """, (fallback_status, fallback_next_run_at, now, *filter_params))
+                fallback = [dict(row) for row in cursor.fetchall()]
+
+        sort_key = lambda e: (e['tmdb_id'], e['episode_number'])
+        return sorted(found, key=sort_key), sorted(fallback, key=sort_key)
 
     def update_series_last_scraped(self, tmdb_id: int):
         """更新番剧最后刮削时间"""
@@ -242,6 +1112,7 @@ class Database:
             UPDATE series SET last_scraped_at = ?, updated_at = ?
             WHERE tmdb_id = ?
             """, (now, now, tmdb_id))
+        self.invalidate_series(tmdb_id)
 
     def update_series_subtitle_lang(self, tmdb_id: int, subtitle_lang: str,
                                    fansub_group: str = None):
@@ -252,6 +1123,7 @@ class Database:
             UPDATE series SET subtitle_lang = ?, fansub_group = ?, updated_at = ?
             WHERE tmdb_id = ?
             """, (subtitle_lang, fansub_group, datetime.now().isoformat(), tmdb_id))
+        self.invalidate_series(tmdb_id)
 
     def insert_openlist_file(self, file_path: str, file_name: str, **kwargs):
         """插入或更新 OpenList 文件信息"""
@@ -293,10 +1165,120 @@ class Database:
             results = cursor.fetchall()
             return [dict(row) for row in results]
 
-    def get_openlist_index(self) -> Dict[tuple, Dict]:
-        """获取 OpenList 索引 {(tmdb_id, episode_number): file}"""
-        files = self.get_openlist_files()
-        return {(f.get('tmdb_id'), f.get('episode_number')): f for f in files}
+    @staticmethod
+    def _path_range(dir_path: str) -> Tuple[str, str]:
+        """
+        目录下所有路径的范围 [dir/, dir0)
+
+        '0' 是 '/' 的下一个字符，按范围比较可以使用 file_path / path 上的索引
+        """
+        return f"{dir_path}/", f"{dir_path}0"
+
+    def get_openlist_files_in_dir(self, dir_path: str) -> Dict[str, Dict]:
+        """获取目录下（不含子目录）的 OpenList 文件 {file_path: file}"""
+        prefix = f"{dir_path}/"
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT * FROM openlist
+            WHERE file_path >= ? AND file_path < ?
+            """, self._path_range(dir_path))
+            results = cursor.fetchall()
+            return {
+                row['file_path']: dict(row) for row in results
+                if '/' not in row['file_path'][len(prefix):]
+            }
+
+    def get_openlist_dirs_for_series(self, tmdb_ids: List[int]) -> List[str]:
+        """获取这些番剧已有文件所在的目录"""
+        if not tmdb_ids:
+            return []
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT file_path FROM openlist
+            WHERE tmdb_id IN (SELECT value FROM json_each(?))
+            """, (json.dumps(list(tmdb_ids)),))
+            return sorted({row['file_path'].rsplit('/', 1)[0] for row in cursor.fetchall()})
+
+    def get_openlist_dir_snapshot(self) -> Dict[str, Dict]:
+        """获取目录快照 {path: {modified_at, fingerprint, has_subdirs}}"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM openlist_dirs")
+            return {row['path']: dict(row) for row in cursor.fetchall()}
+
+    def apply_openlist_scan(self, files: List[Dict], deleted_paths: List[str] = None,
+                            deleted_dirs: List[str] = None, dir_snapshots: List[Dict] = None,
+                            replace_all: bool = False):
+        """
+        在单个事务中写入一次扫描的结果
+
+        Args:
+            files: 新增或变更的文件 [{file_path, file_name, tmdb_id, episode_number, file_size, modified_at}]
+            deleted_paths: 已删除的文件路径
+            deleted_dirs: 已删除的目录（连同其下所有文件）
+            dir_snapshots: 本次列出的目录快照 [{path, modified_at, fingerprint, has_subdirs}]
+            replace_all: 全量扫描时先清空 openlist 和目录快照（同一事务内，读取方不会看到空表）
+        """
+        now = datetime.now().isoformat()
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if replace_all:
+                cursor.execute("DELETE FROM openlist")
+                cursor.execute("DELETE FROM openlist_dirs")
+
+            for dir_path in deleted_dirs or []:
+                start, end = self._path_range(dir_path)
+                cursor.execute("""
+                DELETE FROM openlist WHERE file_path >= ? AND file_path < ?
+                """, (start, end))
+                cursor.execute("""
+                DELETE FROM openlist_dirs
+                WHERE path = ? OR (path >= ? AND path < ?)
+                """, (dir_path, start, end))
+
+            if deleted_paths:
+                cursor.executemany("""
+                DELETE FROM openlist WHERE file_path = ?
+                """, [(path,) for path in deleted_paths])
+
+            if files:
+                cursor.executemany("""
+                INSERT INTO openlist
+                (file_path, file_name, tmdb_id, episode_number, file_size, modified_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(file_path) DO UPDATE SET
+                    file_name = excluded.file_name,
+                    tmdb_id = excluded.tmdb_id,
+                    episode_number = excluded.episode_number,
+                    file_size = excluded.file_size,
+                    modified_at = excluded.modified_at,
+                    updated_at = excluded.updated_at
+                """, [(
+                    f['file_path'], f['file_name'], f.get('tmdb_id'), f.get('episode_number'),
+                    f.get('file_size'), f.get('modified_at'), now
+                ) for f in files])
+
+            if dir_snapshots:
+                cursor.executemany("""
+                INSERT OR REPLACE INTO openlist_dirs
+                (path, modified_at, fingerprint, has_subdirs, scanned_at)
+                VALUES (?, ?, ?, ?, ?)
+                """, [(
+                    d['path'], d.get('modified_at'), d.get('fingerprint'),
+                    1 if d.get('has_subdirs') else 0, now
+                ) for d in dir_snapshots])
+
+    def count_openlist_files(self) -> int:
+        """统计 OpenList 文件数量"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) as count FROM openlist")
+            return cursor.fetchone()['count']
 
     def get_max_episode_number(self, tmdb_id: int) -> int:
         """获取某番剧的最大集数"""
@@ -317,21 +1299,239 @@ class Database:
             UPDATE series SET status = ?, updated_at = ?
             WHERE tmdb_id = ?
             """, (status, datetime.now().isoformat(), tmdb_id))
+        self.invalidate_series(tmdb_id)
 
     def check_and_deactivate_series(self, tmdb_id: int):
         """检查并失活已完结的番剧"""
+        series = self.get_series(tmdb_id)
+
+        if not series or not series['total_episodes']:
+            return
+
+        total_episodes = series['total_episodes']
+        max_episode = self.get_max_episode_number(tmdb_id)
+
+        if max_episode >= total_episodes:
+            self.update_series_status(tmdb_id, 'inactive')
+
+    def get_tmdb_cache(self, cache_key: str) -> Optional[Dict]:
+        """获取未过期的 TMDB 缓存 {payload, expires_at}，不存在或已过期返回 None"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-            SELECT total_episodes FROM series WHERE tmdb_id = ?
-            """, (tmdb_id,))
+            SELECT payload, expires_at FROM tmdb_cache
+            WHERE cache_key = ? AND expires_at > ?
+            """, (cache_key, datetime.now().isoformat()))
             result = cursor.fetchone()
+            return dict(result) if result else None
 
-        if not result or not result['total_episodes']:
+    def set_tmdb_cache(self, cache_key: str, payload: Optional[str], expires_at: str):
+        """写入 TMDB 缓存"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT OR REPLACE INTO tmdb_cache (cache_key, payload, expires_at, created_at)
+            VALUES (?, ?, ?, ?)
+            """, (cache_key, payload, expires_at, datetime.now().isoformat()))
+
+    def purge_expired_tmdb_cache(self) -> int:
+        """清理过期的 TMDB 缓存"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            DELETE FROM tmdb_cache WHERE expires_at <= ?
+            """, (datetime.now().isoformat(),))
+            return cursor.rowcount
+
+    def get_torrent_magnets(self, torrent_urls: List[str]) -> Dict[str, str]:
+        """批量获取已缓存的 magnet 链接 {torrent_url: magnet}"""
+        if not torrent_urls:
+            return {}
+
+        magnets = {}
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # 分批查询，避免超过 SQLite 参数上限
+            for start in range(0, len(torrent_urls), 500):
+                chunk = torrent_urls[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"""
+                SELECT torrent_url, magnet FROM torrent_cache
+                WHERE torrent_url IN ({placeholders})
+                """, chunk)
+                magnets.update({row['torrent_url']: row['magnet'] for row in cursor.fetchall()})
+        return magnets
+
+    def save_torrent_magnets(self, entries: List[Dict]):
+        """批量缓存种子解析结果 [{torrent_url, info_hash, magnet}]"""
+        if not entries:
             return
 
-        total_episodes = result['total_episodes']
-        max_episode = self.get_max_episode_number(tmdb_id)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+            INSERT OR REPLACE INTO torrent_cache (torrent_url, info_hash, magnet, created_at)
+            VALUES (?, ?, ?, ?)
+            """, [(
+                e['torrent_url'], e['info_hash'], e['magnet'], datetime.now().isoformat()
+            ) for e in entries])
 
-        if max_episode >= total_episodes:
-            self.update_series_status(tmdb_id, 'inactive')
+    def get_feed_cache(self, url: str) -> Optional[Dict]:
+        """获取 RSS 缓存信息 {etag, last_modified, content_hash}"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM feed_cache WHERE url = ?", (url,))
+            result = cursor.fetchone()
+            return dict(result) if result else None
+
+    def delete_feed_cache(self, url: str = None):
+        """删除 RSS 缓存信息，url 为 None 时清空全部"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if url is None:
+                cursor.execute("DELETE FROM feed_cache")
+            else:
+                cursor.execute("DELETE FROM feed_cache WHERE url = ?", (url,))
+
+    def get_series_ids_with_episodes(self, tmdb_ids: List[int]) -> set:
+        """返回其中已有 episodes 记录的番剧 ID"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT DISTINCT tmdb_id FROM episodes WHERE tmdb_id IN (SELECT value FROM json_each(?))
+            """, (json.dumps(list(tmdb_ids)),))
+            return {row['tmdb_id'] for row in cursor.fetchall()}
+
+    def save_feed_cache(self, url: str, etag: str = None, last_modified: str = None,
+                        content_hash: str = None):
+        """保存 RSS 缓存信息（处理成功后调用）"""
+        now = datetime.now().isoformat()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT OR REPLACE INTO feed_cache
+            (url, etag, last_modified, content_hash, checked_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, (url, etag, last_modified, content_hash, now, now))
+
+    def get_dashboard_stats(self, max_age: float = None) -> Dict:
+        """
+        状态页统计（一次查询），结果缓存 max_age 秒
+
+        Args:
+            max_age: 可接受的快照时长（秒），默认 DASHBOARD_STATS_TTL_SECONDS，0 表示强制查询
+
+        Returns:
+            {series: 活跃订阅数, episodes: 活跃订阅的剧集数, openlist_files: OpenList 文件数,
+             statuses: {状态: 剧集数}（包含所有 EPISODE_TRANSITIONS 中的状态）}
+        """
+        if max_age is None:
+            max_age = Config.DASHBOARD_STATS_TTL_SECONDS
+
+        with self._dashboard_stats_lock:
+            cached = self._dashboard_stats
+        if cached and max_age > 0 and time.monotonic() - cached[0] < max_age:
+            return copy.deepcopy(cached[1])
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM series WHERE status = 'active') AS series,
+                (SELECT COUNT(*) FROM episodes e JOIN series s ON s.tmdb_id = e.tmdb_id
+                 WHERE s.status = 'active') AS episodes,
+                (SELECT COUNT(*) FROM openlist) AS openlist_files,
+                (SELECT json_group_object(status, count) FROM (
+                    SELECT status, COUNT(*) AS count FROM episodes GROUP BY status
+                )) AS statuses
+            """)
+            row = cursor.fetchone()
+
+        statuses = dict.fromkeys(self.EPISODE_TRANSITIONS, 0)
+        statuses['completed'] = 0
+        statuses.update(json.loads(row['statuses'] or '{}'))
+        stats = {
+            'series': row['series'],
+            'episodes': row['episodes'],
+            'openlist_files': row['openlist_files'],
+            'statuses': statuses,
+        }
+
+        with self._dashboard_stats_lock:
+            self._dashboard_stats = (time.monotonic(), stats)
+        return copy.deepcopy(stats)
+
+    def insert_job_run(self, run: Dict):
+        """
+        写入一次任务运行记录，并删除超过 JOB_RUNS_RETENTION_DAYS 的旧记录（同一事务）
+
+        Args:
+            run: {job_name, status, started_at, finished_at, duration_ms, items,
+                  http_calls, errors, stages, counters, error}
+        """
+        cutoff = (datetime.now() - timedelta(days=Config.JOB_RUNS_RETENTION_DAYS)).isoformat()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT INTO job_runs
+            (job_name, status, started_at, finished_at, duration_ms, items,
+             http_calls, errors, stages, counters, error)
+            VALUES (:job_name, :status, :started_at, :finished_at, :duration_ms, :items,
+                    :http_calls, :errors, :stages, :counters, :error)
+            """, run)
+            cursor.execute("DELETE FROM job_runs WHERE started_at < ?", (cutoff,))
+
+    def get_job_runs(self, job_name: str = None, limit: int = 20) -> List[Dict]:
+        """获取最近的任务运行记录（按开始时间倒序）"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if job_name:
+                cursor.execute("""
+                SELECT * FROM job_runs WHERE job_name = ?
+                ORDER BY started_at DESC LIMIT ?
+                """, (job_name, limit))
+            else:
+                cursor.execute("""
+                SELECT * FROM job_runs ORDER BY started_at DESC LIMIT ?
+                """, (limit,))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_job_run_stats(self, since: str) -> Dict[str, Dict]:
+        """
+        按任务汇总 since 之后的运行记录
+
+        耗时和计数只统计实际执行的运行，跳过的运行单独计数
+
+        Returns:
+            {job_name: {runs, failed, skipped, avg_ms, max_ms, items, http_calls, errors,
+                        stages: {阶段: 平均毫秒}}}
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT job_name,
+                SUM(status != 'skipped') AS runs,
+                SUM(status = 'failed') AS failed,
+                SUM(status = 'skipped') AS skipped,
+                AVG(duration_ms) FILTER (WHERE status != 'skipped') AS avg_ms,
+                MAX(duration_ms) FILTER (WHERE status != 'skipped') AS max_ms,
+                SUM(items) AS items, SUM(http_calls) AS http_calls, SUM(errors) AS errors
+            FROM job_runs
+            WHERE started_at >= ?
+            GROUP BY job_name
+            """, (since,))
+            stats = {row['job_name']: dict(row, stages={}) for row in cursor.fetchall()}
+
+            # 各阶段的平均耗时（没有该阶段的运行不计入平均）
+            cursor.execute("""
+            SELECT r.job_name, s.key AS stage, AVG(s.value) AS avg_ms
+            FROM job_runs r, json_each(r.stages) s
+            WHERE r.started_at >= ? AND r.status != 'skipped'
+            GROUP BY r.job_name, s.key
+            ORDER BY avg_ms DESC
+            """, (since,))
+            for row in cursor.fetchall():
+                if row['job_name'] in stats:
+                    stats[row['job_name']]['stages'][row['stage']] = row['avg_ms']
+
+        return stats
@@ -2,12 +2,12 @@
 蜜柑页面刮削器
 """
 import re
-import requests
 from bs4 import BeautifulSoup
 from typing import Optional, Dict
 from urllib.parse import urljoin, urlparse, parse_qs
 from functools import wraps
 import feedparser
+from src.utils.http_client import HttpClient
 
 
 def safe_scrape(func):
@@ -28,10 +28,7 @@ class MikanPageScraper:
     BASE_URL = "https://mikanani.me"
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.session = HttpClient.get_session()
 
     @safe_scrape
     def scrape_episode_page(self, episode_url: str) -> Optional[Dict]:
@@ -0,0 +1,148 @@
+"""
+番剧标题解析引擎
+所有正则在模块加载时编译，一个标题只解析一次，结果按原始标题做 LRU 缓存
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+# 解析结果缓存条数（RSS 和文件名的标题数量有限，重复解析非常频繁）
+PARSE_CACHE_SIZE = 4096
+
+# 字幕语言检测规则（按优先级排序）
+SUBTITLE_KEYWORDS = [
+    ('chs_cht', ['简繁', '简繁内封', '简繁内嵌']),
+    ('chs', ['简体', '简中', '简日', '简体内嵌', '简体内封', 'chs']),
+    ('cht', ['繁体', '繁中', '繁日', '繁体内嵌', '繁体内封', 'cht']),
+]
+_SUBTITLE_KEYWORDS_LOWER = tuple(
+    (lang, tuple(keyword.lower() for keyword in keywords))
+    for lang, keywords in SUBTITLE_KEYWORDS
+)
+
+_GROUP_RE = re.compile(r'^\[(.*?)\]')
+_LEADING_GROUP_RE = re.compile(r'^\[.*?\]\s*')
+
+# 集数模式（按优先级）
+_EPISODE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\s-\s*(\d{1,4})(?:v\d+)?(?=[\s\[\(【.]|$)',      # - 05 [ / - 05v2 / - 05.mkv
+    r'[\[【](\d{1,4})(?:v\d+)?(?:END)?[\]】]',          # [05] / [05v2] / 【05】
+    r'第\s*(\d+)\s*[集话話]',                           # 第05集
+    r'(?<![A-Za-z])EP?\.?\s*(\d{1,4})',                # EP05, E05, EP.05, S01E05
+    r'#(\d+)',                                         # #05
+))
+
+# 1080p / 1920x1080（取高度）
+_RESOLUTION_RE = re.compile(r'(\d{3,4})(?:[pP]|\s*[xX×]\s*(\d{3,4}))')
+
+# 编码关键词（小写子串匹配，比大小写不敏感的正则快）
+_CODEC_KEYWORDS = (
+    ('hevc', ('hevc', 'x265', 'h265', 'h.265')),
+    ('avc', ('avc', 'x264', 'h264', 'h.264')),
+    ('av1', ('av1',)),
+)
+
+
+class ParsedTitle:
+    """标题解析结果（只读，会被缓存共享）"""
+
+    __slots__ = ('raw', 'group', 'series_name', 'episode', 'subtitle_lang', 'resolution', 'codec')
+
+    def __init__(self, raw: str, group: Optional[str] = None, series_name: Optional[str] = None,
+                 episode: Optional[int] = None, subtitle_lang: Optional[str] = None,
+                 resolution: Optional[str] = None, codec: Optional[str] = None):
+        self.raw = raw
+        self.group = group
+        self.series_name = series_name
+        self.episode = episode
+        self.subtitle_lang = subtitle_lang
+        self.resolution = resolution
+        self.codec = codec
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__[1:])
+        return f"ParsedTitle({fields})"
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_title(title: str) -> ParsedTitle:
+    """
+    解析标题
+
+    标题格式示例:
+    - [LoliHouse] 永远的黄昏 / Towa no Yuugure - 05 [WebRip 1080p HEVC-10bit AAC][简繁内封字幕]
+    - [猎户手抄部] 不动声色的柏田与喜形于色的太田 - 01 [1080p HEVC-10bit AAC]
+
+    Args:
+        title: 原始标题或文件名
+
+    Returns:
+        ParsedTitle: 无法识别的字段为 None
+    """
+    if not title:
+        return ParsedTitle(title)
+
+    group_match = _GROUP_RE.match(title)
+    title_lower = title.lower()
+
+    return ParsedTitle(
+        title,
+        group=group_match.group(1) if group_match else None,
+        series_name=_series_name(title),
+        episode=_episode(title),
+        subtitle_lang=_subtitle_lang(title_lower),
+        resolution=_resolution(title, title_lower),
+        codec=_codec(title_lower),
+    )
+
+
+def _series_name(title: str) -> Optional[str]:
+    """去除字幕组标签后，取 / 前（通常是中文名）或 - 前的部分"""
+    cleaned = _LEADING_GROUP_RE.sub('', title, count=1)
+
+    if '/' in cleaned:
+        series_name = cleaned.split('/', 1)[0]
+    else:
+        series_name = cleaned.split('-', 1)[0]
+
+    series_name = ' '.join(series_name.split())
+    return series_name or None
+
+
+def _episode(title: str) -> Optional[int]:
+    for pattern in _EPISODE_PATTERNS:
+        match = pattern.search(title)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _subtitle_lang(title_lower: str) -> Optional[str]:
+    has_cht = 'cht' in title_lower
+
+    for lang, keywords in _SUBTITLE_KEYWORDS_LOWER:
+        for keyword in keywords:
+            # CHS 特殊处理：避免匹配到 CHT
+            if keyword == 'chs' and has_cht:
+                continue
+            if keyword in title_lower:
+                return lang
+
+    return None
+
+
+def _resolution(title: str, title_lower: str) -> Optional[str]:
+    match = _RESOLUTION_RE.search(title)
+    if match:
+        return f"{match.group(2) or match.group(1)}p"
+    if '4k' in title_lower:
+        return '2160p'
+    return None
+
+
+def _codec(title_lower: str) -> Optional[str]:
+    for codec, keywords in _CODEC_KEYWORDS:
+        for keyword in keywords:
+            if keyword in title_lower:
+                return codec
+    return None
@@ -1,12 +1,25 @@
 """
 番剧标题解析器
 """
-import re
 from typing import Optional
+from src.parsers.title_engine import ParsedTitle, parse_title
 
 
 class TitleParser:
-    """标题解析器"""
+    """标题解析器（基于 title_engine，结果按标题缓存）"""
+
+    @staticmethod
+    def parse(title: str) -> ParsedTitle:
+        """
+        一次解析出字幕组、番剧名、集数、字幕语言、分辨率和编码
+
+        Args:
+            title: 原始标题或文件名
+
+        Returns:
+            ParsedTitle
+        """
+        return parse_title(title)
 
     @staticmethod
     def extract_series_name(title: str) -> Optional[str]:
@@ -28,28 +41,7 @@ class TitleParser:
         Returns:
             番剧名称，失败返回 None
         """
-        if not title:
-            return None
-
-        try:
-            # 去除字幕组标签 [xxx]
-            cleaned = re.sub(r'^\[.*?\]\s*', '', title)
-
-            # 如果包含 / 分隔符，提取 / 前的部分（通常是中文名）
-            if '/' in cleaned:
-                series_name = cleaned.split('/')[0].strip()
-            else:
-                # 否则提取 - 前的部分
-                series_name = cleaned.split('-')[0].strip()
-
-            # 去除可能的多余空格
-            series_name = ' '.join(series_name.split())
-
-            return series_name if series_name else None
-
-        except Exception as e:
-            print(f"Failed to parse title '{title}': {e}")
-            return None
+        return parse_title(title).series_name
 
     @staticmethod
     def extract_episode_number(title: str) -> Optional[int]:
@@ -62,25 +54,7 @@ class TitleParser:
         Returns:
             集数，失败返回 None
         """
-        try:
-            # 匹配 - 数字 或 第x集 等模式
-            patterns = [
-                r'-\s*(\d+)\s*(?:\[|$)',     # - 05 [
-                r'\[(\d+)\]',                 # [01]
-                r'第\s*(\d+)\s*[集话話]',      # 第05集
-                r'EP?\s*(\d+)',               # EP05 or E05
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, title)
-                if match:
-                    return int(match.group(1))
-
-            return None
-
-        except Exception as e:
-            print(f"Failed to extract episode number from '{title}': {e}")
-            return None
+        return parse_title(title).episode
 
     @staticmethod
     def extract_fansub_group(title: str) -> Optional[str]:
@@ -93,5 +67,4 @@ class TitleParser:
         Returns:
             字幕组名称
         """
-        match = re.match(r'^\[(.*?)\]', title)
-        return match.group(1) if match else None
+        return parse_title(title).group
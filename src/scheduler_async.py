@@ -3,28 +3,65 @@
 整合所有定时任务，支持动态配置和手动触发
 """
 import asyncio
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from src.services.subscription_tracker import SubscriptionTracker
 from src.services.episode_scraper import EpisodeScraper
 from src.services.offline_downloader import OfflineDownloader
 from src.services.openlist_scanner import OpenListScanner
-from src.models.database import Database
+from src.models.async_database import AsyncDatabase
 from src.utils.scheduler_config import SchedulerConfig
+from src.utils.config import Config
+from src.utils.metrics import JobRun, Metrics
 
 
 class AsyncScheduler:
     """异步调度器"""
 
+    # 任务显示名称
+    TASK_LABELS = {
+        'rss_scrape': 'RSS刮削',
+        'scrape_episodes': '剧集刮削',
+        'push_download': '推送下载',
+        'check_complete': '检测完成',
+        'check_failed': '检测失败',
+    }
+
+    # 任务依赖：执行前等待这些任务的当前运行结束（不会主动触发它们）
+    #   先刮削再推送，推送前等待检测完成刷新 OpenList 索引
+    TASK_DEPENDENCIES = {
+        'scrape_episodes': ('rss_scrape',),
+        'push_download': ('rss_scrape', 'scrape_episodes', 'check_complete'),
+    }
+
+    # 共享资源：使用同一资源的任务排队互斥执行（都会扫描并写入 openlist 表）
+    TASK_RESOURCES = {
+        'check_complete': 'openlist',
+        'check_failed': 'openlist',
+    }
+
+    # 任务运行结果
+    RUN_COMPLETED = 'completed'
+    RUN_FAILED = 'failed'
+    RUN_SKIPPED = 'skipped'
+
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
+        # 错过的多次运行合并为一次；同一任务同时只运行一个实例
+        self.scheduler = AsyncIOScheduler(job_defaults={
+            'coalesce': True,
+            'max_instances': 1,
+            'misfire_grace_time': 60,
+        })
         self.subscription_tracker = SubscriptionTracker()
         self.episode_scraper = EpisodeScraper()
         self.downloader = OfflineDownloader()
         self.openlist_scanner = OpenListScanner()
-        self.db = Database()
+        # 调度器自身的数据库操作（运行记录）通过异步门面执行，不阻塞与 Bot 共用的事件循环；
+        # 任务体在工作线程中直接使用 Database，不经过门面的写线程
+        self.db = AsyncDatabase.get_instance()
         self.config = SchedulerConfig()
 
         # 任务 ID
@@ -35,128 +72,155 @@ class AsyncScheduler:
             'check_failed': 'check_failed_task',
         }
 
-    async def task_rss_scrape(self):
-        """任务1: RSS刮削 + 更新series"""
+        # 每个任务一把锁：已在运行时新的运行直接跳过
+        self._task_locks = {name: asyncio.Lock() for name in self.TASK_LABELS}
+        # 任务空闲事件，供依赖它的任务等待
+        self._task_idle = {name: asyncio.Event() for name in self.TASK_LABELS}
+        for event in self._task_idle.values():
+            event.set()
+        self._resource_locks = {name: asyncio.Lock() for name in set(self.TASK_RESOURCES.values())}
+        # 跳过的运行 {task_name: {'count', 'last_at', 'reason'}}
+        self.skipped_runs: Dict[str, Dict] = {}
+        # 未等待的后台写入（保留引用，避免任务被回收）
+        self._background_tasks = set()
+
+    def is_running(self, task_name: str) -> bool:
+        """任务是否正在运行（包括等待依赖和资源）"""
+        lock = self._task_locks.get(task_name)
+        return bool(lock and lock.locked())
+
+    def _record_skip(self, task_name: str, reason: str):
+        """记录一次跳过的运行（在后台写入 job_runs，需在事件循环中调用）"""
+        stats = self.skipped_runs.setdefault(task_name, {'count': 0, 'last_at': None, 'reason': None})
+        stats['count'] += 1
+        stats['last_at'] = datetime.now()
+        stats['reason'] = reason
+        label = self.TASK_LABELS.get(task_name, task_name)
+        print(f"[{label}] 跳过：{reason}（累计跳过 {stats['count']} 次）")
+
+        job_run = JobRun(task_name)
+        job_run.errors.append(reason)
+        job_run.finish(self.RUN_SKIPPED)
+        task = asyncio.ensure_future(self._save_job_run(job_run))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _save_job_run(self, job_run: JobRun):
+        """写入运行记录（失败不影响任务本身）"""
         try:
-            print(f"\n{'='*60}")
-            print(f"[RSS刮削] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"{'='*60}")
+            await self.db.insert_job_run(job_run.to_row())
+        except Exception as e:
+            print(f"⚠️  写入任务运行记录失败: {e}")
 
-            # 在异步环境中同步调用
-            await asyncio.to_thread(self.subscription_tracker.process_subscriptions)
+    def _on_job_skipped(self, event):
+        """APScheduler 因实例数上限或错过执行时间而跳过的运行"""
+        task_name = next((name for name, job_id in self.TASK_IDS.items() if job_id == event.job_id), event.job_id)
+        if event.code == EVENT_JOB_MAX_INSTANCES:
+            self._record_skip(task_name, '上一次仍在运行')
+        else:
+            self._record_skip(task_name, '错过执行时间')
 
-            print(f"[RSS刮削] 完成\n")
+    async def _run_task(self, task_name: str, body: Callable[[], Awaitable]) -> str:
+        """
+        按任务锁、依赖和共享资源执行任务，并记录运行指标
 
-        except Exception as e:
-            print(f"[RSS刮削] 失败: {e}\n")
+        同一任务已在运行时直接跳过并记录；否则先等待依赖任务的当前运行结束，
+        再获取共享资源锁，最后执行任务体；等待时间记为 wait 阶段
 
-    async def task_scrape_episodes(self):
-        """任务2: 刮削剧集信息 + 更新episodes"""
-        try:
-            print(f"\n{'='*60}")
-            print(f"[剧集刮削] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"{'='*60}")
+        Returns:
+            str: RUN_COMPLETED / RUN_FAILED / RUN_SKIPPED
+        """
+        label = self.TASK_LABELS[task_name]
+        lock = self._task_locks[task_name]
 
-            await asyncio.to_thread(self.episode_scraper.scrape_all_subscriptions)
+        if lock.locked():
+            self._record_skip(task_name, '上一次仍在运行')
+            return self.RUN_SKIPPED
 
-            print(f"[剧集刮削] 完成\n")
+        async with lock:
+            self._task_idle[task_name].clear()
+            with Metrics.run(task_name) as job_run:
+                try:
+                    result = await self._run_task_body(task_name, label, body)
+                finally:
+                    self._task_idle[task_name].set()
 
-        except Exception as e:
-            print(f"[剧集刮削] 失败: {e}\n")
+                job_run.finish(result)
+                print(f"[{label}] {job_run.summary()}\n")
+                await self._save_job_run(job_run)
+                return result
 
-    async def task_push_download(self):
-        """任务3: 推送离线下载"""
-        try:
-            print(f"\n{'='*60}")
-            print(f"[推送下载] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"{'='*60}")
+    async def _run_task_body(self, task_name: str, label: str, body: Callable[[], Awaitable]) -> str:
+        """等待依赖和共享资源后执行任务体"""
+        resource = self.TASK_RESOURCES.get(task_name)
 
-            # 限制每次推送5个
-            await asyncio.to_thread(self.downloader.push_missing_episodes, limit=5)
+        with Metrics.stage('wait'):
+            for dependency in self.TASK_DEPENDENCIES.get(task_name, ()):
+                if not self._task_idle[dependency].is_set():
+                    print(f"[{label}] 等待 {self.TASK_LABELS[dependency]} 完成...")
+                    await self._task_idle[dependency].wait()
 
-            print(f"[推送下载] 完成\n")
+            if resource:
+                await self._resource_locks[resource].acquire()
 
-        except Exception as e:
-            print(f"[推送下载] 失败: {e}\n")
-
-    async def task_check_complete(self):
-        """任务4: 检测下载完成"""
         try:
             print(f"\n{'='*60}")
-            print(f"[检测完成] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"[{label}] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print(f"{'='*60}")
 
-            # 启用通知
-            await asyncio.to_thread(self.downloader.check_downloading_status, enable_notification=True)
+            try:
+                await body()
+            except Exception as e:
+                print(f"[{label}] 失败: {e}")
+                Metrics.error(f"{type(e).__name__}: {e}")
+                return self.RUN_FAILED
 
-            print(f"[检测完成] 完成\n")
+            print(f"[{label}] 完成")
+            return self.RUN_COMPLETED
+        finally:
+            if resource:
+                self._resource_locks[resource].release()
 
-        except Exception as e:
-            print(f"[检测完成] 失败: {e}\n")
+    async def task_rss_scrape(self) -> str:
+        """任务1: RSS刮削 + 更新series"""
+        async def body():
+            # 在异步环境中同步调用
+            await asyncio.to_thread(self.subscription_tracker.process_subscriptions)
 
-    async def task_check_failed(self):
-        """任务5: 检测下载失败（超过1天的downloading）"""
-        try:
-            print(f"\n{'='*60}")
-            print(f"[检测失败] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"{'='*60}")
+        return await self._run_task('rss_scrape', body)
 
-            # 获取所有 downloading 状态的剧集
-            downloading_episodes = self.db.get_episodes_by_status('downloading')
+    async def task_scrape_episodes(self) -> str:
+        """任务2: 刮削剧集信息 + 更新episodes"""
+        async def body():
+            await asyncio.to_thread(self.episode_scraper.scrape_all_series)
+
+        return await self._run_task('scrape_episodes', body)
 
-            if not downloading_episodes:
-                print("没有 downloading 状态的剧集")
-                print(f"[检测失败] 完成\n")
-                return
+    async def task_push_download(self) -> str:
+        """任务3: 推送离线下载"""
+        async def body():
+            # 按批提交，每次最多推送 OPENLIST_PUSH_LIMIT 个
+            await asyncio.to_thread(self.downloader.push_missing_episodes, limit=Config.OPENLIST_PUSH_LIMIT)
 
-            # 重新扫描 OpenList
-            print("重新扫描 OpenList...")
-            await asyncio.to_thread(self.openlist_scanner.scan_and_update)
+        return await self._run_task('push_download', body)
 
-            # 获取 OpenList 索引
-            openlist_index = self.db.get_openlist_index()
-            series_map = self.db.get_series_map()
+    async def task_check_complete(self) -> str:
+        """任务4: 检测下载完成"""
+        async def body():
+            # 启用通知
+            await asyncio.to_thread(self.downloader.check_downloading_status, enable_notification=True)
 
-            # 检查超过1天的 downloading 剧集
-            now = datetime.now()
-            failed_count = 0
+        return await self._run_task('check_complete', body)
 
-            for episode in downloading_episodes:
-                updated_at = episode.get('updated_at')
-                if not updated_at:
-                    continue
+    async def task_check_failed(self) -> str:
+        """任务5: 检测下载失败（推送后超过 DOWNLOAD_TIMEOUT_HOURS 仍未完成的 downloading）"""
+        async def body():
+            # 已在 OpenList 中的标记完成，其余记为一次失败：退避后重新推送，达到最大次数标记为 failed
+            _, retrying, failed = await asyncio.to_thread(self.downloader.check_stale_downloads)
 
-                # 解析更新时间
-                try:
-                    updated_time = datetime.strptime(updated_at, '%Y-%m-%d %H:%M:%S')
-                except:
-                    continue
-
-                # 判断是否超过1天
-                if now - updated_time < timedelta(days=1):
-                    continue
-
-                # 检查是否在 OpenList 中
-                key = (episode['tmdb_id'], episode['episode_number'])
-                if key in openlist_index:
-                    # 已下载完成，更新状态
-                    self.db.update_episode_status(episode['id'], 'openlist_exists')
-                    series = series_map.get(episode['tmdb_id'])
-                    series_name = series['series_name'] if series else 'Unknown'
-                    print(f"✓ {series_name} EP{episode['episode_number']:02d} - 下载完成")
-                else:
-                    # 下载失败，回退为 pending
-                    self.db.update_episode_status(episode['id'], 'pending')
-                    failed_count += 1
-                    series = series_map.get(episode['tmdb_id'])
-                    series_name = series['series_name'] if series else 'Unknown'
-                    print(f"✗ {series_name} EP{episode['episode_number']:02d} - 超时回退为 pending")
-
-            print(f"\n回退 {failed_count} 个超时剧集")
-            print(f"[检测失败] 完成\n")
+            print(f"\n超时 {len(retrying) + len(failed)} 个剧集（等待重试 {len(retrying)} 个，放弃 {len(failed)} 个）")
 
-        except Exception as e:
-            print(f"[检测失败] 失败: {e}\n")
+        return await self._run_task('check_failed', body)
 
     def start(self):
         """启动调度器"""
@@ -206,19 +270,22 @@ class AsyncScheduler:
             replace_existing=True
         )
 
+        # 报告因上一次仍在运行或错过执行时间而跳过的运行
+        self.scheduler.add_listener(self._on_job_skipped, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
+
         # 启动调度器
         self.scheduler.start()
         print("\n✓ 调度器已启动\n")
 
-    async def trigger_task(self, task_name: str) -> bool:
+    async def trigger_task(self, task_name: str) -> Optional[str]:
         """
-        手动触发任务
+        手动触发任务（与定时运行共用任务锁，任务已在运行时跳过）
 
         Args:
             task_name: 任务名称 (rss_scrape/push_download/check_complete/check_failed/scrape_episodes)
 
         Returns:
-            是否成功触发
+            运行结果 RUN_COMPLETED / RUN_FAILED / RUN_SKIPPED，未知任务返回 None
         """
         task_map = {
             'rss_scrape': self.task_rss_scrape,
@@ -230,11 +297,10 @@ class AsyncScheduler:
 
         task = task_map.get(task_name)
         if not task:
-            return False
+            return None
 
         # 立即执行任务
-        await task()
-        return True
+        return await task()
 
     def update_task_interval(self, task_name: str, interval: int) -> bool:
         """
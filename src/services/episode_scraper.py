@@ -1,32 +1,69 @@
 """
 剧集刮削服务
 """
-import feedparser
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from src.models.database import Database
-from src.utils.subtitle_helper import SubtitleHelper
+from src.services.feed_cache import FeedCache
+from src.utils.config import Config
+from src.utils.rate_limiter import HostRateLimiter
+from src.utils.metrics import Metrics
+from src.parsers.title_parser import TitleParser
 
 
 class EpisodeScraper:
     """剧集刮削器"""
 
     def __init__(self):
-        self.db = Database()
-        self.subtitle_helper = SubtitleHelper()
+        self.db = Database.get_instance()
+        self.title_parser = TitleParser()
+        self.feed_cache = FeedCache(self.db)
+        # 蜜柑按主机限速，并发拉取时避免请求过密
+        self.rate_limiter = HostRateLimiter(Config.MIKAN_REQUEST_INTERVAL)
 
-    def scrape_all_series(self):
-        """刮削所有活跃 series 的 episodes"""
+    def scrape_all_series(self, max_workers: int = None):
+        """
+        刮削所有活跃 series 的 episodes
+
+        工作线程并发拉取 RSS（按主机限速，只访问网络），
+        当前线程作为唯一写入者按完成顺序处理结果，每个番剧提交一次事务
+
+        Args:
+            max_workers: 并发拉取数，默认 Config.EPISODE_SCRAPE_CONCURRENCY
+        """
         print("\n开始刮削所有番剧的剧集...")
 
         series_list = self.db.get_all_series(status='active')
         print(f"找到 {len(series_list)} 个活跃番剧")
 
-        for series in series_list:
-            try:
-                self.scrape_series_episodes(series)
-            except Exception as e:
-                print(f"刮削 {series['series_name']} 失败: {e}")
+        pending = [series for series in series_list if self._prepare_series(series)]
+        print(f"需要拉取 {len(pending)} 个番剧的 RSS")
+
+        # 校验信息在当前线程读取，工作线程不访问数据库；
+        # 还没有剧集记录的番剧不发条件请求，避免 304 / 相同哈希导致永远不写入剧集
+        with_episodes = self.db.get_series_ids_with_episodes([series['tmdb_id'] for series in pending])
+        cached = {series['raw_rss_url']: (self.db.get_feed_cache(series['raw_rss_url'])
+                                          if series['tmdb_id'] in with_episodes else None)
+                  for series in pending}
+
+        max_workers = max_workers or Config.EPISODE_SCRAPE_CONCURRENCY
+        fetch_rss = Metrics.bind(self._fetch_rss)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(fetch_rss, series['raw_rss_url'], cached[series['raw_rss_url']]): series
+                for series in pending
+            }
+
+            for future in as_completed(futures):
+                series = futures[future]
+                print(f"\n处理: {series['series_name']}")
+                try:
+                    items, validators = future.result()
+                    self._process_feed(series, items, validators)
+                except Exception as e:
+                    print(f"刮削 {series['series_name']} 失败: {e}")
+                    Metrics.error(f"{series['series_name']}: {e}")
 
         print("\n刮削完成")
 
@@ -36,57 +73,82 @@ class EpisodeScraper:
 
         流程：
         1. 检查 7 天规则
-        2. 拉取 RSS
+        2. 拉取 RSS（条件请求，未变化则只更新刮削时间）
         3. 检测字幕偏好（如果未设置）
         4. 存储所有 episodes
         """
-        series_name = series['series_name']
-        tmdb_id = series['tmdb_id']
+        print(f"\n处理: {series['series_name']}")
+
+        if not self._prepare_series(series):
+            return
 
-        print(f"\n处理: {series_name}")
+        rss_url = series['raw_rss_url']
+        items, validators = self._fetch_rss(rss_url, self.db.get_feed_cache(rss_url))
+        self._process_feed(series, items, validators)
 
+    def _prepare_series(self, series: Dict) -> bool:
+        """检查番剧是否需要拉取 RSS"""
         # 检查是否需要刮削
         if not self._should_scrape(series):
-            print(f"  跳过（7天内已刮削）")
-            return
+            print(f"  {series['series_name']}: 跳过（7天内已刮削）")
+            return False
 
         # 检查是否有 RSS URL
         if not series.get('raw_rss_url'):
-            print(f"  跳过（无 RSS URL）")
-            return
+            print(f"  {series['series_name']}: 跳过（无 RSS URL）")
+            return False
 
-        # 拉取 RSS
-        print(f"  拉取 RSS: {series['raw_rss_url']}")
-        items = self._fetch_rss(series['raw_rss_url'])
+        return True
 
-        if not items:
-            print(f"  未找到剧集")
-            return
+    def _process_feed(self, series: Dict, items: Optional[List[Dict]], validators: Optional[Dict]):
+        """
+        处理拉取结果并写入数据库（单个事务）
 
-        print(f"  找到 {len(items)} 个剧集")
+        Args:
+            series: 番剧信息
+            items: 剧集条目列表，None 表示 RSS 未变化
+            validators: RSS 校验信息，存储成功后记录
+        """
+        tmdb_id = series['tmdb_id']
+        rss_url = series['raw_rss_url']
 
-        # 检测字幕偏好
-        if not series.get('subtitle_lang'):
-            print(f"  检测字幕偏好...")
-            subtitle_lang, fansub_group = self._detect_subtitle_preference(items)
+        with Metrics.stage('store'), self.db.get_connection():
+            if items is None:
+                print(f"  RSS 未变化")
+                self.feed_cache.save(rss_url, validators)
+                self.db.update_series_last_scraped(tmdb_id)
+                return
 
-            if subtitle_lang:
-                print(f"  字幕偏好: {subtitle_lang}, 字幕组: {fansub_group}")
-                self.db.update_series_subtitle_lang(tmdb_id, subtitle_lang, fansub_group)
-                series['subtitle_lang'] = subtitle_lang
-                series['fansub_group'] = fansub_group
-            else:
-                print(f"  ⚠️  无法检测字幕偏好，跳过")
+            if not items:
+                print(f"  未找到剧集")
                 return
 
-        # 存储 episodes
-        self._store_episodes(series, items)
+            print(f"  找到 {len(items)} 个剧集")
 
-        # 检查是否需要失活
-        self.db.check_and_deactivate_series(tmdb_id)
+            # 检测字幕偏好
+            if not series.get('subtitle_lang'):
+                print(f"  检测字幕偏好...")
+                subtitle_lang, fansub_group = self._detect_subtitle_preference(items)
+
+                if subtitle_lang:
+                    print(f"  字幕偏好: {subtitle_lang}, 字幕组: {fansub_group}")
+                    self.db.update_series_subtitle_lang(tmdb_id, subtitle_lang, fansub_group)
+                    series['subtitle_lang'] = subtitle_lang
+                    series['fansub_group'] = fansub_group
+                else:
+                    print(f"  ⚠️  无法检测字幕偏好，跳过")
+                    return
+
+            # 存储 episodes
+            self._store_episodes(series, items)
+
+            # 检查是否需要失活
+            self.db.check_and_deactivate_series(tmdb_id)
+
+            # 更新刮削时间，存储成功后再记录 RSS 校验信息
+            self.db.update_series_last_scraped(tmdb_id)
+            self.feed_cache.save(rss_url, validators)
 
-        # 更新刮削时间
-        self.db.update_series_last_scraped(tmdb_id)
         print(f"  ✓ 完成")
 
     def _should_scrape(self, series: Dict) -> bool:
@@ -106,14 +168,34 @@ class EpisodeScraper:
         except Exception:
             return True
 
-    def _fetch_rss(self, rss_url: str) -> List[Dict]:
-        """拉取 RSS feed"""
+    def _fetch_rss(self, rss_url: str, cached: Optional[Dict]) -> Tuple[Optional[List[Dict]], Optional[Dict]]:
+        """
+        拉取 RSS feed（条件请求，只访问网络，可在工作线程中调用）
+
+        Args:
+            rss_url: RSS URL
+            cached: 上次的校验信息，None 时发送无条件请求（番剧还没有剧集记录时由调用方传 None）
+
+        Returns:
+            (剧集条目列表, 校验信息)；feed 未变化时条目列表为 None
+        """
+        with Metrics.stage('rate_limit_wait'):
+            self.rate_limiter.wait(rss_url)
+        with Metrics.stage('fetch_rss'):
+            result = self.feed_cache.request(rss_url, cached)
+
+        if result['status'] == FeedCache.UNCHANGED:
+            return None, result['validators']
+
+        if result['status'] == FeedCache.ERROR:
+            return [], None
+
         try:
-            feed = feedparser.parse(rss_url)
+            feed = result['feed']
 
             if feed.bozo:
                 print(f"  RSS 解析错误: {feed.bozo_exception}")
-                return []
+                return [], None
 
             items = []
             for entry in feed.entries:
@@ -136,11 +218,11 @@ class EpisodeScraper:
 
                 items.append(item)
 
-            return items
+            return items, result['validators']
 
         except Exception as e:
             print(f"  RSS 拉取失败: {e}")
-            return []
+            return [], None
 
     def _detect_subtitle_preference(self, items: List[Dict]) -> tuple:
         """
@@ -157,8 +239,9 @@ class EpisodeScraper:
         fansub_groups = set()
 
         for item in items:
-            lang = self.subtitle_helper.detect_subtitle_lang(item['title'])
-            group = self.subtitle_helper.extract_fansub_group(item['title'])
+            parsed = self.title_parser.parse(item['title'])
+            lang = parsed.subtitle_lang
+            group = parsed.group
 
             if lang:
                 subtitle_stats[lang] = subtitle_stats.get(lang, 0) + 1
@@ -185,20 +268,24 @@ class EpisodeScraper:
         return None, None
 
     def _store_episodes(self, series: Dict, items: List[Dict]):
-        """存储剧集到数据库"""
+        """存储剧集到数据库（批量插入或更新）"""
         tmdb_id = series['tmdb_id']
         preferred_lang = series['subtitle_lang']
 
-        stored_count = 0
+        episodes = []
         skipped_count = 0
 
+        # 已下载的集不再记录其他字幕版本（prune_superseded_mismatched 删除后不会被重新写入）
+        downloaded = self.db.get_episode_numbers(tmdb_id, 'openlist_exists')
+
         for item in items:
             # 提取信息
-            episode_number = self.subtitle_helper.extract_episode_number(item['title'])
+            parsed = self.title_parser.parse(item['title'])
+            episode_number = parsed.episode
             if not episode_number:
                 continue
 
-            subtitle_lang = self.subtitle_helper.detect_subtitle_lang(item['title'])
+            subtitle_lang = parsed.subtitle_lang
             torrent_link = item.get('torrent_link')
 
             if not torrent_link:
@@ -213,21 +300,22 @@ class EpisodeScraper:
                 status = 'mismatched'
                 skipped_count += 1
 
-            # 存储
-            try:
-                self.db.insert_episode(
-                    tmdb_id=tmdb_id,
-                    episode_number=episode_number,
-                    title=item['title'],
-                    torrent_link=torrent_link,
-                    episode_link=item.get('link'),
-                    file_size=item.get('file_size'),
-                    pub_date=item.get('pub_date'),
-                    subtitle_lang=subtitle_lang,
-                    status=status
-                )
-                stored_count += 1
-            except Exception as e:
-                print(f"    存储失败: {e}")
-
-        print(f"  存储 {stored_count} 个剧集，跳过 {skipped_count} 个")
+            if status == 'mismatched' and episode_number in downloaded:
+                continue
+
+            episodes.append({
+                'episode_number': episode_number,
+                'title': item['title'],
+                'torrent_link': torrent_link,
+                'episode_link': item.get('link'),
+                'file_size': item.get('file_size'),
+                'pub_date': item.get('pub_date'),
+                'subtitle_lang': subtitle_lang,
+                'status': status,
+            })
+
+        # 存储
+        written = self.db.upsert_episodes(tmdb_id, episodes)
+        Metrics.incr('items', written)
+
+        print(f"  存储 {len(episodes)} 个剧集（写入 {written} 行），跳过 {skipped_count} 个")
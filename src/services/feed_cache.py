@@ -0,0 +1,101 @@
+"""
+RSS 条件请求缓存
+使用 ETag / Last-Modified 发送条件请求，并用内容哈希识别未变化的 feed
+"""
+import hashlib
+import feedparser
+from typing import Dict, Optional
+from src.models.database import Database
+from src.utils.http_client import HttpClient
+
+
+class FeedCache:
+    """RSS feed 缓存"""
+
+    # fetch 返回的状态
+    CHANGED = 'changed'
+    UNCHANGED = 'unchanged'
+    ERROR = 'error'
+
+    def __init__(self, db: Database = None):
+        self.db = db or Database.get_instance()
+        self.session = HttpClient.get_session()
+
+    def fetch(self, url: str, force: bool = False) -> Dict:
+        """
+        条件拉取 RSS feed
+
+        返回 304 或内容哈希与上次处理时相同则视为未变化；
+        变化时返回解析后的 feed 和新的校验信息，调用方处理成功后再调用 save 持久化，
+        处理失败时下次仍会重新拉取
+
+        Args:
+            url: RSS URL
+            force: 是否忽略缓存强制拉取
+
+        Returns:
+            Dict: {status, feed, validators}
+        """
+        cached = None if force else self.db.get_feed_cache(url)
+        result = self.request(url, cached)
+
+        if result['status'] == self.UNCHANGED:
+            # 内容未变，只刷新校验信息
+            self.save(url, result['validators'])
+
+        return result
+
+    def request(self, url: str, cached: Optional[Dict]) -> Dict:
+        """
+        按已有校验信息发送条件请求（只访问网络，不读写数据库，可在工作线程中调用）
+
+        Args:
+            url: RSS URL
+            cached: 上次的校验信息 {etag, last_modified, content_hash}
+
+        Returns:
+            Dict: {status, feed, validators}；内容哈希未变时 validators 为新的校验信息
+        """
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=30)
+
+            if response.status_code == 304:
+                return {'status': self.UNCHANGED, 'feed': None, 'validators': None}
+
+            response.raise_for_status()
+
+        except Exception as e:
+            print(f"RSS 请求失败 {url}: {e}")
+            return {'status': self.ERROR, 'feed': None, 'validators': None}
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': content_hash,
+        }
+
+        if cached and cached.get('content_hash') == content_hash:
+            return {'status': self.UNCHANGED, 'feed': None, 'validators': validators}
+
+        feed = feedparser.parse(response.content)
+        return {'status': self.CHANGED, 'feed': feed, 'validators': validators}
+
+    def save(self, url: str, validators: Optional[Dict]):
+        """持久化校验信息"""
+        if not validators:
+            return
+
+        self.db.save_feed_cache(
+            url,
+            etag=validators.get('etag'),
+            last_modified=validators.get('last_modified'),
+            content_hash=validators.get('content_hash')
+        )
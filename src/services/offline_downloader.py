@@ -1,116 +1,106 @@
 """
 离线下载服务 - 推送缺失剧集到 OpenList 离线下载
 """
-from typing import List, Dict
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
 from src.models.database import Database
 from src.services.openlist_client import OpenListClient
+from src.utils.config import Config
+from src.utils.metrics import Metrics
 
 
 class OfflineDownloader:
     """离线下载器"""
 
+    # OpenList 离线下载任务的结束状态（不会再重试）
+    TASK_STATE_CANCELED = 4
+    TASK_STATE_FAILED = 7
+
     def __init__(self):
-        self.db = Database()
+        self.db = Database.get_instance()
         self.client = OpenListClient()
-
-    def sync_openlist_status(self):
-        """
-        同步 OpenList 状态
-        检测 episodes 表中的剧集是否已在 OpenList 中存在
-        如果存在则更新状态为 'openlist_exists'
-        """
-        print("=== 同步 OpenList 状态 ===\n")
-
-        # 获取所有 pending 状态的剧集
-        pending_episodes = self.db.get_episodes_by_status('pending')
-        print(f"找到 {len(pending_episodes)} 个 pending 剧集")
-
-        # 获取 OpenList 索引
-        openlist_index = self.db.get_openlist_index()
-        print(f"OpenList 中有 {len(openlist_index)} 个文件\n")
-
-        # 获取番剧映射
-        series_map = self.db.get_series_map()
-
-        # 检测并更新状态
-        updated_count = 0
-        for episode in pending_episodes:
-            key = (episode['tmdb_id'], episode['episode_number'])
-
-            if key in openlist_index:
-                # 文件已存在，更新状态
-                self.db.update_episode_status(episode['id'], 'openlist_exists')
-                updated_count += 1
-
-                series = series_map.get(episode['tmdb_id'])
-                series_name = series['series_name'] if series else 'Unknown'
-                print(f"✓ {series_name} EP{episode['episode_number']:02d} - 已存在于 OpenList")
-
-        print(f"\n更新了 {updated_count} 个剧集状态")
-        return updated_count
+        # 下载队列租约的 worker 标识
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        # 上次整树扫描 OpenList 的时间
+        self._last_tree_scan: Optional[datetime] = None
 
     def check_downloading_status(self, enable_notification: bool = False):
         """
-        检查 downloading 状态的剧集
+        检查到期的 downloading 剧集
         如果已在 OpenList 中，则更新为 openlist_exists
-        如果不在 OpenList 中，则回退为 pending（下载失败）
+        如果不在 OpenList 中，推送未超过 DOWNLOAD_TIMEOUT_HOURS 的继续等待，
+        超时的记为一次失败（退避后重新推送，达到最大次数标记为 failed）
+
+        只处理 next_run_at 已到期的剧集（推送后等待 DOWNLOAD_CHECK_DELAY_MINUTES），
+        只列出这些剧集的目标目录；启用 OPENLIST_TASK_POLL 时先读取离线下载任务状态，
+        任务已失败的立即记为失败，仍在下载的不再列目录
 
         Args:
             enable_notification: 是否发送 Telegram 通知
         """
         print("=== 检查 Downloading 状态 ===\n")
 
-        # 获取 downloading 状态的剧集
-        downloading_episodes = self.db.get_episodes_by_status('downloading')
-        print(f"找到 {len(downloading_episodes)} 个 downloading 剧集")
+        # 统计到期的 downloading 剧集
+        due_count = self.db.count_due_episodes('downloading')
+        print(f"找到 {due_count} 个到期的 downloading 剧集")
 
-        if not downloading_episodes:
-            print("没有 downloading 状态的剧集")
+        if not due_count:
+            print("没有需要检查的剧集")
             return
 
-        # 重新扫描 OpenList
-        print("重新扫描 OpenList...")
-        from src.services.openlist_scanner import OpenListScanner
-        scanner = OpenListScanner()
-        scanner.scan_and_update()
-
-        # 获取更新后的 OpenList 索引
-        openlist_index = self.db.get_openlist_index()
-        print(f"OpenList 中有 {len(openlist_index)} 个文件\n")
-
-        # 获取番剧映射
-        series_map = self.db.get_series_map()
+        claimed = self.db.claim_due_episodes('downloading', self.worker_id)
+        claimed_ids = [e['id'] for e in claimed]
+        try:
+            with Metrics.stage('poll_tasks'):
+                task_failures, in_progress = self._poll_offline_tasks(claimed)
+            retrying, failed = self._record_failures(task_failures, 'downloading')
+
+            failed_ids = {e['id'] for e in retrying + failed}
+            to_check = [e for e in claimed if e['id'] not in failed_ids and e['id'] not in in_progress]
+            if to_check:
+                self._refresh_openlist(to_check)
+                print(f"OpenList 中有 {self.db.count_openlist_files()} 个文件\n")
+
+            # 在数据库内对账：已出现的标记完成，超时的记为失败
+            with Metrics.stage('reconcile'):
+                completed, _ = self.db.reconcile_with_openlist('downloading', episode_ids=claimed_ids)
+                stale_retrying, stale_failed = self._fail_stale_downloads(claimed_ids)
+            retrying += stale_retrying
+            failed += stale_failed
+        finally:
+            # 仍在下载中的剧集稍后再检查
+            self.db.release_episodes(claimed_ids, self.worker_id,
+                                     delay_minutes=Config.DOWNLOAD_CHECK_DELAY_MINUTES)
 
-        # 检查每个 downloading 剧集
-        completed_count = 0
-        failed_count = 0
         completed_items = []
-
-        for episode in downloading_episodes:
-            key = (episode['tmdb_id'], episode['episode_number'])
-            series = series_map.get(episode['tmdb_id'])
-            series_name = series['series_name'] if series else 'Unknown'
-
-            if key in openlist_index:
-                # 下载完成，更新状态
-                self.db.update_episode_status(episode['id'], 'openlist_exists')
-                completed_count += 1
-                print(f"✓ {series_name} EP{episode['episode_number']:02d} - 下载完成")
-
-                # 记录完成项
-                completed_items.append({
-                    'series_name': series_name,
-                    'episode_number': episode['episode_number']
-                })
-            else:
-                # 仍未出现在 OpenList，回退为 pending
-                self.db.update_episode_status(episode['id'], 'pending')
-                failed_count += 1
-                print(f"✗ {series_name} EP{episode['episode_number']:02d} - 下载失败，回退为 pending")
+        for episode in completed:
+            series_name = episode['series_name'] or 'Unknown'
+            print(f"✓ {series_name} EP{episode['episode_number']:02d} - 下载完成")
+
+            # 记录完成项
+            completed_items.append({
+                'series_name': series_name,
+                'episode_number': episode['episode_number']
+            })
+
+        completed_count = len(completed)
+        failed_count = len(retrying) + len(failed)
+        Metrics.incr('items', completed_count)
+        Metrics.incr('download_failures', failed_count)
+
+        # 已下载的集不再需要其他字幕版本的 mismatched 记录
+        if completed:
+            pruned = self.db.prune_superseded_mismatched()
+            if pruned:
+                print(f"清理已下载剧集的不匹配记录: {pruned} 个")
 
         print(f"\n=== 检查完成 ===")
         print(f"下载完成: {completed_count} 个")
-        print(f"下载失败: {failed_count} 个")
+        print(f"下载失败: {failed_count} 个（等待重试 {len(retrying)} 个，放弃 {len(failed)} 个）")
+        print(f"仍在下载: {len(claimed) - completed_count - failed_count} 个")
 
         # 发送 Telegram 通知
         if enable_notification and completed_items:
@@ -124,74 +114,263 @@ class OfflineDownloader:
 
         return completed_count, failed_count
 
-    def get_missing_episodes(self) -> List[Dict]:
+    def check_stale_downloads(self) -> tuple:
         """
-        获取需要下载的剧集
-        返回 status='pending' 且不在 OpenList 中的剧集
+        检查所有超时的 downloading 剧集（不论是否到期）
+        已在 OpenList 中的标记完成，其余记为一次失败
+
+        Returns:
+            (完成的剧集, 等待重试的剧集, 标记为 failed 的剧集)
         """
-        # 先同步状态
-        self.sync_openlist_status()
+        stale = self.db.get_stale_episodes('downloading', self._stale_cutoff())
+        print(f"找到 {len(stale)} 个超过 {Config.DOWNLOAD_TIMEOUT_HOURS:g} 小时的 downloading 剧集")
 
-        # 获取 pending 状态的剧集
-        pending_episodes = self.db.get_episodes_by_status('pending')
+        if not stale:
+            return [], [], []
 
-        # 获取番剧映射并丰富信息
-        series_map = self.db.get_series_map()
+        self._refresh_openlist(stale)
 
-        missing = []
-        for episode in pending_episodes:
-            series = series_map.get(episode['tmdb_id'])
-            if series:
-                missing.append({
-                    **episode,
-                    'series_name': series['series_name']
-                })
+        stale_ids = [e['id'] for e in stale]
+        with Metrics.stage('reconcile'):
+            completed, _ = self.db.reconcile_with_openlist('downloading', episode_ids=stale_ids)
+        Metrics.incr('items', len(completed))
 
-        return missing
+        for episode in completed:
+            series_name = episode['series_name'] or 'Unknown'
+            print(f"✓ {series_name} EP{episode['episode_number']:02d} - 下载完成")
 
-    def add_offline_download(self, torrent_url: str, download_path: str = None, tool: str = None) -> bool:
+        retrying, failed = self._fail_stale_downloads(stale_ids)
+        return completed, retrying, failed
+
+    def _refresh_openlist(self, episodes: List[Dict]):
         """
-        添加离线下载任务
+        刷新 OpenList 文件索引
+
+        距上次整树扫描超过 OPENLIST_TREE_SCAN_INTERVAL_HOURS 时做一次整树增量扫描，
+        否则只定向扫描这些剧集的下载目录和同一番剧已有文件所在的目录
+        """
+        from src.services.openlist_scanner import OpenListScanner
+        scanner = OpenListScanner()
+
+        now = datetime.now()
+        if self._last_tree_scan is None or \
+                now - self._last_tree_scan >= timedelta(hours=Config.OPENLIST_TREE_SCAN_INTERVAL_HOURS):
+            print("整树扫描 OpenList...")
+            Metrics.incr('tree_scans')
+            with Metrics.stage('refresh_openlist'):
+                if scanner.scan_and_update():
+                    self._last_tree_scan = now
+            return
+
+        dirs = {self._download_target(episode)[0] for episode in episodes}
+        dirs.update(self.db.get_openlist_dirs_for_series(list({e['tmdb_id'] for e in episodes})))
+        Metrics.incr('targeted_scans')
+        with Metrics.stage('refresh_openlist'):
+            scanner.scan_targets(sorted(dirs))
+
+    def _poll_offline_tasks(self, episodes: List[Dict]) -> tuple:
+        """
+        按提交的链接匹配 OpenList 离线下载任务（需启用 OPENLIST_TASK_POLL）
+
+        Returns:
+            ([(任务已失败的剧集, 错误信息)], 任务仍未结束的剧集 ID 集合)；
+            未启用或读取失败时返回空结果，全部剧集按目录检查
+        """
+        if not Config.OPENLIST_TASK_POLL or not episodes:
+            return [], set()
+
+        undone = self.client.list_offline_tasks()
+        done = self.client.list_offline_tasks(done=True)
+        if undone is None or done is None:
+            return [], set()
+
+        # 推送时提交的是缓存的 magnet 链接（未转换的为原始链接）
+        magnets = self.db.get_torrent_magnets([e['torrent_link'] for e in episodes])
+
+        failures, in_progress = [], set()
+        for episode in episodes:
+            url = magnets.get(episode['torrent_link'], episode['torrent_link'])
+
+            if any(url in (task.get('name') or '') for task in undone):
+                in_progress.add(episode['id'])
+                continue
+
+            # 同一链接可能推送过多次，以最后一个任务为准
+            matched = [task for task in done if url in (task.get('name') or '')]
+            if matched and matched[-1].get('state') in (self.TASK_STATE_CANCELED, self.TASK_STATE_FAILED):
+                error = matched[-1].get('error') or matched[-1].get('status') or 'Unknown error'
+                failures.append((episode, f"离线下载任务失败: {error}"))
+
+        print(f"离线下载任务: 进行中 {len(in_progress)} 个，失败 {len(failures)} 个")
+        return failures, in_progress
+
+    @staticmethod
+    def _stale_cutoff() -> str:
+        """推送时间早于该时间仍未完成的剧集视为超时"""
+        return (datetime.now() - timedelta(hours=Config.DOWNLOAD_TIMEOUT_HOURS)).isoformat()
+
+    def _fail_stale_downloads(self, episode_ids: List[int]) -> tuple:
+        """将指定剧集中推送已超时的 downloading 剧集记为失败"""
+        stale = self.db.get_stale_episodes('downloading', self._stale_cutoff(), episode_ids=episode_ids)
+        error = f"超过 {Config.DOWNLOAD_TIMEOUT_HOURS:g} 小时未出现在 OpenList"
+        return self._record_failures([(e, error) for e in stale], 'downloading')
+
+    def _record_failures(self, failures: List[tuple], from_status: str) -> tuple:
+        """
+        记录失败并输出重试计划
+
+        Args:
+            failures: [(剧集, 错误信息), ...]
+            from_status: 失败时的状态
+
+        Returns:
+            (等待重试的剧集, 标记为 failed 的剧集)
+        """
+        retrying, failed = self.db.record_episode_failures(
+            [(episode['id'], error) for episode, error in failures], from_status
+        )
+
+        for episode in retrying:
+            series_name = episode['series_name'] or 'Unknown'
+            next_run_at = datetime.fromisoformat(episode['next_run_at'])
+            print(f"✗ {series_name} EP{episode['episode_number']:02d} - {episode['last_error']}，"
+                  f"第 {episode['attempts']} 次失败，{next_run_at:%m-%d %H:%M} 后重新推送")
+
+        for episode in failed:
+            series_name = episode['series_name'] or 'Unknown'
+            print(f"✗ {series_name} EP{episode['episode_number']:02d} - {episode['last_error']}，"
+                  f"已失败 {episode['attempts']} 次，标记为 failed")
+
+        return retrying, failed
+
+    def claim_missing_episodes(self, limit: int = None) -> List[Dict]:
+        """
+        领取需要下载的剧集
+        领取活跃番剧中到期的 pending 剧集（加租约），已在 OpenList 中的直接标记完成，
+        返回其余剧集；调用方推送后迁移状态，未处理的需调用 release_episodes 释放
+
+        Args:
+            limit: 限制领取数量
+        """
+        claimed = self.db.claim_due_episodes('pending', self.worker_id, limit=limit, active_only=True)
+        if not claimed:
+            return []
+
+        # 只对领取到的剧集对账，不再扫描全部 pending
+        existing, _ = self.db.reconcile_with_openlist('pending', episode_ids=[e['id'] for e in claimed])
+
+        for episode in existing:
+            series_name = episode['series_name'] or 'Unknown'
+            print(f"✓ {series_name} EP{episode['episode_number']:02d} - 已存在于 OpenList")
+
+        existing_ids = {e['id'] for e in existing}
+        return [e for e in claimed if e['id'] not in existing_ids]
+
+    @staticmethod
+    def _needs_resolution(torrent_url: str) -> bool:
+        """蜜柑的种子链接需要下载种子转换为 magnet"""
+        return 'mikanani.me' in torrent_url and torrent_url.endswith('.torrent')
+
+    def resolve_download_urls(self, torrent_urls: List[str]) -> Dict[str, str]:
+        """
+        批量解析实际提交的下载链接
+
+        蜜柑的种子链接先查 torrent_cache，未缓存的并发下载种子并计算 info hash，
+        结果写入缓存，重试和重新推送时不再产生网络请求；失败时使用原始链接
+
+        Args:
+            torrent_urls: 种子 URL 或磁力链接列表
+
+        Returns:
+            Dict: {原始链接: 提交给离线下载的链接}
+        """
+        from src.utils.torrent_helper import TorrentHelper
+
+        resolved = {url: url for url in torrent_urls}
+
+        to_resolve = list(dict.fromkeys(url for url in torrent_urls if self._needs_resolution(url)))
+        if not to_resolve:
+            return resolved
+
+        cached = self.db.get_torrent_magnets(to_resolve)
+        resolved.update(cached)
+
+        uncached = [url for url in to_resolve if url not in cached]
+        if not uncached:
+            return resolved
+
+        print(f"  下载 {len(uncached)} 个种子文件（已缓存 {len(cached)} 个）...")
+
+        def fetch(url: str) -> Optional[Dict]:
+            content = TorrentHelper.download_torrent_content(url)
+            return TorrentHelper.parse_torrent(content) if content else None
+
+        entries = []
+        with ThreadPoolExecutor(max_workers=Config.TORRENT_RESOLVE_CONCURRENCY) as executor:
+            for url, parsed in zip(uncached, executor.map(Metrics.bind(fetch), uncached)):
+                if parsed:
+                    resolved[url] = parsed['magnet']
+                    entries.append({'torrent_url': url, **parsed})
+                else:
+                    print(f"  ⚠️  无法转换为 magnet，使用原始链接: {url}")
+
+        self.db.save_torrent_magnets(entries)
+        print(f"  ✓ 转换 {len(entries)}/{len(uncached)} 个 magnet 链接")
+
+        return resolved
+
+    def resolve_download_url(self, torrent_url: str) -> str:
+        """
+        解析实际提交的下载链接（单个）
 
         Args:
             torrent_url: 种子 URL 或磁力链接
+
+        Returns:
+            str: 提交给离线下载的链接
+        """
+        return self.resolve_download_urls([torrent_url])[torrent_url]
+
+    def add_offline_downloads(self, urls: List[str], download_path: str = None, tool: str = None) -> bool:
+        """
+        批量添加离线下载任务（一个请求提交多个链接）
+
+        Args:
+            urls: 下载链接列表（已解析的 magnet 或种子 URL）
             download_path: 下载路径（可选）
             tool: 下载工具（aria2/qbittorrent/transmission，可选）
 
         Returns:
             bool: 是否成功
         """
-        if not self.client.token:
-            if not self.client.login():
-                print("✗ 登录失败")
-                return False
+        try:
+            return self._submit_offline_downloads(urls, download_path, tool) is None
+        except Exception as e:
+            print(f"  ✗ 请求失败: {e}")
+            return False
 
-        # 如果是蜜柑的种子链接，先下载种子内容转换为 magnet
-        from src.utils.config import Config
-        from src.utils.torrent_helper import TorrentHelper
+    def _submit_offline_downloads(self, urls: List[str], download_path: str = None,
+                                  tool: str = None) -> Optional[str]:
+        """
+        提交离线下载请求
 
-        final_url = torrent_url
+        网络错误直接抛出（不计入剧集的失败次数），OpenList 拒绝时返回错误信息
 
-        if 'mikanani.me' in torrent_url and torrent_url.endswith('.torrent'):
-            print(f"  下载种子文件...")
-            torrent_content = TorrentHelper.download_torrent_content(torrent_url)
+        Returns:
+            Optional[str]: 成功返回 None，被拒绝返回错误信息
+        """
+        if not urls:
+            return None
 
-            if torrent_content:
-                # 尝试转换为 magnet 链接
-                magnet = TorrentHelper.get_magnet_link(torrent_content)
-                if magnet:
-                    print(f"  ✓ 转换为 magnet 链接")
-                    final_url = magnet
-                else:
-                    print(f"  ⚠️  无法转换为 magnet，使用原始链接")
-            else:
-                print(f"  ⚠️  下载种子失败，使用原始链接")
+        if not self.client.token:
+            if not self.client.login():
+                raise RuntimeError("OpenList 登录失败")
 
         url = f"{self.client.base_url}/api/fs/add_offline_download"
 
         # 根据 API 文档构建请求
         payload = {
-            "urls": [final_url],
+            "urls": urls,
             "path": download_path or Config.OPENLIST_DIR,
         }
 
@@ -200,66 +379,150 @@ class OfflineDownloader:
         if tool_to_use:
             payload["tool"] = tool_to_use
 
-        try:
-            import requests
-            response = requests.post(url, json=payload, headers=self.client._get_headers(), timeout=30)
-            response.raise_for_status()
+        response = self.client.session.post(url, json=payload, headers=self.client._get_headers(), timeout=30)
+        response.raise_for_status()
+
+        data = response.json()
+
+        if data.get('code') == 200:
+            print(f"  ✓ 添加离线下载成功 ({len(urls)} 个)")
+            return None
+
+        error = data.get('message') or 'Unknown error'
+        print(f"  ✗ 添加失败: {error}")
+        return error
 
-            data = response.json()
+    def add_offline_download(self, torrent_url: str, download_path: str = None, tool: str = None) -> bool:
+        """
+        添加离线下载任务
 
-            if data.get('code') == 200:
-                print(f"  ✓ 添加离线下载成功")
-                return True
-            else:
-                print(f"  ✗ 添加失败: {data.get('message', 'Unknown error')}")
+        Args:
+            torrent_url: 种子 URL 或磁力链接
+            download_path: 下载路径（可选）
+            tool: 下载工具（aria2/qbittorrent/transmission，可选）
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self.client.token:
+            if not self.client.login():
+                print("✗ 登录失败")
                 return False
 
-        except Exception as e:
-            print(f"  ✗ 请求失败: {e}")
-            return False
+        final_url = self.resolve_download_url(torrent_url)
+        return self.add_offline_downloads([final_url], download_path, tool)
 
-    def push_missing_episodes(self, limit: int = None) -> int:
+    def _download_target(self, episode: Dict) -> tuple:
+        """剧集的下载目标 (路径, 工具)，同一目标的剧集可以合并提交"""
+        return Config.OPENLIST_DIR, Config.OPENLIST_DOWNLOAD_TOOL
+
+    def push_missing_episodes(self, limit: int = None, batch_size: int = None) -> int:
         """
         推送缺失剧集到离线下载
+        从下载队列领取到期的 pending 剧集，按下载目标分组，
+        每 batch_size 个链接合并为一个请求，成功的一批在一个事务内标记为 downloading；
+        被 OpenList 拒绝的剧集记为一次失败，按指数退避推迟重试；
+        网络错误中断推送，未处理的剧集释放后下次重新领取
 
         Args:
             limit: 限制推送数量
+            batch_size: 每个请求提交的链接数
 
         Returns:
             int: 成功推送的数量
         """
         print("\n=== 推送缺失剧集到离线下载 ===\n")
 
-        # 获取缺失剧集
-        missing = self.get_missing_episodes()
+        batch_size = batch_size or Config.OPENLIST_PUSH_BATCH_SIZE
+
+        # 领取到期的缺失剧集
+        with Metrics.stage('claim'):
+            missing = self.claim_missing_episodes(limit)
 
         if not missing:
             print("没有需要下载的剧集")
             return 0
 
-        print(f"\n找到 {len(missing)} 个缺失剧集")
+        print(f"\n领取 {len(missing)} 个缺失剧集")
 
         if limit:
-            missing = missing[:limit]
             print(f"限制推送 {limit} 个\n")
 
-        # 推送
         success_count = 0
-        for episode in missing:
-            series_name = episode['series_name']
-            ep_num = episode['episode_number']
-            torrent_link = episode['torrent_link']
+        try:
+            if not self.client.token:
+                if not self.client.login():
+                    print("✗ 登录失败")
+                    return 0
+
+            # 并发解析所有种子链接（已缓存的不再下载）
+            with Metrics.stage('resolve_urls'):
+                url_map = self.resolve_download_urls([e['torrent_link'] for e in missing])
 
-            print(f"推送: {series_name} EP{ep_num:02d}")
+            # 按下载目标分组
+            groups: Dict[tuple, List[Dict]] = {}
+            for episode in missing:
+                groups.setdefault(self._download_target(episode), []).append(episode)
 
-            if self.add_offline_download(torrent_link):
-                # 更新状态为 downloading
-                self.db.update_episode_status(episode['id'], 'downloading')
-                success_count += 1
-            else:
-                print(f"  推送失败")
+            try:
+                with Metrics.stage('submit'):
+                    for (download_path, tool), episodes in groups.items():
+                        for start in range(0, len(episodes), batch_size):
+                            chunk = episodes[start:start + batch_size]
+                            success_count += self._push_chunk(chunk, url_map, download_path, tool)
+            except Exception as e:
+                # 网络错误不计入剧集的失败次数
+                print(f"  ✗ 请求失败，停止本次推送: {e}")
+                Metrics.error(f"推送中断: {e}")
+
+        finally:
+            # 未迁移状态的剧集（登录失败、异常中断）释放租约，下次重新领取
+            self.db.release_episodes([e['id'] for e in missing], self.worker_id)
+
+        Metrics.incr('items', success_count)
 
         print(f"\n=== 推送完成 ===")
         print(f"成功: {success_count}/{len(missing)}")
 
         return success_count
+
+    def _push_chunk(self, chunk: List[Dict], url_map: Dict[str, str], download_path: str, tool: str) -> int:
+        """
+        提交一批剧集，整批被拒绝时逐个重试；仍被拒绝的剧集记为失败
+
+        Args:
+            chunk: 剧集列表
+            url_map: {torrent_link: 提交的链接}
+
+        Returns:
+            int: 成功推送的数量
+        """
+        urls = []
+        for episode in chunk:
+            print(f"推送: {episode['series_name']} EP{episode['episode_number']:02d}")
+            urls.append(url_map[episode['torrent_link']])
+
+        error = self._submit_offline_downloads(urls, download_path, tool)
+        if error is None:
+            # 整批在一个事务内更新为 downloading
+            return self.db.move_episodes_status([e['id'] for e in chunk], 'pending', 'downloading')
+
+        if len(chunk) == 1:
+            self._record_failures([(chunk[0], error)], 'pending')
+            return 0
+
+        # 整批被拒绝时逐个提交，避免一个坏链接拖累整批
+        print(f"  批量推送失败，逐个重试...")
+        succeeded, failures = [], []
+        try:
+            for episode, final_url in zip(chunk, urls):
+                error = self._submit_offline_downloads([final_url], download_path, tool)
+                if error is None:
+                    succeeded.append(episode['id'])
+                else:
+                    failures.append((episode, error))
+        finally:
+            self._record_failures(failures, 'pending')
+            self.db.move_episodes_status(succeeded, 'pending', 'downloading')
+
+        return len(succeeded)
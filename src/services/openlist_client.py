@@ -2,8 +2,11 @@
 OpenList API 客户端
 """
 import requests
-from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Dict, List, Iterator, Tuple, Callable
 from src.utils.config import Config
+from src.utils.http_client import HttpClient
+from src.utils.metrics import Metrics
 
 
 class OpenListClient:
@@ -17,6 +20,7 @@ class OpenListClient:
         self.account = Config.OPENLIST_ACCOUNT
         self.password = Config.OPENLIST_PASSWORD
         self.token: Optional[str] = None
+        self.session = HttpClient.get_session()
 
     def login(self) -> bool:
         """
@@ -33,7 +37,7 @@ class OpenListClient:
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=10)
+            response = self.session.post(url, json=payload, timeout=10)
             response.raise_for_status()
 
             data = response.json()
@@ -91,7 +95,7 @@ class OpenListClient:
         }
 
         try:
-            response = requests.post(url, json=payload, headers=self._get_headers(), timeout=30)
+            response = self.session.post(url, json=payload, headers=self._get_headers(), timeout=30)
             response.raise_for_status()
 
             data = response.json()
@@ -106,6 +110,115 @@ class OpenListClient:
             print(f"✗ 列出目录请求失败: {e}")
             return None
 
+    def list_directory_all(self, path: str, per_page: int = None) -> Optional[Dict]:
+        """
+        列出目录全部内容（自动翻页直到取满 total）
+
+        Args:
+            path: 目录路径
+            per_page: 每页数量
+
+        Returns:
+            Dict: 包含完整 content 列表和 total，失败返回 None
+        """
+        per_page = per_page or Config.OPENLIST_LIST_PAGE_SIZE
+
+        content = []
+        page = 1
+        while True:
+            result = self.list_directory(path, page=page, per_page=per_page)
+            if result is None:
+                return None
+
+            items = result.get('content') or []
+            content.extend(items)
+
+            total = result.get('total') or 0
+            if not items or len(content) >= total:
+                return {'content': content, 'total': max(total, len(content))}
+
+            page += 1
+
+    def walk_directories(self, root: str, should_list: Callable[[str, Optional[str]], bool] = None,
+                         max_workers: int = None) -> Iterator[Tuple[str, Optional[str], Optional[List[Dict]]]]:
+        """
+        并发遍历目录树，每列出一个目录就产出一次结果
+
+        子目录在父目录列出后立即提交，同时进行的请求数不超过 max_workers，
+        总耗时取决于树的深度而不是目录总数
+
+        Args:
+            root: 根目录
+            should_list: 判断是否需要列出目录 (path, modified) -> bool，返回 False 时跳过该目录及其子树
+            max_workers: 最大并发数
+
+        Yields:
+            (path, modified, content)，列出失败时 content 为 None
+        """
+        max_workers = max_workers or Config.OPENLIST_SCAN_CONCURRENCY
+
+        list_directory_all = Metrics.bind(self.list_directory_all)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+
+            def submit(path: str, modified: Optional[str]):
+                if should_list and not should_list(path, modified):
+                    return
+                future = executor.submit(list_directory_all, path)
+                pending[future] = (path, modified)
+
+            submit(root, None)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, modified = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"✗ 列出目录异常 {path}: {e}")
+                        result = None
+
+                    content = result.get('content', []) if result else None
+
+                    for item in content or []:
+                        if item.get('is_dir', False):
+                            submit(f"{path}/{item.get('name', '')}", item.get('modified'))
+
+                    yield path, modified, content
+
+    def list_offline_tasks(self, done: bool = False) -> Optional[List[Dict]]:
+        """
+        获取离线下载任务列表（需要管理员账号）
+
+        Args:
+            done: True 获取已结束的任务，False 获取未完成的任务
+
+        Returns:
+            List[Dict]: 任务列表 [{id, name, state, status, progress, error}]，失败返回 None
+        """
+        if not self.token:
+            if not self.login():
+                return None
+
+        url = f"{self.base_url}/api/task/offline_download/{'done' if done else 'undone'}"
+
+        try:
+            response = self.session.get(url, headers=self._get_headers(), timeout=30)
+            response.raise_for_status()
+
+            data = response.json()
+
+            if data.get('code') == 200:
+                return data.get('data') or []
+            else:
+                print(f"✗ 获取离线下载任务失败: {data.get('message', 'Unknown error')}")
+                return None
+
+        except requests.exceptions.RequestException as e:
+            print(f"✗ 获取离线下载任务请求失败: {e}")
+            return None
+
     def scan_directory_recursive(self, path: str) -> List[Dict]:
         """
         递归扫描目录，获取所有视频文件
@@ -118,30 +231,14 @@ class OpenListClient:
         """
         video_files = []
 
-        def _scan(current_path: str):
-            """递归扫描子函数"""
-            result = self.list_directory(current_path)
-
-            if not result:
-                return
-
-            content = result.get('content', [])
-
-            for item in content:
+        for current_path, _, content in self.walk_directories(path):
+            for item in content or []:
                 name = item.get('name', '')
-                is_dir = item.get('is_dir', False)
-
-                if is_dir:
-                    # 递归扫描子目录
-                    sub_path = f"{current_path}/{name}"
-                    _scan(sub_path)
-                else:
-                    # 检查是否为视频文件
-                    if self._is_video_file(name):
-                        item['path'] = f"{current_path}/{name}"
-                        video_files.append(item)
-
-        _scan(path)
+                # 检查是否为视频文件
+                if not item.get('is_dir', False) and self._is_video_file(name):
+                    item['path'] = f"{current_path}/{name}"
+                    video_files.append(item)
+
         return video_files
 
     def _is_video_file(self, filename: str) -> bool:
@@ -180,7 +277,7 @@ class OpenListClient:
         }
 
         try:
-            response = requests.post(url, json=payload, headers=self._get_headers(), timeout=30)
+            response = self.session.post(url, json=payload, headers=self._get_headers(), timeout=30)
             response.raise_for_status()
 
             data = response.json()
@@ -1,12 +1,14 @@
 """
 OpenList 扫描服务
 """
-from typing import List, Dict, Optional
+import hashlib
+from typing import List, Dict, Optional, Tuple
 from src.services.openlist_client import OpenListClient
 from src.services.tmdb_service import TMDBService
 from src.parsers.title_parser import TitleParser
 from src.models.database import Database
 from src.utils.config import Config
+from src.utils.metrics import Metrics
 
 
 class OpenListScanner:
@@ -16,16 +18,22 @@ class OpenListScanner:
         self.client = OpenListClient()
         self.tmdb_service = TMDBService()
         self.title_parser = TitleParser()
-        self.db = Database()
+        self.db = Database.get_instance()
 
-    def scan_and_update(self) -> bool:
+    def scan_and_update(self, full: bool = False) -> bool:
         """
         扫描 OpenList 目录并更新数据库
 
+        默认增量扫描：对比目录快照，跳过未变化的目录，只写入变化的文件；
+        所有变更在一个事务中提交，扫描过程中 openlist 表保持可用
+
+        Args:
+            full: 是否全量扫描（忽略目录快照，重建 openlist 表）
+
         Returns:
             bool: 是否成功
         """
-        print("=== 开始扫描 OpenList ===")
+        print(f"=== 开始{'全量' if full else '增量'}扫描 OpenList ===")
 
         # 登录
         if not self.client.login():
@@ -36,79 +44,285 @@ class OpenListScanner:
         scan_path = Config.OPENLIST_DIR
         print(f"扫描路径: {scan_path}")
 
-        video_files = self.client.scan_directory_recursive(scan_path)
-        print(f"找到 {len(video_files)} 个视频文件")
+        snapshot = {} if full else self.db.get_openlist_dir_snapshot()
+        with Metrics.stage('list_dirs'):
+            changes = self._collect_changes(scan_path, snapshot)
 
-        if not video_files:
-            print("未找到视频文件")
+        if changes is None:
+            print("✗ 列出根目录失败")
             return False
 
-        # 清空旧数据
-        print("清空旧数据...")
-        self.db.clear_openlist()
+        self._apply_changes(changes, full=full)
+        return True
 
-        # 处理每个文件
-        success_count = 0
-        failed_count = 0
+    def scan_targets(self, dirs: List[str]) -> bool:
+        """
+        只扫描指定目录（用于检测下载完成）
 
-        for video in video_files:
-            if self._process_video_file(video):
-                success_count += 1
-            else:
-                failed_count += 1
+        从根目录出发，只列出目标目录及其上级目录、快照中没有的新目录（如新建的种子目录）
+        和修改时间发生变化的目录；未列出的目录保留原有数据，不做删除判断
+
+        Args:
+            dirs: 目标目录列表
+
+        Returns:
+            bool: 是否成功
+        """
+        targets = {path.rstrip('/') for path in dirs if path}
+        print(f"=== 定向扫描 OpenList ({len(targets)} 个目标目录) ===")
+
+        if not self.client.token and not self.client.login():
+            print("✗ 登录失败")
+            return False
+
+        with Metrics.stage('list_dirs'):
+            changes = self._collect_changes(Config.OPENLIST_DIR, self.db.get_openlist_dir_snapshot(),
+                                            targets=targets)
+
+        if changes is None:
+            print("✗ 列出根目录失败")
+            return False
+
+        self._apply_changes(changes)
+        return True
+
+    def _apply_changes(self, changes: Dict, full: bool = False):
+        """解析变化目录中的文件，并在一个事务中写入扫描结果"""
+        print(f"列出目录: {changes['listed_dirs']}，未变化目录: {changes['skipped_dirs']}")
+        Metrics.incr('dirs_listed', changes['listed_dirs'])
+
+        # 找出变化目录中新增或变化的文件
+        changed_videos = []
+        deleted_paths = []
+
+        for dir_path, videos in changes['changed_dirs'].items():
+            existing = {} if full else self.db.get_openlist_files_in_dir(dir_path)
+            current_paths = set()
+
+            for video in videos:
+                file_path = video['path']
+                current_paths.add(file_path)
+
+                # 文件未变化，无需重新解析
+                old = existing.get(file_path)
+                if old and old.get('file_size') == video.get('size') \
+                        and old.get('modified_at') == video.get('modified'):
+                    continue
+
+                changed_videos.append(video)
+
+            deleted_paths.extend(path for path in existing if path not in current_paths)
+
+        # 按目录和番剧名分组解析，每个番剧名只查询一次 TMDB
+        with Metrics.stage('resolve_files'):
+            files, failed_count, failed_dirs = self._resolve_video_files(changed_videos)
+
+        # 有文件解析失败的目录清空快照指纹，下次扫描重新列出并重试这些文件
+        dir_snapshots = [
+            dict(d, modified_at=None, fingerprint=None) if d['path'] in failed_dirs else d
+            for d in changes['dir_snapshots']
+        ]
+
+        # 单个事务写入
+        with Metrics.stage('db_write'):
+            self.db.apply_openlist_scan(
+                files,
+                deleted_paths=deleted_paths,
+                deleted_dirs=changes['deleted_dirs'],
+                dir_snapshots=dir_snapshots,
+                replace_all=full
+            )
+        Metrics.incr('files_updated', len(files))
 
         print(f"\n=== 扫描完成 ===")
-        print(f"成功: {success_count}")
+        print(f"更新: {len(files)}")
+        print(f"删除: {len(deleted_paths)} 个文件, {len(changes['deleted_dirs'])} 个目录")
         print(f"失败: {failed_count}")
 
-        return True
+        stats = self.tmdb_service.cache.get_stats()
+        print(f"TMDB 缓存: 内存命中 {stats['memory_hits']}, 数据库命中 {stats['db_hits']}, 未命中 {stats['misses']}")
 
-    def _process_video_file(self, video: Dict) -> bool:
+    def _collect_changes(self, root: str, snapshot: Dict[str, Dict],
+                         targets: Optional[set] = None) -> Optional[Dict]:
         """
-        处理单个视频文件
+        遍历目录树，对比目录快照找出变化的目录
+
+        修改时间未变的叶子目录（无子目录）不再列出；
+        列出后文件列表指纹未变的目录不再处理其中的文件
 
         Args:
-            video: 视频文件信息
+            root: 根目录
+            snapshot: 目录快照 {path: {modified_at, fingerprint, has_subdirs}}
+            targets: 定向扫描的目标目录（可选）；指定时其他未变化的目录连同子树都不列出，
+                     也不判断已删除的目录
 
         Returns:
-            bool: 是否成功
+            Dict: changed_dirs {path: [video]}, deleted_dirs, dir_snapshots,
+                  listed_dirs, skipped_dirs；根目录列出失败返回 None
         """
-        file_name = video.get('name', '')
-        file_path = video.get('path', '')
+        changed_dirs = {}
+        dir_snapshots = []
+        seen_dirs = set()
+        skipped_dirs = 0
+
+        def should_list(path: str, modified: Optional[str]) -> bool:
+            nonlocal skipped_dirs
+            seen_dirs.add(path)
+
+            previous = snapshot.get(path)
+            unchanged = previous and self._is_valid_modified(modified) \
+                and previous['modified_at'] == modified
+            if unchanged and not previous['has_subdirs']:
+                skipped_dirs += 1
+                return False
+
+            # 定向扫描：已知目录只有修改时间确实变化时才列出
+            if targets is not None and previous and not self._leads_to(path, targets) \
+                    and (unchanged or not self._is_valid_modified(modified)):
+                skipped_dirs += 1
+                return False
+            return True
+
+        for path, modified, content in self.client.walk_directories(root, should_list=should_list):
+            if content is None:
+                if path == root:
+                    return None
+                # 列出失败：保留该目录的旧数据，避免误删
+                prefix = f"{path}/"
+                seen_dirs.update(p for p in snapshot if p.startswith(prefix))
+                continue
+
+            previous = snapshot.get(path)
+            videos = []
+            has_subdirs = False
+
+            for item in content:
+                name = item.get('name', '')
+
+                if item.get('is_dir', False):
+                    has_subdirs = True
+                elif self.client._is_video_file(name):
+                    item['path'] = f"{path}/{name}"
+                    videos.append(item)
+
+            fingerprint = self._fingerprint(content)
+            dir_snapshots.append({
+                'path': path,
+                'modified_at': modified,
+                'fingerprint': fingerprint,
+                'has_subdirs': has_subdirs,
+            })
+
+            if previous and previous['fingerprint'] == fingerprint:
+                skipped_dirs += 1
+                continue
+
+            changed_dirs[path] = videos
+
+        return {
+            'changed_dirs': changed_dirs,
+            'deleted_dirs': [p for p in snapshot if p not in seen_dirs] if targets is None else [],
+            'dir_snapshots': dir_snapshots,
+            'listed_dirs': len(dir_snapshots),
+            'skipped_dirs': skipped_dirs,
+        }
+
+    @staticmethod
+    def _leads_to(path: str, targets: set) -> bool:
+        """path 是某个目标目录或其上级目录"""
+        prefix = f"{path}/"
+        return any(target == path or target.startswith(prefix) for target in targets)
+
+    @staticmethod
+    def _is_valid_modified(modified: Optional[str]) -> bool:
+        """部分存储不提供目录修改时间（返回空或 0001-01-01），此时不能依赖它跳过目录"""
+        return bool(modified) and not modified.startswith('0001-')
+
+    @staticmethod
+    def _fingerprint(content: List[Dict]) -> str:
+        """目录列表指纹（名称、大小、修改时间）"""
+        entries = sorted(
+            f"{item.get('name')}|{item.get('is_dir')}|{item.get('size')}|{item.get('modified')}"
+            for item in content
+        )
+        return hashlib.sha1('\n'.join(entries).encode('utf-8')).hexdigest()
 
-        # 提取番剧名
-        series_name = self.title_parser.extract_series_name(file_name)
-        if not series_name:
-            print(f"✗ 无法提取番剧名: {file_name}")
-            return False
+    def _resolve_video_files(self, videos: List[Dict]) -> Tuple[List[Dict], int, set]:
+        """
+        批量解析视频文件
 
-        # 提取集数
-        episode_number = self.title_parser.extract_episode_number(file_name)
-        if episode_number is None:
-            print(f"✗ 无法提取集数: {file_name}")
-            return False
+        先解析文件名并按 (所在目录, 番剧名) 分组，每个不同的番剧名只搜索一次 TMDB，
+        再把 tmdb_id 回填到组内所有文件
 
-        # 搜索 TMDB
-        tmdb_result = self.tmdb_service.search_anime(series_name)
-        if not tmdb_result:
-            print(f"✗ 未找到 TMDB: {series_name}")
-            return False
+        Args:
+            videos: 视频文件信息列表
 
-        tmdb_id = tmdb_result['tmdb_id']
+        Returns:
+            (待写入 openlist 表的记录, 失败数量, 有文件解析失败的目录)
+        """
+        groups: Dict[Tuple[str, str], List[Tuple[Dict, int]]] = {}
+        failed_count = 0
+        failed_dirs = set()
 
-        # 存入数据库
-        self.db.insert_openlist_file(
-            file_path=file_path,
-            file_name=file_name,
-            tmdb_id=tmdb_id,
-            episode_number=episode_number,
-            file_size=video.get('size'),
-            modified_at=video.get('modified')
-        )
+        for video in videos:
+            file_name = video.get('name', '')
+            dir_path = video.get('path', '').rsplit('/', 1)[0]
 
-        print(f"✓ {series_name} - {episode_number:02d}")
+            parsed = self.title_parser.parse(file_name)
 
-        return True
+            # 提取番剧名
+            series_name = parsed.series_name
+            if not series_name:
+                print(f"✗ 无法提取番剧名: {file_name}")
+                failed_count += 1
+                failed_dirs.add(dir_path)
+                continue
+
+            # 提取集数
+            episode_number = parsed.episode
+            if episode_number is None:
+                print(f"✗ 无法提取集数: {file_name}")
+                failed_count += 1
+                failed_dirs.add(dir_path)
+                continue
+
+            groups.setdefault((dir_path, series_name), []).append((video, episode_number))
+
+        # 每个番剧名只解析一次
+        resolved: Dict[str, Optional[int]] = {}
+        rows = []
+        searches = 0
+
+        for (dir_path, series_name), members in groups.items():
+            if series_name not in resolved:
+                tmdb_result, cache_hit = self.tmdb_service.search_anime_cached(series_name)
+                if not cache_hit:
+                    searches += 1
+                resolved[series_name] = tmdb_result['tmdb_id'] if tmdb_result else None
+
+            tmdb_id = resolved[series_name]
+            if tmdb_id is None:
+                print(f"✗ 未找到 TMDB: {series_name} ({len(members)} 个文件)")
+                failed_count += len(members)
+                failed_dirs.add(dir_path)
+                continue
+
+            for video, episode_number in members:
+                rows.append({
+                    'file_path': video.get('path', ''),
+                    'file_name': video.get('name', ''),
+                    'tmdb_id': tmdb_id,
+                    'episode_number': episode_number,
+                    'file_size': video.get('size'),
+                    'modified_at': video.get('modified'),
+                })
+
+            episode_list = ', '.join(f"{ep:02d}" for _, ep in sorted(members, key=lambda m: m[1]))
+            print(f"✓ {series_name} - {episode_list}")
+
+        print(f"\n解析 {len(videos)} 个文件，{len(resolved)} 个番剧，TMDB 搜索 {searches} 次（其余命中缓存）")
+
+        return rows, failed_count, failed_dirs
 
     def get_missing_episodes(self, tmdb_id: int = None) -> List[Dict]:
         """
@@ -124,7 +338,8 @@ class OpenListScanner:
 
         # 获取所有订阅的番剧
         if tmdb_id:
-            series_list = [s for s in self.db.get_all_series() if s['tmdb_id'] == tmdb_id]
+            series = self.db.get_series(tmdb_id)
+            series_list = [series] if series and series['status'] == 'active' else []
         else:
             series_list = self.db.get_all_series()
 
@@ -2,7 +2,8 @@
 RSS 订阅拉取服务
 """
 import feedparser
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from src.services.feed_cache import FeedCache
 from src.utils.config import Config
 
 
@@ -11,6 +12,7 @@ class RSSFetcher:
 
     def __init__(self):
         self.rss_url = Config.MIKAN_RSS_URL
+        self.feed_cache = FeedCache()
 
     def fetch(self) -> List[Dict]:
         """
@@ -21,30 +23,62 @@ class RSSFetcher:
         """
         try:
             feed = feedparser.parse(self.rss_url)
+            return self._parse_entries(feed)
 
-            if feed.bozo:
-                raise Exception(f"RSS parse error: {feed.bozo_exception}")
+        except Exception as e:
+            print(f"Failed to fetch RSS: {e}")
+            return []
+
+    def fetch_if_changed(self) -> Tuple[Optional[List[Dict]], Optional[Dict]]:
+        """
+        条件拉取 RSS 订阅（ETag / Last-Modified / 内容哈希）
+
+        处理成功后需调用 mark_processed(validators)，否则下次仍会重新处理
 
-            items = []
-            for entry in feed.entries:
-                item = {
-                    'title': entry.title,
-                    'link': entry.link,
-                    'pub_date': entry.published if hasattr(entry, 'published') else None,
-                    'guid': entry.id if hasattr(entry, 'id') else None,
-                }
+        Returns:
+            (条目列表, 校验信息)；feed 未变化时条目列表为 None
+        """
+        result = self.feed_cache.fetch(self.rss_url)
 
-                # 提取种子信息
-                if hasattr(entry, 'torrent_contentlength'):
-                    item['content_length'] = entry.torrent_contentlength
+        if result['status'] == FeedCache.UNCHANGED:
+            return None, None
 
-                items.append(item)
+        if result['status'] == FeedCache.ERROR:
+            return [], None
 
-            return items
+        try:
+            return self._parse_entries(result['feed']), result['validators']
 
         except Exception as e:
             print(f"Failed to fetch RSS: {e}")
-            return []
+            return [], None
+
+    def mark_processed(self, validators: Optional[Dict]):
+        """记录已处理的 feed 校验信息"""
+        self.feed_cache.save(self.rss_url, validators)
+
+    @staticmethod
+    def _parse_entries(feed) -> List[Dict]:
+        """将 feed 条目转换为字典列表"""
+        if feed.bozo:
+            raise Exception(f"RSS parse error: {feed.bozo_exception}")
+
+        items = []
+        for entry in feed.entries:
+            item = {
+                'title': entry.title,
+                'link': entry.link,
+                'pub_date': entry.published if hasattr(entry, 'published') else None,
+                'guid': entry.id if hasattr(entry, 'id') else None,
+            }
+
+            # 提取种子信息
+            if hasattr(entry, 'torrent_contentlength'):
+                item['content_length'] = entry.torrent_contentlength
+
+            items.append(item)
+
+        return items
 
     def fetch_unique_titles(self) -> List[str]:
         """
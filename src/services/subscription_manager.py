@@ -1,7 +1,7 @@
 """
 订阅管理服务 - 负责订阅的增删改查和文件清理
 """
-from typing import List, Dict
+from typing import Dict
 from src.models.database import Database
 from src.services.openlist_client import OpenListClient
 
@@ -10,7 +10,7 @@ class SubscriptionManager:
     """订阅管理器"""
 
     def __init__(self):
-        self.db = Database()
+        self.db = Database.get_instance()
         self.openlist_client = OpenListClient()
 
     def delete_subscription(self, tmdb_id: int, delete_files: bool = True) -> tuple:
@@ -26,8 +26,7 @@ class SubscriptionManager:
         """
         try:
             # 1. 获取番剧信息
-            series_list = self.db.get_all_series()
-            series = next((s for s in series_list if s['tmdb_id'] == tmdb_id), None)
+            series = self.db.get_series(tmdb_id)
 
             if not series:
                 return False, 0, f"未找到 TMDB ID: {tmdb_id} 的订阅"
@@ -48,21 +47,17 @@ class SubscriptionManager:
                 else:
                     print(f"  - 没有需要删除的文件")
 
-            # 3. 删除数据库中的 openlist 记录
+            # 3. 在同一事务中删除 openlist 记录、episodes、series 和 RSS 缓存
+            #    （保留 RSS 缓存的话重新添加后会被判为未变化，剧集不会被重新写入）
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM openlist WHERE tmdb_id = ?", (tmdb_id,))
-
-            # 4. 删除数据库中的 episodes
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
                 cursor.execute("DELETE FROM episodes WHERE tmdb_id = ?", (tmdb_id,))
                 deleted_episodes = cursor.rowcount
-
-            # 5. 删除数据库中的 series
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
                 cursor.execute("DELETE FROM series WHERE tmdb_id = ?", (tmdb_id,))
+                if series.get('raw_rss_url'):
+                    self.db.delete_feed_cache(series['raw_rss_url'])
+            self.db.invalidate_series(tmdb_id)
 
             print(f"  ✓ 删除订阅: {series_name}")
             print(f"  ✓ 删除剧集记录: {deleted_episodes} 条")
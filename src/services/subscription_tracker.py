@@ -8,6 +8,7 @@ from src.parsers.page_scraper import MikanPageScraper
 from src.services.tmdb_service import TMDBService
 from src.models.database import Database
 from src.utils.season_helper import SeasonHelper
+from src.utils.metrics import Metrics
 
 
 class SubscriptionTracker:
@@ -18,23 +19,35 @@ class SubscriptionTracker:
         self.title_parser = TitleParser()
         self.page_scraper = MikanPageScraper()
         self.tmdb_service = TMDBService()
-        self.db = Database()
+        self.db = Database.get_instance()
         self.season_helper = SeasonHelper()
 
-    def process_subscriptions(self):
+    def process_subscriptions(self, force: bool = False):
         """
         处理订阅 - 主流程
 
-        1. 拉取 RSS 订阅
+        1. 拉取 RSS 订阅（未变化则直接结束）
         2. 解析标题，提取番剧名称
         3. 检查是否已屏蔽
         4. 搜索 TMDB 获取 ID
         5. 存储到数据库
+
+        Args:
+            force: 是否忽略 RSS 缓存强制处理
         """
         print("开始处理订阅...")
 
         # 拉取 RSS
-        items = self.rss_fetcher.fetch()
+        with Metrics.stage('fetch_rss'):
+            if force:
+                items, validators = self.rss_fetcher.fetch(), None
+            else:
+                items, validators = self.rss_fetcher.fetch_if_changed()
+
+        if items is None:
+            print("RSS 未变化，跳过")
+            return
+
         print(f"拉取到 {len(items)} 个条目")
 
         # 去重：按番剧名称去重
@@ -44,7 +57,7 @@ class SubscriptionTracker:
             title = item['title']
 
             # 解析标题
-            series_name = self.title_parser.extract_series_name(title)
+            series_name = self.title_parser.parse(title).series_name
             if not series_name:
                 print(f"无法解析标题: {title}")
                 continue
@@ -69,6 +82,10 @@ class SubscriptionTracker:
         # 处理每个番剧
         for series_name, data in unique_series.items():
             self._process_single_series(series_name, data)
+        Metrics.incr('items', len(unique_series))
+
+        # 处理完成后再记录校验信息，中途失败下次会重新处理
+        self.rss_fetcher.mark_processed(validators)
 
         print("订阅处理完成")
 
@@ -102,7 +119,8 @@ class SubscriptionTracker:
 
         if episode_link:
             print(f"刮削页面: {episode_link}")
-            scrape_result = self.page_scraper.scrape_episode_page(episode_link)
+            with Metrics.stage('scrape_page'):
+                scrape_result = self.page_scraper.scrape_episode_page(episode_link)
             if scrape_result:
                 raw_rss_url = scrape_result.get('raw_rss_url')
                 img_url = scrape_result.get('img_url')
@@ -117,19 +135,20 @@ class SubscriptionTracker:
             print(f"生成季节标签: {season_tag}")
 
         # 存储到数据库
-        self.db.insert_series(
-            tmdb_id=tmdb_id,
-            title=data['original_title'],
-            series_name=series_name,
-            blocked_keyword=series_name,  # 使用番剧名作为屏蔽关键词
-            alias_names=tmdb_result.get('original_name'),
-            total_episodes=details.get('number_of_episodes') if details else None,
-            raw_rss_url=raw_rss_url,
-            img_url=img_url,
-            first_air_date=first_air_date,
-            season_tag=season_tag,
-            source='mikan'
-        )
+        with Metrics.stage('db_write'):
+            self.db.insert_series(
+                tmdb_id=tmdb_id,
+                title=data['original_title'],
+                series_name=series_name,
+                blocked_keyword=series_name,  # 使用番剧名作为屏蔽关键词
+                alias_names=tmdb_result.get('original_name'),
+                total_episodes=details.get('number_of_episodes') if details else None,
+                raw_rss_url=raw_rss_url,
+                img_url=img_url,
+                first_air_date=first_air_date,
+                season_tag=season_tag,
+                source='mikan'
+            )
 
         print(f"已添加到数据库: {series_name}")
 
@@ -0,0 +1,121 @@
+"""
+TMDB 查询缓存 - 进程内 LRU + SQLite 持久化
+"""
+import json
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from src.models.database import Database
+from src.utils.config import Config
+
+
+class TMDBCache:
+    """TMDB 缓存"""
+
+    # 未命中时返回的哨兵（区分「缓存了 None」与「没有缓存」）
+    MISS = object()
+
+    _instance: Optional['TMDBCache'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db: Database = None, lru_size: int = None):
+        self.db = db or Database.get_instance()
+        self.lru_size = lru_size or Config.TMDB_CACHE_LRU_SIZE
+        self.ttl = timedelta(hours=Config.TMDB_CACHE_TTL_HOURS)
+        self.negative_ttl = timedelta(hours=Config.TMDB_CACHE_NEGATIVE_TTL_HOURS)
+
+        # {cache_key: (value, expires_at)}
+        self._lru: 'OrderedDict[str, Tuple[Optional[Dict], datetime]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'memory_hits': 0,
+            'db_hits': 0,
+            'negative_hits': 0,
+            'misses': 0,
+        }
+
+    @classmethod
+    def get_instance(cls) -> 'TMDBCache':
+        """获取共享的缓存实例"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                # 每个进程启动时清理一次过期缓存
+                cls._instance.db.purge_expired_tmdb_cache()
+            return cls._instance
+
+    @staticmethod
+    def normalize_name(series_name: str) -> str:
+        """规范化番剧名称（全角转半角、小写、合并空白）"""
+        normalized = unicodedata.normalize('NFKC', series_name or '')
+        return ' '.join(normalized.lower().split())
+
+    @classmethod
+    def search_key(cls, series_name: str) -> str:
+        return f"search:{cls.normalize_name(series_name)}"
+
+    @staticmethod
+    def details_key(tmdb_id: int) -> str:
+        return f"details:{tmdb_id}"
+
+    def get(self, cache_key: str):
+        """
+        读取缓存
+
+        Returns:
+            缓存的值（可能为 None，表示 TMDB 无结果），未命中返回 TMDBCache.MISS
+        """
+        now = datetime.now()
+
+        with self._lock:
+            entry = self._lru.get(cache_key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._lru.move_to_end(cache_key)
+                    self.stats['memory_hits'] += 1
+                    if value is None:
+                        self.stats['negative_hits'] += 1
+                    return value
+                del self._lru[cache_key]
+
+        row = self.db.get_tmdb_cache(cache_key)
+        if row is None:
+            with self._lock:
+                self.stats['misses'] += 1
+            return self.MISS
+
+        value = json.loads(row['payload']) if row['payload'] is not None else None
+        self._remember(cache_key, value, datetime.fromisoformat(row['expires_at']))
+
+        with self._lock:
+            self.stats['db_hits'] += 1
+            if value is None:
+                self.stats['negative_hits'] += 1
+
+        return value
+
+    def set(self, cache_key: str, value: Optional[Dict]):
+        """写入缓存，value 为 None 时按负缓存 TTL 保存"""
+        ttl = self.ttl if value is not None else self.negative_ttl
+        expires_at = datetime.now() + ttl
+
+        payload = json.dumps(value, ensure_ascii=False) if value is not None else None
+        self.db.set_tmdb_cache(cache_key, payload, expires_at.isoformat())
+        self._remember(cache_key, value, expires_at)
+
+    def _remember(self, cache_key: str, value: Optional[Dict], expires_at: datetime):
+        """写入进程内 LRU"""
+        with self._lock:
+            self._lru[cache_key] = (value, expires_at)
+            self._lru.move_to_end(cache_key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取命中统计"""
+        with self._lock:
+            return dict(self.stats)
@@ -2,8 +2,10 @@
 TMDB API 服务
 """
 from tmdbv3api import TMDb, TV, Search
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
+from src.services.tmdb_cache import TMDBCache
 from src.utils.config import Config
+from src.utils.metrics import Metrics
 
 
 class TMDBService:
@@ -15,10 +17,11 @@ class TMDBService:
         self.tmdb.language = 'zh-CN'
         self.search = Search()
         self.tv = TV()
+        self.cache = TMDBCache.get_instance()
 
     def search_anime(self, series_name: str) -> Optional[Dict]:
         """
-        搜索番剧
+        搜索番剧（带缓存，未找到的结果也会缓存一段时间）
 
         Args:
             series_name: 番剧名称
@@ -26,33 +29,56 @@ class TMDBService:
         Returns:
             番剧信息字典，包含 tmdb_id, name, overview 等
         """
-        try:
-            # 搜索电视节目
-            results = self.search.tv_shows(series_name)
-
-            if not results:
-                print(f"No TMDB results found for: {series_name}")
-                return None
-
-            # 取第一个结果
-            first_result = results[0]
-
-            return {
-                'tmdb_id': first_result.id,
-                'name': first_result.name,
-                'original_name': first_result.original_name if hasattr(first_result, 'original_name') else None,
-                'overview': first_result.overview if hasattr(first_result, 'overview') else None,
-                'first_air_date': first_result.first_air_date if hasattr(first_result, 'first_air_date') else None,
-                'vote_average': first_result.vote_average if hasattr(first_result, 'vote_average') else None,
-            }
+        return self.search_anime_cached(series_name)[0]
+
+    def search_anime_cached(self, series_name: str) -> Tuple[Optional[Dict], bool]:
+        """
+        同 search_anime，并返回结果是否来自缓存
 
+        Returns:
+            (番剧信息字典, 是否命中缓存)；命中缓存为 False 时表示实际请求了 TMDB
+        """
+        cache_key = TMDBCache.search_key(series_name)
+        cached = self.cache.get(cache_key)
+        if cached is not TMDBCache.MISS:
+            return cached, True
+
+        try:
+            with Metrics.stage('tmdb'):
+                Metrics.incr('http_calls')
+                result = self._search_anime(series_name)
         except Exception as e:
+            # 请求失败不缓存，下次重试
             print(f"Failed to search TMDB for '{series_name}': {e}")
+            return None, False
+
+        self.cache.set(cache_key, result)
+        return result, False
+
+    def _search_anime(self, series_name: str) -> Optional[Dict]:
+        """调用 TMDB 搜索接口，无结果返回 None，请求失败抛出异常"""
+        # 搜索电视节目
+        results = self.search.tv_shows(series_name)
+
+        if not results:
+            print(f"No TMDB results found for: {series_name}")
             return None
 
+        # 取第一个结果
+        first_result = results[0]
+
+        return {
+            'tmdb_id': first_result.id,
+            'name': first_result.name,
+            'original_name': first_result.original_name if hasattr(first_result, 'original_name') else None,
+            'overview': first_result.overview if hasattr(first_result, 'overview') else None,
+            'first_air_date': first_result.first_air_date if hasattr(first_result, 'first_air_date') else None,
+            'vote_average': first_result.vote_average if hasattr(first_result, 'vote_average') else None,
+        }
+
     def get_series_details(self, tmdb_id: int) -> Optional[Dict]:
         """
-        获取番剧详细信息
+        获取番剧详细信息（带缓存）
 
         Args:
             tmdb_id: TMDB ID
@@ -60,10 +86,17 @@ class TMDBService:
         Returns:
             番剧详细信息
         """
+        cache_key = TMDBCache.details_key(tmdb_id)
+        cached = self.cache.get(cache_key)
+        if cached is not TMDBCache.MISS and cached is not None:
+            return cached
+
         try:
-            details = self.tv.details(tmdb_id)
+            with Metrics.stage('tmdb'):
+                Metrics.incr('http_calls')
+                details = self.tv.details(tmdb_id)
 
-            return {
+            result = {
                 'tmdb_id': details.id,
                 'name': details.name,
                 'original_name': details.original_name,
@@ -77,3 +110,6 @@ class TMDBService:
         except Exception as e:
             print(f"Failed to get TMDB details for ID {tmdb_id}: {e}")
             return None
+
+        self.cache.set(cache_key, result)
+        return result
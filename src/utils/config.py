@@ -18,12 +18,35 @@ class Config:
 
     # TMDB 配置
     TMDB_API_KEY = os.getenv('TMDB_API_KEY')
+    TMDB_CACHE_TTL_HOURS = int(os.getenv('TMDB_CACHE_TTL_HOURS', 24 * 7))         # 命中结果缓存时长
+    TMDB_CACHE_NEGATIVE_TTL_HOURS = int(os.getenv('TMDB_CACHE_NEGATIVE_TTL_HOURS', 6))  # 未找到结果缓存时长
+    TMDB_CACHE_LRU_SIZE = int(os.getenv('TMDB_CACHE_LRU_SIZE', 1024))             # 进程内缓存条数
 
     # 任务配置
     RSS_FETCH_INTERVAL = int(os.getenv('RSS_FETCH_INTERVAL', 30))
+    EPISODE_SCRAPE_CONCURRENCY = int(os.getenv('EPISODE_SCRAPE_CONCURRENCY', 6))    # 并发拉取番剧 RSS 数
+    MIKAN_REQUEST_INTERVAL = float(os.getenv('MIKAN_REQUEST_INTERVAL', 0.2))      # 同一主机请求最小间隔（秒）
 
     # 数据库配置
     DATABASE_PATH = os.getenv('DATABASE_PATH', 'data/autoani.db')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')       # OFF/NORMAL/FULL
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -16000))      # 负数表示 KiB
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 64 * 1024 * 1024))
+    SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 30))      # 秒
+    DASHBOARD_STATS_TTL_SECONDS = float(os.getenv('DASHBOARD_STATS_TTL_SECONDS', 15))  # 状态页统计缓存时长
+    SERIES_CACHE_SIZE = int(os.getenv('SERIES_CACHE_SIZE', 512))                  # 单个番剧查询的进程内缓存条数
+    SERIES_CACHE_TTL_SECONDS = float(os.getenv('SERIES_CACHE_TTL_SECONDS', 300))  # 兜底其他进程（命令行）的修改
+    DB_READ_WORKERS = int(os.getenv('DB_READ_WORKERS', 4))                        # Bot / 调度器异步查询的读线程数
+
+    # HTTP 配置（所有对外请求共享连接池）
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 30))              # 默认超时（秒）
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', 3))                 # 最大重试次数
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', 0.5))  # 重试退避系数
+    HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', 10))          # 缓存的主机连接池数量
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 16))            # 每个主机的最大连接数
+
+    # 任务运行记录
+    JOB_RUNS_RETENTION_DAYS = int(os.getenv('JOB_RUNS_RETENTION_DAYS', 30))      # job_runs 保留天数
 
     # 项目根目录
     BASE_DIR = Path(__file__).parent.parent.parent
@@ -34,6 +57,21 @@ class Config:
     OPENLIST_PASSWORD = os.getenv('OPENLIST_PASSWORD')
     OPENLIST_DIR = os.getenv('OPENLIST_DIR', '/Animate/Bangumi')
     OPENLIST_DOWNLOAD_TOOL = os.getenv('OPENLIST_DOWNLOAD_TOOL', 'qbittorrent')
+    OPENLIST_PUSH_BATCH_SIZE = int(os.getenv('OPENLIST_PUSH_BATCH_SIZE', 20))     # 每个离线下载请求的 URL 数
+    OPENLIST_PUSH_LIMIT = int(os.getenv('OPENLIST_PUSH_LIMIT', 200))              # 每次定时推送的最大剧集数（0 为不限）
+    TORRENT_RESOLVE_CONCURRENCY = int(os.getenv('TORRENT_RESOLVE_CONCURRENCY', 4))  # 并发下载种子数
+    OPENLIST_SCAN_CONCURRENCY = int(os.getenv('OPENLIST_SCAN_CONCURRENCY', 8))    # 并发列目录数
+    OPENLIST_LIST_PAGE_SIZE = int(os.getenv('OPENLIST_LIST_PAGE_SIZE', 200))      # 列目录每页数量
+    OPENLIST_TREE_SCAN_INTERVAL_HOURS = float(os.getenv('OPENLIST_TREE_SCAN_INTERVAL_HOURS', 6))  # 检测完成时整树扫描的最小间隔
+    OPENLIST_TASK_POLL = os.getenv('OPENLIST_TASK_POLL', 'false').lower() in ('1', 'true', 'yes')  # 检测完成时读取离线下载任务状态
+
+    # 下载队列配置
+    DOWNLOAD_CHECK_DELAY_MINUTES = float(os.getenv('DOWNLOAD_CHECK_DELAY_MINUTES', 30))  # 推送后多久检查是否完成
+    DOWNLOAD_LEASE_MINUTES = float(os.getenv('DOWNLOAD_LEASE_MINUTES', 30))              # 领取剧集的租约时长
+    DOWNLOAD_TIMEOUT_HOURS = float(os.getenv('DOWNLOAD_TIMEOUT_HOURS', 24))              # 推送后多久仍未完成记为失败
+    DOWNLOAD_MAX_ATTEMPTS = int(os.getenv('DOWNLOAD_MAX_ATTEMPTS', 5))                   # 失败多少次后标记为 failed
+    DOWNLOAD_BACKOFF_BASE_MINUTES = float(os.getenv('DOWNLOAD_BACKOFF_BASE_MINUTES', 30))  # 首次失败后的重试间隔
+    DOWNLOAD_BACKOFF_MAX_MINUTES = float(os.getenv('DOWNLOAD_BACKOFF_MAX_MINUTES', 24 * 60))  # 重试间隔上限
 
     @classmethod
     def validate(cls):
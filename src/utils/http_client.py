@@ -0,0 +1,86 @@
+"""
+共享 HTTP 连接池
+所有对外请求（OpenList、蜜柑、种子下载）复用同一个 Session，保持长连接
+"""
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional
+from src.utils.config import Config
+from src.utils.metrics import Metrics
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """未指定 timeout 时使用默认超时的 HTTPAdapter"""
+
+    def __init__(self, *args, timeout: float = None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class HttpClient:
+    """HTTP 连接池管理"""
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+    _session: Optional[requests.Session] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """获取共享的 Session（按主机维护连接池）"""
+        with cls._lock:
+            if cls._session is None:
+                cls._session = cls._create_session()
+            return cls._session
+
+    @classmethod
+    def _create_session(cls) -> requests.Session:
+        """创建带重试和默认超时的 Session"""
+        # 连接失败对所有方法重试（请求尚未发出）；
+        # 读取失败和 5xx 只对幂等方法重试，避免重复提交离线下载
+        retry = Retry(
+            total=Config.HTTP_RETRIES,
+            connect=Config.HTTP_RETRIES,
+            read=Config.HTTP_RETRIES,
+            status=Config.HTTP_RETRIES,
+            backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+        adapter = TimeoutHTTPAdapter(
+            timeout=Config.HTTP_TIMEOUT,
+            pool_connections=Config.HTTP_POOL_HOSTS,
+            pool_maxsize=Config.HTTP_POOL_SIZE,
+            max_retries=retry,
+        )
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'User-Agent': cls.USER_AGENT})
+        # 统计当前任务运行的请求数
+        session.hooks['response'].append(cls._count_response)
+        return session
+
+    @staticmethod
+    def _count_response(response, *args, **kwargs):
+        Metrics.incr('http_calls')
+        if response.status_code >= 400:
+            Metrics.incr('http_errors')
+
+    @classmethod
+    def close(cls):
+        """关闭连接池（程序退出时调用）"""
+        with cls._lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
@@ -0,0 +1,148 @@
+"""
+任务运行指标
+记录一次定时任务运行的耗时、分阶段计时和计数器，运行结束后写入 job_runs 表
+
+当前运行通过 contextvars 传递：调度器用 Metrics.run 开始一次运行，
+asyncio.to_thread 会复制上下文，服务内的线程池用 Metrics.bind 提交任务，
+不在任务运行中（如手动命令行）时所有记录操作都是空操作
+"""
+import json
+import threading
+import time
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+_current_run: contextvars.ContextVar[Optional['JobRun']] = contextvars.ContextVar('job_run', default=None)
+
+
+class JobRun:
+    """一次任务运行的指标（线程安全）"""
+
+    # 记录的错误信息条数上限
+    MAX_ERRORS = 20
+
+    def __init__(self, job_name: str):
+        self.job_name = job_name
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.status: Optional[str] = None
+        self._start = time.perf_counter()
+        self.duration = 0.0
+        # {阶段名: 累计秒数}
+        self.stages: Dict[str, float] = {}
+        # {计数器名: 数量}，items / http_calls / errors 单独存列
+        self.counters: Dict[str, int] = {}
+        self.errors: List[str] = []
+        self._lock = threading.Lock()
+
+    def add_stage_time(self, name: str, seconds: float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_error(self, message: str):
+        with self._lock:
+            self.counters['errors'] = self.counters.get('errors', 0) + 1
+            if len(self.errors) < self.MAX_ERRORS:
+                self.errors.append(message)
+
+    def finish(self, status: str):
+        """结束运行"""
+        self.finished_at = datetime.now()
+        self.duration = time.perf_counter() - self._start
+        self.status = status
+
+    def summary(self) -> str:
+        """一行摘要：总耗时和耗时最多的阶段"""
+        parts = [f"耗时 {self.duration:.1f}s"]
+        if self.stages:
+            slowest = sorted(self.stages.items(), key=lambda item: item[1], reverse=True)[:3]
+            parts.append('阶段 ' + ', '.join(f"{name} {seconds:.1f}s" for name, seconds in slowest))
+        for name in ('items', 'http_calls', 'errors'):
+            if self.counters.get(name):
+                parts.append(f"{name} {self.counters[name]}")
+        return '，'.join(parts)
+
+    def to_row(self) -> Dict:
+        """job_runs 表的一行"""
+        counters = {k: v for k, v in self.counters.items() if k not in ('items', 'http_calls', 'errors')}
+        return {
+            'job_name': self.job_name,
+            'status': self.status,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_ms': round(self.duration * 1000, 1),
+            'items': self.counters.get('items', 0),
+            'http_calls': self.counters.get('http_calls', 0),
+            'errors': self.counters.get('errors', 0),
+            'stages': json.dumps({k: round(v * 1000, 1) for k, v in self.stages.items()}),
+            'counters': json.dumps(counters) if counters else None,
+            'error': '\n'.join(self.errors) if self.errors else None,
+        }
+
+
+class Metrics:
+    """当前任务运行的指标入口"""
+
+    @staticmethod
+    @contextmanager
+    def run(job_name: str):
+        """开始一次任务运行，期间的 stage / incr / error 都记入该运行"""
+        job_run = JobRun(job_name)
+        token = _current_run.set(job_run)
+        try:
+            yield job_run
+        finally:
+            _current_run.reset(token)
+
+    @staticmethod
+    def current() -> Optional[JobRun]:
+        return _current_run.get()
+
+    @staticmethod
+    @contextmanager
+    def stage(name: str):
+        """阶段计时（同名阶段累加；在线程池中并发执行时累加的是各线程耗时之和）"""
+        job_run = _current_run.get()
+        if job_run is None:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            job_run.add_stage_time(name, time.perf_counter() - start)
+
+    @staticmethod
+    def incr(name: str, amount: int = 1):
+        """计数器加 amount（items 为处理的条目数，http_calls 为 HTTP 请求数）"""
+        job_run = _current_run.get()
+        if job_run is not None and amount:
+            job_run.incr(name, amount)
+
+    @staticmethod
+    def error(message: str):
+        """记录一个已处理的错误"""
+        job_run = _current_run.get()
+        if job_run is not None:
+            job_run.add_error(message)
+
+    @staticmethod
+    def bind(func: Callable) -> Callable:
+        """
+        绑定当前上下文，提交到线程池的函数在工作线程中也记入当前运行
+
+        每次调用复制一次上下文，同一个函数可以被多个线程同时执行
+        """
+        context = contextvars.copy_context()
+
+        def wrapper(*args, **kwargs):
+            return context.copy().run(func, *args, **kwargs)
+
+        return wrapper
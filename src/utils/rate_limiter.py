@@ -0,0 +1,35 @@
+"""
+按主机限速
+同一主机的两次请求之间至少间隔 min_interval 秒，不同主机互不影响
+"""
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """按主机的最小请求间隔限速器（线程安全）"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        # {host: 下一次允许请求的时间}
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        """阻塞到该 URL 所在主机允许发起下一次请求"""
+        if self.min_interval <= 0:
+            return
+
+        host = urlparse(url).netloc.lower()
+
+        # 先预约时间槽再睡眠，避免持锁等待
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
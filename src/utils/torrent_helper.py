@@ -1,9 +1,9 @@
 """
 种子辅助工具 - 处理蜜柑种子链接
 """
-import requests
 import base64
-from typing import Optional
+from typing import Optional, Dict
+from src.utils.http_client import HttpClient
 
 
 class TorrentHelper:
@@ -21,11 +21,7 @@ class TorrentHelper:
             bytes: 种子文件内容，失败返回 None
         """
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-
-            response = requests.get(torrent_url, headers=headers, timeout=30)
+            response = HttpClient.get_session().get(torrent_url, timeout=30)
             response.raise_for_status()
 
             # 确保是种子文件
@@ -53,15 +49,15 @@ class TorrentHelper:
         return base64.b64encode(torrent_content).decode('utf-8')
 
     @staticmethod
-    def get_magnet_link(torrent_content: bytes) -> Optional[str]:
+    def parse_torrent(torrent_content: bytes) -> Optional[Dict[str, str]]:
         """
-        从种子内容提取 magnet 链接（如果可能）
+        解析种子内容，计算 info hash 并生成 magnet 链接
 
         Args:
             torrent_content: 种子文件字节内容
 
         Returns:
-            str: magnet 链接，失败返回 None
+            Dict: {info_hash, magnet}，失败返回 None
         """
         try:
             import hashlib
@@ -83,7 +79,7 @@ class TorrentHelper:
                 announce = torrent_dict[b'announce'].decode('utf-8')
                 magnet += f"&tr={announce}"
 
-            return magnet
+            return {'info_hash': info_hash, 'magnet': magnet}
 
         except ImportError:
             # bencodepy 未安装，返回 None
@@ -91,3 +87,17 @@ class TorrentHelper:
         except Exception as e:
             print(f"  ✗ 生成 magnet 链接失败: {e}")
             return None
+
+    @staticmethod
+    def get_magnet_link(torrent_content: bytes) -> Optional[str]:
+        """
+        从种子内容提取 magnet 链接（如果可能）
+
+        Args:
+            torrent_content: 种子文件字节内容
+
+        Returns:
+            str: magnet 链接，失败返回 None
+        """
+        parsed = TorrentHelper.parse_torrent(torrent_content)
+        return parsed['magnet'] if parsed else None
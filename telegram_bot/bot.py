@@ -126,6 +126,23 @@ async def add_command_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
 
 
+def _format_status_text(stats: dict) -> str:
+    """系统状态文本（stats 来自 Database.get_dashboard_stats）"""
+    status_stats = stats['statuses']
+    return (
+        "📊 系统状态\n\n"
+        f"订阅数: {stats['series']}\n"
+        f"总剧集数: {stats['episodes']}\n\n"
+        "剧集状态分布:\n"
+        f"  ⏳ 待下载: {status_stats['pending']} 集\n"
+        f"  ⬇️ 下载中: {status_stats['downloading']} 集\n"
+        f"  ✅ 已下载: {status_stats['openlist_exists']} 集\n"
+        f"  ⚠️ 不匹配: {status_stats['mismatched']} 集\n"
+        f"  ❌ 下载失败: {status_stats['failed']} 集\n\n"
+        f"OpenList 文件数: {stats['openlist_files']}"
+    )
+
+
 async def status_command_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """命令：/status - 系统状态"""
     user_id = update.effective_user.id
@@ -134,38 +151,9 @@ async def status_command_handler(update: Update, context: ContextTypes.DEFAULT_T
         await update.message.reply_text("⛔ 无权限使用此 Bot")
         return
 
-    from src.models.database import Database
-    db = Database()
-
-    # 获取统计信息
-    series_list = db.get_all_series()
-    total_series = len(series_list)
-
-    total_episodes = 0
-    for series in series_list:
-        episodes = db.get_episodes_by_series(series['tmdb_id'])
-        total_episodes += len(episodes)
-
-    # 状态分布
-    statuses = ['pending', 'downloading', 'openlist_exists', 'completed', 'mismatched']
-    status_stats = {}
-    for status in statuses:
-        episodes = db.get_episodes_by_status(status)
-        status_stats[status] = len(episodes)
-
-    openlist_files = db.get_openlist_files()
-
-    text = (
-        "📊 系统状态\n\n"
-        f"订阅数: {total_series}\n"
-        f"总剧集数: {total_episodes}\n\n"
-        "剧集状态分布:\n"
-        f"  ⏳ 待下载: {status_stats['pending']} 集\n"
-        f"  ⬇️ 下载中: {status_stats['downloading']} 集\n"
-        f"  ✅ 已下载: {status_stats['openlist_exists']} 集\n"
-        f"  ⚠️ 不匹配: {status_stats['mismatched']} 集\n\n"
-        f"OpenList 文件数: {len(openlist_files)}"
-    )
+    from src.models.async_database import AsyncDatabase
+    stats = await AsyncDatabase.get_instance().get_dashboard_stats()
+    text = _format_status_text(stats)
 
     await update.message.reply_text(
         text=text,
@@ -226,40 +214,11 @@ async def system_status_handler(update: Update, context: ContextTypes.DEFAULT_TY
     query = update.callback_query
     await query.answer()
 
-    from src.models.database import Database
-    db = Database()
-
-    # 获取统计信息
-    series_list = db.get_all_series()
-    total_series = len(series_list)
-
-    total_episodes = 0
-    for series in series_list:
-        episodes = db.get_episodes_by_series(series['tmdb_id'])
-        total_episodes += len(episodes)
-
-    # 状态分布
-    statuses = ['pending', 'downloading', 'openlist_exists', 'completed', 'mismatched']
-    status_stats = {}
-    for status in statuses:
-        episodes = db.get_episodes_by_status(status)
-        status_stats[status] = len(episodes)
-
-    openlist_files = db.get_openlist_files()
-
-    text = (
-        "📊 系统状态\n\n"
-        f"订阅数: {total_series}\n"
-        f"总剧集数: {total_episodes}\n\n"
-        "剧集状态分布:\n"
-        f"  ⏳ 待下载: {status_stats['pending']} 集\n"
-        f"  ⬇️ 下载中: {status_stats['downloading']} 集\n"
-        f"  ✅ 已下载: {status_stats['openlist_exists']} 集\n"
-        f"  ⚠️ 不匹配: {status_stats['mismatched']} 集\n\n"
-        f"OpenList 文件数: {len(openlist_files)}"
-    )
+    from src.models.async_database import AsyncDatabase
+    stats = await AsyncDatabase.get_instance().get_dashboard_stats()
+    text = _format_status_text(stats)
 
-    has_mismatched = status_stats['mismatched'] > 0
+    has_mismatched = stats['statuses']['mismatched'] > 0
 
     await query.edit_message_text(
         text=text,
@@ -272,43 +231,7 @@ async def view_mismatched_handler(update: Update, context: ContextTypes.DEFAULT_
     query = update.callback_query
     await query.answer()
 
-    from src.models.database import Database
-    db = Database()
-
-    # 获取所有 mismatched 剧集
-    mismatched_episodes = db.get_episodes_by_status('mismatched')
-
-    if not mismatched_episodes:
-        await query.edit_message_text(
-            "✅ 没有不匹配的项目",
-            reply_markup=Keyboards.back_to_main()
-        )
-        return
-
-    # 获取 series 信息
-    series_map = db.get_series_map()
-
-    # 丰富剧集信息
-    for episode in mismatched_episodes:
-        series = series_map.get(episode['tmdb_id'])
-        if series:
-            episode['series_name'] = series['series_name']
-
-    # 分页显示
-    page = 0
-    items_per_page = 5
-    total_pages = (len(mismatched_episodes) + items_per_page - 1) // items_per_page
-
-    start_idx = page * items_per_page
-    end_idx = start_idx + items_per_page
-    page_items = mismatched_episodes[start_idx:end_idx]
-
-    text = f"⚠️ 不匹配项目 ({len(mismatched_episodes)} 个)\n\n点击查看详情："
-
-    await query.edit_message_text(
-        text=text,
-        reply_markup=Keyboards.mismatched_list(page_items, page, total_pages)
-    )
+    await _show_mismatched_page(query, 0)
 
 
 async def mismatched_page_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -316,30 +239,34 @@ async def mismatched_page_handler(update: Update, context: ContextTypes.DEFAULT_
     query = update.callback_query
     await query.answer()
 
-    from src.models.database import Database
-    db = Database()
-
     # 解析页码
     page = int(query.data.split('_')[-1])
 
-    # 获取所有 mismatched 剧集
-    mismatched_episodes = db.get_episodes_by_status('mismatched')
-    series_map = db.get_series_map()
+    await _show_mismatched_page(query, page)
 
-    for episode in mismatched_episodes:
-        series = series_map.get(episode['tmdb_id'])
-        if series:
-            episode['series_name'] = series['series_name']
 
-    # 分页
+async def _show_mismatched_page(query, page: int):
+    """显示一页不匹配项目（数据库分页，只读取当前页）"""
+    from src.models.async_database import AsyncDatabase
+    db = AsyncDatabase.get_instance()
+
     items_per_page = 5
-    total_pages = (len(mismatched_episodes) + items_per_page - 1) // items_per_page
+    page_items, total = await db.get_episodes_page('mismatched', items_per_page, page * items_per_page)
+
+    if not total:
+        await query.edit_message_text(
+            "✅ 没有不匹配的项目",
+            reply_markup=Keyboards.back_to_main()
+        )
+        return
 
-    start_idx = page * items_per_page
-    end_idx = start_idx + items_per_page
-    page_items = mismatched_episodes[start_idx:end_idx]
+    total_pages = (total + items_per_page - 1) // items_per_page
+    if page >= total_pages:
+        # 翻页期间记录减少，显示最后一页
+        page = total_pages - 1
+        page_items, total = await db.get_episodes_page('mismatched', items_per_page, page * items_per_page)
 
-    text = f"⚠️ 不匹配项目 ({len(mismatched_episodes)} 个)\n\n点击查看详情："
+    text = f"⚠️ 不匹配项目 ({total} 个)\n\n点击查看详情："
 
     await query.edit_message_text(
         text=text,
@@ -352,14 +279,14 @@ async def mismatched_detail_handler(update: Update, context: ContextTypes.DEFAUL
     query = update.callback_query
     await query.answer()
 
-    from src.models.database import Database
-    db = Database()
+    from src.models.async_database import AsyncDatabase
+    db = AsyncDatabase.get_instance()
 
     # 解析 episode_id
     episode_id = int(query.data.replace('mismatched_detail_', ''))
 
     # 获取剧集信息
-    episode = db.get_episode_by_id(episode_id)
+    episode = await db.get_episode_by_id(episode_id)
     if not episode:
         await query.edit_message_text(
             "❌ 找不到该剧集",
@@ -368,8 +295,7 @@ async def mismatched_detail_handler(update: Update, context: ContextTypes.DEFAUL
         return
 
     # 获取番剧信息
-    series_map = db.get_series_map()
-    series = series_map.get(episode['tmdb_id'])
+    series = await db.get_series(episode['tmdb_id'])
     series_name = series['series_name'] if series else 'Unknown'
 
     text = (
@@ -432,8 +358,8 @@ def main():
     application.add_handler(CallbackQueryHandler(series_menu_handler, pattern="^series_menu$"))
     application.add_handler(CallbackQueryHandler(series_current_handler, pattern="^series_current$"))
     application.add_handler(CallbackQueryHandler(series_old_handler, pattern="^series_old$"))
+    application.add_handler(CallbackQueryHandler(series_page_handler, pattern="^(series_current|season_.+)_page_\\d+_[ab]\\d+$"))
     application.add_handler(CallbackQueryHandler(season_filter_handler, pattern="^season_"))
-    application.add_handler(CallbackQueryHandler(series_page_handler, pattern=".*_page_\\d+$"))
     application.add_handler(CallbackQueryHandler(detail_handler, pattern="^detail_\\d+$"))
     application.add_handler(CallbackQueryHandler(refresh_handler, pattern="^refresh_\\d+$"))
     application.add_handler(CallbackQueryHandler(delete_confirm_handler, pattern="^delete_confirm_\\d+$"))
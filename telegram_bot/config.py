@@ -29,7 +29,8 @@ class BotConfig:
         'downloading': '⬇️',
         'openlist_exists': '✅',
         'completed': '✅',
-        'mismatched': '⚠️'
+        'mismatched': '⚠️',
+        'failed': '❌'
     }
 
     @classmethod
@@ -2,6 +2,7 @@
 添加订阅处理器
 """
 import sys
+import asyncio
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -63,7 +64,7 @@ async def rss_url_received_handler(update: Update, context: ContextTypes.DEFAULT
         # 使用 page_scraper 解析信息
         from src.parsers.page_scraper import MikanPageScraper
         scraper = MikanPageScraper()
-        scrape_result = scraper.scrape_bangumi_page_from_rss_url(rss_url)
+        scrape_result = await asyncio.to_thread(scraper.scrape_bangumi_page_from_rss_url, rss_url)
 
         if not scrape_result:
             await processing_msg.edit_text(
@@ -76,7 +77,7 @@ async def rss_url_received_handler(update: Update, context: ContextTypes.DEFAULT
         img_url = scrape_result.get('img_url')
 
         # 搜索 TMDB
-        tmdb_result = tracker.tmdb_service.search_anime(series_name)
+        tmdb_result = await asyncio.to_thread(tracker.tmdb_service.search_anime, series_name)
 
         if not tmdb_result:
             await processing_msg.edit_text(
@@ -89,7 +90,7 @@ async def rss_url_received_handler(update: Update, context: ContextTypes.DEFAULT
         tmdb_name = tmdb_result['name']
 
         # 获取详细信息
-        details = tracker.tmdb_service.get_series_details(tmdb_id)
+        details = await asyncio.to_thread(tracker.tmdb_service.get_series_details, tmdb_id)
         total_episodes = details.get('number_of_episodes') if details else None
         first_air_date = tmdb_result.get('first_air_date') or (details.get('first_air_date') if details else None)
 
@@ -166,7 +167,7 @@ async def add_confirm_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     # 添加订阅
     tracker = SubscriptionTracker()
-    success = tracker.add_subscription_by_rss_url(rss_url)
+    success = await asyncio.to_thread(tracker.add_subscription_by_rss_url, rss_url)
 
     # 清理 context
     context.user_data.pop('add_rss_url', None)
@@ -2,13 +2,14 @@
 删除订阅处理器
 """
 import sys
+import asyncio
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from src.models.database import Database
+from src.models.async_database import AsyncDatabase
 from src.services.subscription_manager import SubscriptionManager
 from telegram_bot.keyboards import Keyboards
 
@@ -21,11 +22,10 @@ async def delete_confirm_handler(update: Update, context: ContextTypes.DEFAULT_T
     # 从 callback_data 提取 tmdb_id
     tmdb_id = int(query.data.replace("delete_confirm_", ""))
 
-    db = Database()
+    db = AsyncDatabase.get_instance()
 
     # 获取番剧信息
-    series_list = db.get_all_series()
-    series = next((s for s in series_list if s['tmdb_id'] == tmdb_id), None)
+    series = await db.get_series(tmdb_id)
 
     if not series:
         await query.edit_message_text("❌ 未找到该番剧")
@@ -35,7 +35,7 @@ async def delete_confirm_handler(update: Update, context: ContextTypes.DEFAULT_T
 
     # 获取统计信息
     manager = SubscriptionManager()
-    stats = manager.get_series_stats(tmdb_id)
+    stats = await db.read(manager.get_series_stats, tmdb_id)
 
     text = (
         f"⚠️ 确认删除订阅？\n\n"
@@ -61,8 +61,9 @@ async def delete_with_files_handler(update: Update, context: ContextTypes.DEFAUL
 
     await query.edit_message_text("🗑️ 正在删除订阅和文件...")
 
+    # 删除文件需要逐个请求 OpenList，在普通线程中执行，不占用数据库写线程
     manager = SubscriptionManager()
-    success, deleted_files, error = manager.delete_subscription(tmdb_id, delete_files=True)
+    success, deleted_files, error = await asyncio.to_thread(manager.delete_subscription, tmdb_id, delete_files=True)
 
     if success:
         text = (
@@ -89,7 +90,8 @@ async def delete_only_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
     await query.edit_message_text("📝 正在删除订阅（保留文件）...")
 
     manager = SubscriptionManager()
-    success, _, error = manager.delete_subscription(tmdb_id, delete_files=False)
+    success, _, error = await AsyncDatabase.get_instance().write(manager.delete_subscription, tmdb_id,
+                                                                delete_files=False)
 
     if success:
         text = "✅ 订阅已删除\n\n已下载的文件已保留"
@@ -8,7 +8,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from src.models.database import Database
+from src.models.async_database import AsyncDatabase
 from telegram_bot.keyboards import Keyboards
 from telegram_bot.utils import generate_progress_bar
 from telegram_bot.config import BotConfig
@@ -44,11 +44,10 @@ async def show_series_detail(query, tmdb_id: int):
         query: Telegram query
         tmdb_id: 番剧 TMDB ID
     """
-    db = Database()
+    db = AsyncDatabase.get_instance()
 
     # 获取番剧信息
-    series_list = db.get_all_series()
-    series = next((s for s in series_list if s['tmdb_id'] == tmdb_id), None)
+    series = await db.get_series(tmdb_id)
 
     if not series:
         await query.edit_message_text("❌ 未找到该番剧")
@@ -59,7 +58,7 @@ async def show_series_detail(query, tmdb_id: int):
     total_episodes = series.get('total_episodes', 0)
 
     # 获取剧集列表
-    episodes = db.get_episodes_by_series(tmdb_id)
+    episodes = await db.get_episodes_by_series(tmdb_id)
     episodes.sort(key=lambda x: x['episode_number'])
 
     # 统计状态
@@ -96,7 +95,8 @@ async def show_series_detail(query, tmdb_id: int):
             'downloading': '下载中',
             'openlist_exists': '已下载',
             'completed': '已完成',
-            'mismatched': '字幕不匹配'
+            'mismatched': '字幕不匹配',
+            'failed': '下载失败'
         }.get(status, '未知')
 
         lines.append(f"EP{ep_num:02d} {emoji} {status_text}")
@@ -1,18 +1,18 @@
 """
 查看订阅处理器
 """
+import re
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from telegram import Update
 from telegram.ext import ContextTypes
-from typing import List, Dict
 
-from src.models.database import Database
+from src.models.async_database import AsyncDatabase
 from src.utils.season_helper import SeasonHelper
 from telegram_bot.keyboards import Keyboards
-from telegram_bot.utils import generate_progress_bar, format_status_summary, format_episode_status
+from telegram_bot.utils import generate_progress_bar, format_status_summary
 from telegram_bot.config import BotConfig
 
 
@@ -34,32 +34,16 @@ async def series_current_handler(update: Update, context: ContextTypes.DEFAULT_T
     query = update.callback_query
     await query.answer()
 
-    db = Database()
-    season_helper = SeasonHelper()
-
     # 获取当前季度标签
-    current_season = season_helper.get_current_season_tag()
-
-    # 获取所有订阅
-    all_series = db.get_all_series(status='active')
+    current_season = SeasonHelper.get_current_season_tag()
 
-    # 筛选当前季度
-    current_series = [s for s in all_series if s.get('season_tag') == current_season]
-
-    if not current_series:
+    # 显示第一页
+    if not await show_series_page(query, current_season, 0, "series_current"):
         text = f"🆕 {current_season}\n\n暂无新番订阅"
         await query.edit_message_text(
             text=text,
             reply_markup=Keyboards.back_to_main()
         )
-        return
-
-    # 存储到 context 以便分页使用
-    context.user_data['current_series_list'] = current_series
-    context.user_data['current_season'] = current_season
-
-    # 显示第一页
-    await show_series_page(query, context, current_series, 0, f"🆕 {current_season}", "series_current")
 
 
 async def series_old_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -67,21 +51,10 @@ async def series_old_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
 
-    db = Database()
-    season_helper = SeasonHelper()
+    db = AsyncDatabase.get_instance()
 
-    # 获取当前季度
-    current_season = season_helper.get_current_season_tag()
-
-    # 获取所有订阅
-    all_series = db.get_all_series(status='active')
-
-    # 获取所有非当前季度的 season_tag（去重）
-    old_seasons = set()
-    for series in all_series:
-        season_tag = series.get('season_tag')
-        if season_tag and season_tag != current_season:
-            old_seasons.add(season_tag)
+    # 所有非当前季度的 season_tag（降序，最新的在前）
+    old_seasons = await db.get_season_tags(exclude=SeasonHelper.get_current_season_tag())
 
     if not old_seasons:
         text = "📚 老番\n\n暂无老番订阅"
@@ -91,18 +64,11 @@ async def series_old_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return
 
-    # 排序（降序，最新的在前）
-    sorted_seasons = sorted(list(old_seasons), reverse=True)
-
-    # 存储到 context
-    context.user_data['old_seasons'] = sorted_seasons
-    context.user_data['all_series'] = all_series
-
-    text = f"📚 老番\n\n共 {len(sorted_seasons)} 个季度，请选择："
+    text = f"📚 老番\n\n共 {len(old_seasons)} 个季度，请选择："
 
     await query.edit_message_text(
         text=text,
-        reply_markup=Keyboards.season_selector(sorted_seasons)
+        reply_markup=Keyboards.season_selector(old_seasons)
     )
 
 
@@ -112,64 +78,62 @@ async def season_filter_handler(update: Update, context: ContextTypes.DEFAULT_TY
     await query.answer()
 
     # 从 callback_data 提取季节标签
-    season_tag = query.data.replace("season_", "")
+    season_tag = query.data.replace("season_", "", 1)
 
-    # 从 context 获取所有订阅
-    all_series = context.user_data.get('all_series', [])
-
-    # 筛选指定季节
-    season_series = [s for s in all_series if s.get('season_tag') == season_tag]
-
-    if not season_series:
+    # 显示第一页
+    if not await show_series_page(query, season_tag, 0, f"season_{season_tag}"):
         text = f"📚 {season_tag}\n\n该季度暂无订阅"
         await query.edit_message_text(
             text=text,
             reply_markup=Keyboards.back_to_main()
         )
-        return
 
-    # 存储到 context 以便分页使用
-    context.user_data['season_series_list'] = season_series
-    context.user_data['selected_season'] = season_tag
 
-    # 显示第一页
-    await show_series_page(query, context, season_series, 0, f"📚 {season_tag}", f"season_{season_tag}")
-
-
-async def show_series_page(query, context, series_list: List[Dict], page: int, title: str, prefix: str):
+async def show_series_page(query, season_tag: str, page: int, prefix: str,
+                           after: int = None, before: int = None) -> bool:
     """
     显示番剧列表页
 
+    从数据库按键集分页读取一页番剧和剧集统计，不在 user_data 中保存列表
+
     Args:
         query: Telegram query
-        context: Context
-        series_list: 番剧列表
-        page: 页码
-        title: 标题
+        season_tag: 季度标签
+        page: 页码（仅用于显示）
         prefix: 回调前缀
+        after: 上一页最后一部番剧的 tmdb_id
+        before: 下一页第一部番剧的 tmdb_id
+
+    Returns:
+        bool: 该季度没有订阅时返回 False（未编辑消息）
     """
-    db = Database()
+    db = AsyncDatabase.get_instance()
 
-    # 分页
     page_size = BotConfig.PAGE_SIZE
-    total_pages = (len(series_list) + page_size - 1) // page_size
-    start = page * page_size
-    end = start + page_size
-    page_items = series_list[start:end]
+    total_count = await db.count_series(season_tag)
+    if total_count == 0:
+        return False
+
+    page_items = await db.get_series_page(season_tag, page_size, after=after, before=before)
+    if not page_items:
+        # 游标番剧已被删除，回到第一页
+        page = 0
+        page_items = await db.get_series_page(season_tag, page_size)
+
+    total_pages = (total_count + page_size - 1) // page_size
+    page = min(page, total_pages - 1)
+
+    title = f"🆕 {season_tag}" if prefix == "series_current" else f"📚 {season_tag}"
 
     # 构建文本
-    lines = [f"{title} ({len(series_list)}部)\n"]
+    lines = [f"{title} ({total_count}部)\n"]
 
     for series in page_items:
-        tmdb_id = series['tmdb_id']
         series_name = series['series_name']
-
-        # 获取剧集统计
-        episodes = db.get_episodes_by_series(tmdb_id)
-        total = series.get('total_episodes', len(episodes))
+        total = series.get('total_episodes') or series['episode_count']
 
         # 计算完成度
-        stats = format_episode_status(episodes)
+        stats = series['episode_stats']
         completed = stats.get('openlist_exists', 0) + stats.get('completed', 0)
 
         # 进度条
@@ -190,6 +154,7 @@ async def show_series_page(query, context, series_list: List[Dict], page: int, t
         text=text,
         reply_markup=Keyboards.series_list(page_items, page, total_pages, prefix)
     )
+    return True
 
 
 async def series_page_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -197,20 +162,26 @@ async def series_page_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
     query = update.callback_query
     await query.answer()
 
-    # 解析 callback_data: prefix_page_N
-    parts = query.data.split('_')
-    page = int(parts[-1])
-    prefix = '_'.join(parts[:-2])
+    # 解析 callback_data: prefix_page_N_a<tmdb_id>（下一页）/ prefix_page_N_b<tmdb_id>（上一页）
+    match = re.match(r'^(.+)_page_(\d+)_([ab])(\d+)$', query.data)
+    if not match:
+        await query.edit_message_text("❌ 数据错误，请重新选择")
+        return
+
+    prefix, page, direction, cursor_id = match.group(1), int(match.group(2)), match.group(3), int(match.group(4))
 
-    # 根据 prefix 确定使用哪个列表
+    # 根据 prefix 确定季度
     if prefix == "series_current":
-        series_list = context.user_data.get('current_series_list', [])
-        title = f"🆕 {context.user_data.get('current_season', '')}"
+        season_tag = SeasonHelper.get_current_season_tag()
     elif prefix.startswith("season_"):
-        series_list = context.user_data.get('season_series_list', [])
-        title = f"📚 {context.user_data.get('selected_season', '')}"
+        season_tag = prefix.replace("season_", "", 1)
     else:
         await query.edit_message_text("❌ 数据错误，请重新选择")
         return
 
-    await show_series_page(query, context, series_list, page, title, prefix)
+    cursor = {'after': cursor_id} if direction == 'a' else {'before': cursor_id}
+    if not await show_series_page(query, season_tag, page, prefix, **cursor):
+        await query.edit_message_text(
+            f"{season_tag}\n\n该季度暂无订阅",
+            reply_markup=Keyboards.back_to_main()
+        )
@@ -186,6 +186,20 @@ async def settings_trigger_handler(update: Update, context: ContextTypes.DEFAULT
         "⚠️ 任务会在后台执行，请稍后查看系统状态"
     )
 
+    # 正在运行的任务和跳过的运行
+    scheduler = context.bot_data.get('scheduler')
+    if scheduler:
+        lines = []
+        for task_name, task_display in TASK_NAME_MAP.items():
+            skipped = scheduler.skipped_runs.get(task_name)
+            if scheduler.is_running(task_name):
+                lines.append(f"{task_display}: 运行中")
+            elif skipped:
+                lines.append(f"{task_display}: 已跳过 {skipped['count']} 次"
+                             f"（最近 {skipped['last_at']:%H:%M}，{skipped['reason']}）")
+        if lines:
+            text += "\n\n" + "\n".join(lines)
+
     await query.edit_message_text(
         text=text,
         reply_markup=Keyboards.trigger_task_menu()
@@ -223,14 +237,20 @@ async def trigger_task_handler(update: Update, context: ContextTypes.DEFAULT_TYP
     )
 
     # 异步执行任务
-    success = await scheduler.trigger_task(task_name)
+    result = await scheduler.trigger_task(task_name)
 
-    if success:
+    if result == scheduler.RUN_COMPLETED:
         await query.edit_message_text(
             f"✅ {task_display} 执行完成\n\n"
             "可以通过「系统状态」查看结果",
             reply_markup=Keyboards.back_to_main()
         )
+    elif result == scheduler.RUN_SKIPPED:
+        await query.edit_message_text(
+            f"⏭ {task_display} 正在运行中，本次已跳过\n\n"
+            "请等待当前运行结束后再试",
+            reply_markup=Keyboards.back_to_main()
+        )
     else:
         await query.edit_message_text(
             f"❌ {task_display} 执行失败",
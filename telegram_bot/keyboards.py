@@ -65,6 +65,8 @@ class Keyboards:
             page: 当前页
             total_pages: 总页数
             prefix: 回调前缀（用于区分不同列表）
+
+        翻页按钮带上本页首尾番剧的 tmdb_id 作为键集分页游标
         """
         keyboard = []
 
@@ -87,10 +89,12 @@ class Keyboards:
         if total_pages > 1:
             pagination = []
             if page > 0:
-                pagination.append(InlineKeyboardButton("⬅️ 上一页", callback_data=f"{prefix}_page_{page-1}"))
+                first_id = series_items[0]['tmdb_id']
+                pagination.append(InlineKeyboardButton("⬅️ 上一页", callback_data=f"{prefix}_page_{page-1}_b{first_id}"))
             pagination.append(InlineKeyboardButton(f"{page+1}/{total_pages}", callback_data="noop"))
             if page < total_pages - 1:
-                pagination.append(InlineKeyboardButton("下一页 ▶️", callback_data=f"{prefix}_page_{page+1}"))
+                last_id = series_items[-1]['tmdb_id']
+                pagination.append(InlineKeyboardButton("下一页 ▶️", callback_data=f"{prefix}_page_{page+1}_a{last_id}"))
             keyboard.append(pagination)
 
         # 返回按钮